@@ -1,11 +1,16 @@
 import os
-import shutil
 import pygame
 
 from userspace.system.language_manager import LanguageManager
 from userspace.ui.desktop_icons import DESKTOP_PATH
 from userspace.system.file_icon_manager import FileIconManager
-from userspace.system.trash_manager import move_to_trash
+from kernel.utils.dir_sizes import get_cache, format_size
+from kernel.utils.quota import note_moved
+from kernel import vfs
+from kernel.utils.fs_watch import DirectoryMonitor
+from kernel.utils.file_ops import get_file_ops, PRIORITY_INTERACTIVE
+from userspace.system.assets import load_font, load_image
+from userspace.ui.file_ops_panel import FileOpsPanel, pump as pump_file_ops
 
 FONT_PATH = os.path.join("res", "fonts", "msa", "Ac437_TridentEarly_8x14.ttf")
 
@@ -45,35 +50,44 @@ class FileExplorerApp:
         self.last_click = 0
 
         # Icons
-        self.folder_icon = pygame.image.load(FOLDER_ICON_PATH).convert_alpha()
+        self.folder_icon = load_image(FOLDER_ICON_PATH).convert_alpha()
         self.folder_icon = pygame.transform.scale(self.folder_icon, (48, 48))
 
-        self.file_icon = pygame.image.load(FILE_ICON_PATH).convert_alpha()
+        self.file_icon = load_image(FILE_ICON_PATH).convert_alpha()
         self.file_icon = pygame.transform.scale(self.file_icon, (48, 48))
 
-        self.drive_icon = pygame.image.load(DRIVE_ICON_PATH).convert_alpha()
+        self.drive_icon = load_image(DRIVE_ICON_PATH).convert_alpha()
         self.drive_icon = pygame.transform.scale(self.drive_icon, (48, 48))
 
-        self.font = pygame.font.Font(FONT_PATH, 16)
+        self.font = load_font(FONT_PATH, 16)
+        self.sizes = get_cache()
+
+        # Errors shown in the status bar for a few seconds
+        self.message = None
+        self.message_until = 0
+
+        # Listing of the open folder, re-read only when it changes
+        self.items = []
+        self.monitor = DirectoryMonitor()
+
+        # Progress of copies, moves and deletes from every app
+        self.ops_panel = FileOpsPanel()
 
     # ---------------------------------------------------------
     # VIRTUAL DRIVE SYSTEM
     # ---------------------------------------------------------
     def load_virtual_drives(self):
-        if not os.path.exists(DRIVES_ROOT):
+        if not vfs.exists(DRIVES_ROOT):
             os.makedirs(DRIVES_ROOT)
 
-        drives = []
-        for name in os.listdir(DRIVES_ROOT):
-            full = os.path.join(DRIVES_ROOT, name)
-            if os.path.isdir(full):
-                drives.append(name)
+        drives = [e.name for e in vfs.scandir(DRIVES_ROOT, max_age=0) if e.is_dir]
 
         if not drives:
             drives = ["C", "D"]
             for d in drives:
                 path = os.path.join(DRIVES_ROOT, d)
                 os.makedirs(path, exist_ok=True)
+            vfs.invalidate(DRIVES_ROOT)
 
             c_path = os.path.join(DRIVES_ROOT, "C")
             for folder in [
@@ -96,6 +110,11 @@ class FileExplorerApp:
     # MAIN UPDATE / DRAW
     # ---------------------------------------------------------
     def update(self, surface, mouse_pos):
+        pump_file_ops()
+        self.draw_view(surface, mouse_pos)
+        self.ops_panel.draw(surface)
+
+    def draw_view(self, surface, mouse_pos):
         surface.fill((240, 240, 240))
 
         # Path bar
@@ -151,10 +170,11 @@ class FileExplorerApp:
             return
 
         # Normal folder view
-        try:
-            items = os.listdir(self.current_path)
-        except Exception:
-            items = []
+        # Re-listed only when the folder is opened or reported changed
+        self.monitor.set_path(self.current_path)
+        if self.monitor.changed():
+            self.items = vfs.listdir(self.current_path, max_age=0)
+        items = self.items
 
         x_start = self.sidebar_width + 20
         x = x_start
@@ -203,6 +223,36 @@ class FileExplorerApp:
                 x = x_start
                 y += spacing_y
 
+        self.draw_status(surface)
+
+    def draw_status(self, surface):
+        bar_y = surface.get_height() - 24
+
+        if self.message and pygame.time.get_ticks() < self.message_until:
+            pygame.draw.rect(surface, (250, 220, 220), (self.sidebar_width, bar_y, surface.get_width(), 24))
+            txt = self.font.render(self.message, True, (150, 0, 0))
+            surface.blit(txt, (self.sidebar_width + 10, bar_y + 5))
+            return
+
+        if not self.selected_item:
+            return
+
+        full = os.path.join(self.current_path, self.selected_item)
+        if vfs.isdir(full):
+            # Folder sizes come from the shared size cache; uncached
+            # trees are measured in the background.
+            size = self.sizes.size_async(full)
+            size_text = format_size(size) if size is not None else "..."
+        else:
+            try:
+                size_text = format_size(vfs.getsize(full))
+            except OSError:
+                return
+
+        pygame.draw.rect(surface, (220, 220, 220), (self.sidebar_width, bar_y, surface.get_width(), 24))
+        txt = self.font.render(f"{self.selected_item}  -  {size_text}", True, (0, 0, 0))
+        surface.blit(txt, (self.sidebar_width + 10, bar_y + 5))
+
     # ---------------------------------------------------------
     # THIS PC VIEW
     # ---------------------------------------------------------
@@ -258,6 +308,10 @@ class FileExplorerApp:
         else:
             local_x, local_y = None, None
 
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.ops_panel.handle_click((local_x, local_y)):
+                return None
+
         # Renaming
         if self.renaming_item:
             if event.type == pygame.KEYDOWN:
@@ -357,7 +411,7 @@ class FileExplorerApp:
                         return None
 
                     full_path = os.path.join(self.current_path, clicked_item)
-                    if os.path.isdir(full_path):
+                    if vfs.isdir(full_path):
                         self.current_path = full_path
                         self.selected_item = None
                 else:
@@ -386,6 +440,10 @@ class FileExplorerApp:
             "mode": "cut",
         }
 
+    def show_message(self, text, ms=4000):
+        self.message = text
+        self.message_until = pygame.time.get_ticks() + ms
+
     def paste(self):
         if not self.clipboard or self.current_path == "THIS_PC":
             return
@@ -395,28 +453,36 @@ class FileExplorerApp:
 
         base = dst
         i = 1
-        while os.path.exists(dst):
+        while vfs.exists(dst, max_age=0):
             dst = f"{base} ({i})"
             i += 1
 
+        # Runs on the shared file-operations queue; progress shows in
+        # the panel and the view refreshes when it finishes.
+        ops = get_file_ops()
+        label = os.path.basename(dst)
         if self.clipboard["mode"] == "copy":
-            if os.path.isdir(src):
-                shutil.copytree(src, dst)
-            else:
-                shutil.copy2(src, dst)
-
+            ops.copy([(src, dst)], priority=PRIORITY_INTERACTIVE, label=f"Copying {label}", on_done=self.op_done)
         elif self.clipboard["mode"] == "cut":
-            shutil.move(src, dst)
+            ops.move([(src, dst)], priority=PRIORITY_INTERACTIVE, label=f"Moving {label}", on_done=self.op_done)
             self.clipboard = None
 
     def delete(self, item):
         if self.current_path == "THIS_PC":
             return
         full = os.path.join(self.current_path, item)
-        move_to_trash(full)
+        get_file_ops().trash([full], priority=PRIORITY_INTERACTIVE, label=f"Deleting {item}", on_done=self.op_done)
         if self.selected_item == item:
             self.selected_item = None
 
+    def op_done(self, op):
+        self.monitor.touch()
+        error = op.error
+        if error is None:
+            error = next((r.error for r in op.results if r.error is not None), None)
+        if error is not None:
+            self.show_message(getattr(error, "strerror", None) or str(error))
+
     def start_rename(self, item):
         if self.current_path == "THIS_PC":
             return
@@ -428,6 +494,12 @@ class FileExplorerApp:
         new = os.path.join(self.current_path, self.rename_text)
 
         if old != new and self.rename_text.strip():
+            is_dir = os.path.isdir(old)
+            nbytes = self.sizes.measure(old)
             os.rename(old, new)
+            note_moved(old, new, nbytes, is_dir)
+            vfs.invalidate(old)
+            vfs.invalidate(new)
+            self.monitor.touch()
 
         self.renaming_item = None
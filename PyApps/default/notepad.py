@@ -3,6 +3,9 @@ import os
 
 from userspace.system.language_manager import LanguageManager
 from userspace.system.settings_manager import SettingsManager
+from userspace.system.assets import load_font
+from kernel.utils import dedup
+from kernel.utils.quota import get_quota, note_added, QuotaExceeded
 
 FONT_PATH = "res/fonts/msa/Ac437_TridentEarly_8x14.ttf"
 
@@ -12,8 +15,8 @@ class NotepadApp:
         self.lang = LanguageManager()
         self.settings = SettingsManager()
 
-        self.font = pygame.font.Font(FONT_PATH, 18)
-        self.small_font = pygame.font.Font(FONT_PATH, 16)
+        self.font = load_font(FONT_PATH, 18)
+        self.small_font = load_font(FONT_PATH, 16)
 
         self.text_lines = [""]
         self.cursor_pos = [0, 0]  # line, column
@@ -222,8 +225,20 @@ class NotepadApp:
 
     def save_file(self):
         path = self.file_path or "notepad.txt"
+        text = "\n".join(self.text_lines)
+        old_size = os.path.getsize(path) if os.path.isfile(path) else 0
+
+        quota = get_quota()
+        try:
+            quota.check(path, len(text.encode("utf-8")) - old_size)
+        except QuotaExceeded as e:
+            self.show_status(e.strerror, (180, 0, 0))
+            return
+
+        dedup.detach(path, keep_data=False)
         with open(path, "w", encoding="utf-8") as f:
-            f.write("\n".join(self.text_lines))
+            f.write(text)
+        note_added(path, os.path.getsize(path) - old_size)
         self.file_path = path
         self.saved = True
         self.show_status(self.lang.get("notepad_saved"), (0, 150, 0))
@@ -4,6 +4,10 @@ import urllib.request
 import urllib.parse
 from html.parser import HTMLParser
 
+from kernel import vfs
+from kernel.vfs import resolve
+from userspace.system.assets import load_font
+
 FONT_PATH = os.path.join("res", "fonts", "msa", "Ac437_TridentEarly_8x14.ttf")
 
 
@@ -107,7 +111,7 @@ class LayoutBox:
 
 class PyBrowApp:
     def __init__(self):
-        self.font_base = pygame.font.Font(FONT_PATH, 18)
+        self.font_base = load_font(FONT_PATH, 18)
         self.VFS_ROOT = os.path.normpath(os.path.join("config", "live", "PyOS"))
 
         # Address bar
@@ -136,19 +140,15 @@ class PyBrowApp:
     # VFS + NETWORK
     # ---------------------------------------------------------
     def vfs_abs(self, path):
-        if not path.startswith("/"):
-            path = "/" + path
-        full = os.path.normpath(os.path.join(self.VFS_ROOT, path.lstrip("/")))
-        if not full.startswith(self.VFS_ROOT):
-            return self.VFS_ROOT
-        return full
+        # Page paths are always taken from the VFS root
+        return resolve("/" + path.lstrip("/"), root=self.VFS_ROOT)
 
     def fetch_url(self, url):
         url = url.strip()
         if url.startswith("file://"):
             path = url[len("file://") :]
             path = self.vfs_abs(path)
-            if not os.path.exists(path):
+            if not vfs.exists(path):
                 return f"<h1>404 Not Found</h1><p>{url}</p>"
             try:
                 with open(path, "r", encoding="utf-8") as f:
@@ -158,7 +158,7 @@ class PyBrowApp:
 
         if url.startswith("/") and not url.startswith("//"):
             path = self.vfs_abs(url)
-            if not os.path.exists(path):
+            if not vfs.exists(path):
                 return f"<h1>404 Not Found</h1><p>{url}</p>"
             try:
                 with open(path, "r", encoding="utf-8") as f:
@@ -262,7 +262,7 @@ class PyBrowApp:
 
             if node.text.strip():
                 text = node.text.strip()
-                font = pygame.font.Font(FONT_PATH, style["size"])
+                font = load_font(FONT_PATH, style["size"])
                 font.set_bold(style.get("bold", False))
                 font.set_italic(style.get("italic", False))
 
@@ -340,7 +340,7 @@ class PyBrowApp:
         else:
             path = self.vfs_abs(src)
 
-        if not os.path.exists(path):
+        if not vfs.exists(path):
             return None
 
         try:
@@ -360,7 +360,7 @@ class PyBrowApp:
         pygame.draw.rect(surface, (230, 230, 230), (0, 0, width, 30))
         pygame.draw.rect(surface, (200, 200, 200), (10, 5, width - 20, 20), 1)
 
-        addr_font = pygame.font.Font(FONT_PATH, 16)
+        addr_font = load_font(FONT_PATH, 16)
         addr_text = addr_font.render(self.address, True, (0, 0, 0))
         surface.blit(addr_text, (14, 7))
 
@@ -2,20 +2,22 @@ import pygame
 
 from userspace.system.settings_manager import SettingsManager
 from userspace.system.language_manager import LanguageManager
+from userspace.system.assets import load_font
+from kernel.utils.quota import get_quota, format_usage
 
 FONT_PATH = "res/fonts/msa/Ac437_TridentEarly_8x14.ttf"
 
 
 class SettingsApp:
     def __init__(self):
-        self.font = pygame.font.Font(FONT_PATH, 18)
-        self.small_font = pygame.font.Font(FONT_PATH, 16)
+        self.font = load_font(FONT_PATH, 18)
+        self.small_font = load_font(FONT_PATH, 16)
 
         self.settings = SettingsManager()
         self.lang = LanguageManager()
 
         # Categories
-        self.categories = ["General", "Personalization", "System"]
+        self.categories = ["General", "Personalization", "System", "Storage"]
         self.category_rects = {}
         self.current_category = "General"
 
@@ -52,6 +54,7 @@ class SettingsApp:
                 "General": "settings_general",
                 "Personalization": "settings_personalization",
                 "System": "settings_system",
+                "Storage": "settings_storage",
             }.get(cat, "settings_general")
 
             label = self.font.render(self.lang.get(label_key), True, (0, 0, 0))
@@ -66,6 +69,8 @@ class SettingsApp:
             self.draw_personalization(surface)
         elif self.current_category == "System":
             self.draw_system(surface)
+        elif self.current_category == "Storage":
+            self.draw_storage(surface)
 
     # -------------------------
     # CATEGORY DRAWING
@@ -140,6 +145,28 @@ class SettingsApp:
         vol_label = self.small_font.render(str(volume), True, (0, 0, 0))
         surface.blit(vol_label, (self.volume_slider_rect.x + 210, self.volume_slider_rect.y - 5))
 
+    def draw_storage(self, surface):
+        label = self.font.render(self.lang.get("settings_quota"), True, (0, 0, 0))
+        surface.blit(label, (250, 50))
+
+        # Counters are kept current by the file operations; no disk scan here
+        y = 90
+        for name, used, limit in get_quota().status():
+            name_label = self.small_font.render(name, True, (0, 0, 0))
+            surface.blit(name_label, (250, y))
+
+            bar = pygame.Rect(350, y + 2, 200, 12)
+            pygame.draw.rect(surface, (200, 200, 200), bar)
+            if limit and used is not None:
+                fill = min(1.0, used / limit)
+                color = (200, 40, 40) if used > limit else (0, 120, 255)
+                pygame.draw.rect(surface, color, (bar.x, bar.y, int(bar.width * fill), bar.height))
+            pygame.draw.rect(surface, (0, 0, 0), bar, 1)
+
+            usage = self.small_font.render(format_usage(used, limit), True, (0, 0, 0))
+            surface.blit(usage, (bar.right + 10, y))
+            y += 30
+
     # -------------------------
     # EVENT HANDLING
     # -------------------------
@@ -0,0 +1,185 @@
+import os
+import sys
+import time
+
+from PyApps.default.terminal.engine import ShellEngine
+from PyApps.default.terminal.shell import parse, ShellSyntaxError
+
+COMMENT_PREFIXES = ("#", "::")
+
+# Compiled scripts keyed by path, reused while the file's mtime and size
+# are unchanged
+_compiled = {}
+
+
+class BatchSyntaxError(Exception):
+    def __init__(self, path, line_no, error):
+        super().__init__(f"{path}:{line_no}: {error}")
+        self.path = path
+        self.line_no = line_no
+
+
+class BatchCommand:
+    __slots__ = ("line_no", "text", "pipeline")
+
+    def __init__(self, line_no, text, pipeline):
+        self.line_no = line_no
+        self.text = text
+        self.pipeline = pipeline
+
+
+class BatchResult:
+    __slots__ = ("line_no", "text", "seconds", "ok")
+
+    def __init__(self, line_no, text, seconds, ok):
+        self.line_no = line_no
+        self.text = text
+        self.seconds = seconds
+        self.ok = ok
+
+
+class LineSink:
+    """
+    Output buffer for headless runs: lines go straight to a stream
+    (or nowhere) instead of piling up in a scrollback.
+    """
+
+    def __init__(self, out=None):
+        self.out = out
+        self.count = 0
+
+    def append(self, line):
+        self.count += 1
+        if self.out is not None:
+            self.out.write(line)
+            self.out.write("\n")
+
+    def extend(self, lines):
+        for line in lines:
+            self.append(line)
+
+    def clear(self):
+        pass
+
+    def __len__(self):
+        return self.count
+
+
+# ---------------------------------------------------------
+# COMPILING
+# ---------------------------------------------------------
+def compile_script(text, path="<script>"):
+    """
+    Parse every line of a script up front. A syntax error anywhere
+    rejects the whole script before any command has run.
+    """
+    commands = []
+    for line_no, raw in enumerate(text.splitlines(), 1):
+        line = raw.strip()
+        if not line or line.startswith(COMMENT_PREFIXES):
+            continue
+        if line.split(None, 1)[0].lower() == "rem":
+            continue
+        try:
+            commands.append(BatchCommand(line_no, line, parse(line)))
+        except ShellSyntaxError as e:
+            raise BatchSyntaxError(path, line_no, e)
+    return commands
+
+
+def load_script(path):
+    st = os.stat(path)
+    key = os.path.abspath(path)
+    cached = _compiled.get(key)
+    if cached is not None and cached[0] == (st.st_mtime_ns, st.st_size):
+        return cached[1]
+
+    with open(path, "r", encoding="utf-8") as f:
+        commands = compile_script(f.read(), path)
+    _compiled[key] = ((st.st_mtime_ns, st.st_size), commands)
+    return commands
+
+
+# ---------------------------------------------------------
+# RUNNING
+# ---------------------------------------------------------
+def run_script(engine, commands, echo=False, stop_on_error=False):
+    """
+    Run compiled commands on an engine and return a BatchResult for
+    each one that ran. Background jobs are waited for at the end.
+    """
+    results = []
+    for command in commands:
+        if echo:
+            engine.lines.append(engine.prompt + command.text)
+
+        start = time.perf_counter()
+        ok = engine.run_pipeline(command.pipeline, command.text)
+        results.append(BatchResult(command.line_no, command.text, time.perf_counter() - start, ok))
+
+        if not ok and stop_on_error:
+            break
+
+    engine.wait_for_jobs()
+    return results
+
+
+def run_file(path, engine=None, echo=False, stop_on_error=False):
+    if engine is None:
+        engine = ShellEngine(lines=LineSink(sys.stdout), log_path=None)
+    return run_script(engine, load_script(path), echo, stop_on_error)
+
+
+def format_report(path, results):
+    lines = [f"--- {path}: {len(results)} commands"]
+    for r in results:
+        flag = "" if r.ok else "  [failed]"
+        lines.append(f"  {r.seconds * 1000:9.2f} ms  {r.line_no:4d}: {r.text}{flag}")
+    total = sum(r.seconds for r in results)
+    lines.append(f"  {total * 1000:9.2f} ms  total")
+    return lines
+
+
+def main(argv=None):
+    """
+    python -m PyApps.default.terminal.batch [--quiet] [--echo] [--stop] [--no-report] script.pbat ...
+
+    Runs from the PyOS directory, like the desktop. Every script shares
+    one engine, so commands are only imported once; cwd is reset to the
+    VFS root before each script.
+    """
+    args = list(sys.argv[1:] if argv is None else argv)
+    flags = {a for a in args if a.startswith("--")}
+    paths = [a for a in args if not a.startswith("--")]
+
+    unknown = flags - {"--quiet", "--echo", "--stop", "--no-report"}
+    if not paths or unknown:
+        print(main.__doc__.strip().splitlines()[0].strip())
+        return 2
+
+    out = None if "--quiet" in flags else sys.stdout
+    engine = ShellEngine(lines=LineSink(out), log_path=None)
+    status = 0
+
+    for path in paths:
+        try:
+            commands = load_script(path)
+        except (OSError, BatchSyntaxError) as e:
+            print(f"batch: {e}", file=sys.stderr)
+            status = 1
+            continue
+
+        engine.cwd = engine.VFS_ROOT
+        engine.update_prompt()
+
+        results = run_script(engine, commands, "--echo" in flags, "--stop" in flags)
+        if not all(r.ok for r in results):
+            status = 1
+        if "--no-report" not in flags:
+            print("\n".join(format_report(path, results)), file=sys.stderr)
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,12 @@
 import os
+from PyApps.default.terminal.shell import fail
+
+USAGE = "cd <path>"
+
 
 def run(term, args):
     if not args:
-        term.lines.append("Usage: cd <path>")
+        term.lines.append(fail(term, f"Usage: {USAGE}"))
         return
 
     target = term.vfs_abs(args[0])
@@ -11,4 +15,4 @@ def run(term, args):
         term.update_prompt()
         term.lines.append(f"Changed directory to {term.cwd}")
     else:
-        term.lines.append(f"Directory not found: {args[0]}")
+        term.lines.append(fail(term, f"Directory not found: {args[0]}"))
@@ -1,4 +1,9 @@
+USAGE = "clear"
+
+
 def run(term, args):
-    term.lines = []
+    term.lines.clear()
+    term.invalidate_line_cache()
+    term.scroll = 0
     term.lines.append("PyOS Terminal v0.3 (VFS mode)")
     term.lines.append("")
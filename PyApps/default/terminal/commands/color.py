@@ -1,6 +1,11 @@
+from PyApps.default.terminal.shell import fail
+
+USAGE = "color XY"
+
+
 def run(term, args):
     if not args or len(args[0]) != 2:
-        term.lines.append("Usage: color XY")
+        term.lines.append(fail(term, f"Usage: {USAGE}"))
         term.lines.append("X = background, Y = foreground")
         term.lines.append("Hex digits 0-F")
         return
@@ -29,10 +34,11 @@ def run(term, args):
     }
 
     if bg not in colors or fg not in colors:
-        term.lines.append("color: invalid code (must be 0-F)")
+        term.lines.append(fail(term, "color: invalid code (must be 0-F)"))
         return
 
     term.bg_color = colors[bg]
     term.text_color = colors[fg]
+    term.invalidate_line_cache()
 
     term.lines.append(f"Color set: background={bg}, foreground={fg}")
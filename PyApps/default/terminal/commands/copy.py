@@ -1,9 +1,16 @@
 import os
-import shutil
 
-def run(term, args):
+from PyApps.default.terminal.commands.xcopy import split_options, copy_with_progress
+from PyApps.default.terminal.jobs import cancel_token
+from PyApps.default.terminal.shell import fail
+
+USAGE = "copy <src> <dst> [/J] [/V]"
+
+
+def stream(term, args, stdin=None):
+    opts, args = split_options(args, {"/J", "/V"})
     if len(args) < 2:
-        term.lines.append("Usage: copy <src> <dst>")
+        yield fail(term, f"Usage: {USAGE}")
         return
 
     src_arg, dst_arg = args[0], args[1]
@@ -11,19 +18,18 @@ def run(term, args):
     dst = term.vfs_abs(dst_arg)
 
     if not os.path.exists(src):
-        term.lines.append(f"copy: cannot stat '{src_arg}': No such file or directory")
+        yield fail(term, f"copy: cannot stat '{src_arg}': No such file or directory")
         return
 
     if os.path.isdir(src):
-        term.lines.append(f"copy: '{src_arg}' is a directory (use xcopy)")
+        yield fail(term, f"copy: '{src_arg}' is a directory (use xcopy)")
         return
 
     if os.path.isdir(dst):
         dst = os.path.join(dst, os.path.basename(src))
 
     try:
-        os.makedirs(os.path.dirname(dst), exist_ok=True)
-        shutil.copy2(src, dst)
-        term.lines.append(f"Copied file: {src_arg} -> {dst_arg}")
-    except Exception as e:
-        term.lines.append(f"copy error: {e}")
+        yield from copy_with_progress(src, dst, "/J" in opts, cancel_token(), "/V" in opts)
+        yield f"Copied file: {src_arg} -> {dst_arg}"
+    except OSError as e:
+        yield fail(term, f"copy error: {e}")
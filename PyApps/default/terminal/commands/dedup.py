@@ -0,0 +1,52 @@
+from kernel.utils.dedup import get_store, USERS_ROOT, SETTINGS_SECTION, SETTINGS_KEY
+from kernel.utils.dir_sizes import format_size
+from kernel import vfs
+from PyApps.default.terminal.jobs import cancel_token
+from userspace.system.settings_manager import SettingsManager
+from PyApps.default.terminal.shell import fail
+
+USAGE = "dedup stats|scan|gc|on|off"
+
+
+def stream(term, args, stdin=None):
+    action = args[0].lower() if len(args) == 1 else None
+    store = get_store()
+
+    if action == "stats":
+        s = store.stats()
+        yield f"dedup: {'on' if s['enabled'] else 'off'}  ({vfs.to_vfs(USERS_ROOT)})"
+        yield f"  files        {s['files']}"
+        yield f"  logical      {format_size(s['logical'])}"
+        yield f"  on disk      {format_size(s['physical'])}"
+        yield f"  saved        {format_size(s['saved'])}"
+        yield f"  objects      {s['objects']}  ({format_size(s['object_bytes'])})"
+        if s["orphans"]:
+            yield f"  unreferenced {s['orphans']}  (run 'dedup gc')"
+
+    elif action == "scan":
+        if not store.enabled:
+            yield "dedup: off (turn it on with 'dedup on')"
+            return
+        files = 0
+        saved = 0
+        for path, nbytes, error in store.scan(cancelled=cancel_token()):
+            files += 1
+            saved += nbytes
+            if error is not None:
+                yield fail(term, f"  {vfs.to_vfs(path)}: {error}")
+        yield f"dedup: scanned {files} files, {format_size(saved)} freed"
+
+    elif action == "gc":
+        removed, freed = store.gc()
+        yield f"dedup: removed {removed} unreferenced objects, {format_size(freed)} freed"
+
+    elif action in ("on", "off"):
+        SettingsManager().set(SETTINGS_SECTION, SETTINGS_KEY, "true" if action == "on" else "false")
+        yield f"dedup: {action}"
+
+    else:
+        yield fail(term, f"Usage: {USAGE}")
+        yield "  stats  space used vs. space saved under /Users"
+        yield "  scan   hash /Users and share identical files"
+        yield "  gc     delete stored content no file uses any more"
+        yield "  on     copies inside /Users share data (setting Storage/dedup)"
@@ -1,23 +1,28 @@
 import os
 
-def run(term, args):
+USAGE = "dir [path]"
+
+
+def stream(term, args, stdin=None):
     path = term.cwd if not args else term.vfs_abs(args[0])
 
     try:
-        items = os.listdir(path)
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda e: e.name)
     except Exception as e:
-        term.lines.append(f"Error: {e}")
+        yield f"Error: {e}"
         return
 
-    if not items:
-        term.lines.append("Directory is empty")
+    if not entries:
+        yield "Directory is empty"
         return
 
-    items.sort()
-    for name in items:
-        full = os.path.join(path, name)
-        if os.path.isdir(full):
-            term.lines.append(f"<DIR>     {name}")
+    for entry in entries:
+        if entry.is_dir():
+            yield f"<DIR>     {entry.name}"
         else:
-            size = os.path.getsize(full)
-            term.lines.append(f"{size:8d}  {name}")
+            try:
+                size = entry.stat().st_size
+            except OSError:
+                size = 0
+            yield f"{size:8d}  {entry.name}"
@@ -0,0 +1,58 @@
+import os
+
+from kernel.utils.dir_sizes import get_cache, format_size
+from PyApps.default.terminal.jobs import check_cancelled
+from PyApps.default.terminal.shell import fail
+
+USAGE = "du [path] [/S] [/R]"
+
+
+def stream(term, args, stdin=None):
+    opts = {a.upper() for a in args if a.startswith("/")}
+    paths = [a for a in args if not a.startswith("/")]
+
+    if len(paths) > 1 or opts - {"/S", "/R"}:
+        yield fail(term, f"Usage: {USAGE}")
+        yield "  /S  total only    /R  ignore the size cache and re-measure"
+        return
+
+    target_arg = paths[0] if paths else "."
+    target = term.vfs_abs(target_arg)
+
+    if not os.path.exists(target):
+        yield fail(term, f"du: cannot access '{target_arg}': No such file or directory")
+        return
+
+    cache = get_cache()
+    if os.path.isfile(target):
+        yield f"{format_size(os.path.getsize(target)):>10}  {target_arg}"
+        return
+
+    if "/R" in opts:
+        cache.forget(target)
+
+    if "/S" not in opts:
+        # Warms the cache for every uncached subtree in parallel, so the
+        # per-directory lines below are served from it.
+        cache.size(target)
+
+        files = 0
+        subdirs = []
+        with os.scandir(target) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry)
+                else:
+                    try:
+                        files += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        pass
+
+        for entry in sorted(subdirs, key=lambda e: e.name.lower()):
+            check_cancelled()
+            yield f"{format_size(cache.size(entry.path)):>10}  {entry.name}/"
+        if files:
+            yield f"{format_size(files):>10}  (files)"
+
+    yield f"{format_size(cache.size(target)):>10}  total"
+    cache.save()
@@ -0,0 +1,15 @@
+from PyApps.default.terminal.shell import fail
+
+USAGE = "fg [%job]"
+
+
+def run(term, args):
+    jobs = getattr(term, "jobs", None)
+    job = jobs.find(args[0] if args else None) if jobs else None
+
+    if job is None:
+        term.lines.append(fail(term, "fg: no such job" if args else "fg: no current job"))
+        return
+
+    jobs.bring_to_front(job)
+    term.lines.append(job.command)
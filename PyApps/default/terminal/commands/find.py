@@ -0,0 +1,37 @@
+from kernel.utils.file_index import get_index
+from PyApps.default.terminal.shell import fail
+
+USAGE = "find <name|glob> [/D] [/F] [/N]"
+
+MAX_RESULTS = 500
+
+
+def stream(term, args, stdin=None):
+    opts = {a.upper() for a in args if a.startswith("/")}
+    terms = [a for a in args if not a.startswith("/")]
+
+    if not terms or opts - {"/D", "/F", "/N"}:
+        yield fail(term, f"Usage: {USAGE}")
+        yield "  /D  directories only    /F  files only"
+        yield "  /N  skip the incremental index refresh"
+        return
+
+    kind = "dir" if "/D" in opts else "file" if "/F" in opts else None
+
+    index = get_index()
+    if "/N" not in opts:
+        index.update()
+
+    results = index.search(" ".join(terms), limit=MAX_RESULTS, kind=kind)
+    if not results:
+        yield "find: no matches"
+        return
+
+    for entry in results:
+        if entry.is_dir:
+            yield f"<DIR>     /{entry.path}"
+        else:
+            yield f"{entry.size:8d}  /{entry.path}"
+
+    if len(results) >= MAX_RESULTS:
+        yield f"find: showing first {MAX_RESULTS} matches"
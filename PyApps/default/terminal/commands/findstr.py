@@ -0,0 +1,45 @@
+from PyApps.default.terminal.shell import fail
+
+USAGE = "findstr [/I] [/V] <text> [file]"
+
+
+def stream(term, args, stdin=None):
+    ignore_case = False
+    invert = False
+    rest = []
+
+    for arg in args:
+        upper = arg.upper()
+        if upper == "/I":
+            ignore_case = True
+        elif upper == "/V":
+            invert = True
+        else:
+            rest.append(arg)
+
+    if not rest:
+        yield fail(term, f"Usage: {USAGE}")
+        return
+
+    needle = rest[0]
+    if ignore_case:
+        needle = needle.lower()
+
+    if len(rest) > 1:
+        source = _read_lines(term.vfs_abs(rest[1]))
+    elif stdin is not None:
+        source = stdin
+    else:
+        yield "findstr: no input (pipe a command into it or give a file)"
+        return
+
+    for line in source:
+        hay = line.lower() if ignore_case else line
+        if (needle in hay) != invert:
+            yield line
+
+
+def _read_lines(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            yield line.rstrip("\r\n")
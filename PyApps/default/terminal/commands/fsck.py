@@ -0,0 +1,107 @@
+from kernel.utils.fswalk import walk
+from kernel.utils.checksum import get_manifest, hash_files, STRONG_HASH
+from PyApps.default.terminal.shell import fail
+
+USAGE = "fsck [/F] [/S]"
+
+# PyOS's own runtime state (indexes, caches, journal, history, logs):
+# rewritten all the time, so it would show as modified on every run
+EXCLUDE_DIRS = ("Meta", "System/Logs")
+EXCLUDE_SUFFIXES = (".db", ".db-wal", ".db-shm", ".db-journal")
+
+
+def stream(term, args, stdin=None):
+    opts = {a.upper() for a in args}
+    unknown = opts - {"/F", "/S"}
+    if unknown:
+        yield fail(term, f"Usage: {USAGE}")
+        yield "  /F  re-hash every file, even if size and mtime are unchanged"
+        yield f"  /S  also record a {STRONG_HASH} digest"
+        return
+
+    full = "/F" in opts
+    strong = STRONG_HASH if "/S" in opts else None
+
+    manifest = get_manifest()
+    root = term.VFS_ROOT
+    skip = {manifest.rel(manifest.path), manifest.rel(manifest.path + ".tmp")}
+
+    yield f"fsck: checking {root} against {manifest.rel(manifest.path)}"
+
+    seen = set()
+    pending = {}      # path -> (key, status, stat)
+    checked = 0
+    counts = {"new": 0, "modified": 0, "missing": 0, "corrupt": 0}
+
+    def changed_files():
+        nonlocal checked
+        for item in walk(root, files_only=True, sort=False):
+            key = manifest.rel(item.path)
+            if key in skip or _excluded(key):
+                continue
+            seen.add(key)
+            checked += 1
+
+            try:
+                st = item.entry.stat()
+            except OSError:
+                continue
+
+            cached = manifest.lookup(item.path, st, strong)
+            if cached is not None and not full:
+                continue
+
+            if key not in manifest.entries:
+                status = "new"
+            elif cached is not None or _same_stat(manifest.entries[key], st):
+                status = "check"
+            else:
+                status = "modified"
+
+            pending[item.path] = (key, status, st)
+            yield item.path
+
+    for path, result, error in hash_files(changed_files(), strong):
+        key, status, st = pending.pop(path)
+        if error is not None:
+            yield fail(term, f"  unreadable: {key} ({error})")
+            continue
+
+        if status == "check":
+            old = manifest.entries[key]
+            if old.get("crc32") != result["crc32"] or (strong and strong in old and old[strong] != result[strong]):
+                counts["corrupt"] += 1
+                yield f"  CORRUPT: {key}"
+                continue
+            manifest.record(path, dict(old, **result), st)
+            continue
+
+        counts[status] += 1
+        manifest.record(path, result, st)
+        yield f"  {status}: {key}"
+
+    for key in [k for k in manifest.entries if k not in seen]:
+        if _excluded(key):
+            # Recorded by an older fsck; not tracked any more
+            manifest.forget(key)
+            continue
+        counts["missing"] += 1
+        manifest.forget(key)
+        yield f"  missing: {key}"
+
+    manifest.save()
+
+    yield (
+        f"fsck: {checked} files checked, {counts['new']} new, {counts['modified']} modified, "
+        f"{counts['missing']} missing, {counts['corrupt']} corrupt"
+    )
+
+
+def _excluded(key):
+    if key.endswith(EXCLUDE_SUFFIXES):
+        return True
+    return any(key == d or key.startswith(d + "/") for d in EXCLUDE_DIRS)
+
+
+def _same_stat(entry, st):
+    return entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns
@@ -0,0 +1,99 @@
+import os
+import re
+
+from kernel.utils.fswalk import iter_files
+from kernel.utils.content_search import search_files, compile_text_pattern
+from PyApps.default.terminal.jobs import cancel_token
+from PyApps.default.terminal.shell import fail
+
+USAGE = "grep [-r] [-i] [-l] [-n] <pattern> [path...]"
+
+
+def _parse_args(args):
+    flags = set()
+    rest = []
+    for arg in args:
+        if arg.startswith("-") and len(arg) > 1 and not rest:
+            for ch in arg[1:]:
+                if ch not in "riln":
+                    raise ValueError(f"unknown option -{ch}")
+                flags.add(ch)
+        else:
+            rest.append(arg)
+    if not rest:
+        raise ValueError("missing pattern")
+    return flags, rest[0], rest[1:]
+
+
+def _filter_stdin(stdin, pattern, flags):
+    # ASCII-only like the file scan, so -i folds the same either way
+    regex = compile_text_pattern(pattern, "i" in flags)
+    for i, line in enumerate(stdin, 1):
+        if regex.search(line):
+            yield f"{i}:{line}" if "n" in flags else line
+
+
+def stream(term, args, stdin=None):
+    try:
+        flags, pattern, path_args = _parse_args(args)
+        re.compile(pattern)
+    except (ValueError, re.error) as e:
+        yield fail(term, f"grep: {e}")
+        yield f"Usage: {USAGE}"
+        return
+
+    if not path_args:
+        if stdin is not None:
+            yield from _filter_stdin(stdin, pattern, flags)
+            return
+        if "r" not in flags:
+            yield fail(term, "grep: no input (give a path, use -r, or pipe into it)")
+            return
+        path_args = ["."]
+
+    recursive = "r" in flags
+    errors = []
+
+    def files():
+        for arg in path_args:
+            path = term.vfs_abs(arg)
+            if os.path.isdir(path):
+                if not recursive:
+                    errors.append(fail(term, f"grep: {arg}: Is a directory"))
+                    continue
+                for entry in iter_files(path):
+                    yield entry.path
+            elif os.path.exists(path):
+                yield path
+            else:
+                errors.append(fail(term, f"grep: {arg}: No such file or directory"))
+
+    show_names = recursive or len(path_args) > 1
+    root = term.VFS_ROOT
+
+    results = search_files(
+        files(),
+        pattern,
+        ignore_case="i" in flags,
+        list_only="l" in flags,
+        line_numbers="n" in flags,
+        cancelled=cancel_token(),
+    )
+
+    for path, matches, error in results:
+        shown = path.replace(root, "") or "/"
+        if error is not None:
+            yield fail(term, f"grep: {shown}: {error}")
+            continue
+
+        if "l" in flags:
+            yield shown
+            continue
+
+        for line_no, text in matches:
+            prefix = f"{shown}:" if show_names else ""
+            if "n" in flags:
+                prefix += f"{line_no}:"
+            yield prefix + text
+
+    yield from errors
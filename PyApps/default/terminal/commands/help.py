@@ -1,4 +1,8 @@
+USAGE = "help"
+
+
 def run(term, args):
     term.lines.append("Available commands:")
-    for name in sorted(term.commands.keys()):
-        term.lines.append(f"  {name}")
+    for name in term.commands.names():
+        usage = term.commands.usage(name)
+        term.lines.append(f"  {name:<8} {usage}" if usage else f"  {name}")
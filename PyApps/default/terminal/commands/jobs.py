@@ -0,0 +1,12 @@
+USAGE = "jobs"
+
+
+def run(term, args):
+    jobs = getattr(term, "jobs", None)
+    if jobs is None or not jobs.jobs:
+        term.lines.append("No jobs")
+        return
+
+    for job in jobs.jobs.values():
+        state = "Stopping" if job.cancel_event.is_set() and not job.finished.is_set() else job.state
+        term.lines.append(f"[{job.id}]  {state:<8}  {job.command}")
@@ -0,0 +1,19 @@
+from PyApps.default.terminal.shell import fail
+
+USAGE = "kill %job"
+
+
+def run(term, args):
+    if not args:
+        term.lines.append(fail(term, f"Usage: {USAGE}"))
+        return
+
+    jobs = getattr(term, "jobs", None)
+    for spec in args:
+        job = jobs.find(spec) if jobs else None
+        if job is None:
+            term.lines.append(fail(term, f"kill: {spec}: no such job"))
+            continue
+
+        jobs.kill(job)
+        term.lines.append(f"[{job.id}]  Killing  {job.command}")
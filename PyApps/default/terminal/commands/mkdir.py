@@ -1,13 +1,24 @@
 import os
 
+from kernel import vfs
+from kernel.utils.dir_sizes import get_cache
+from PyApps.default.terminal.shell import fail
+
+USAGE = "mkdir <foldername>"
+
+
 def run(term, args):
     if not args:
-        term.lines.append("Usage: mkdir <foldername>")
+        term.lines.append(fail(term, f"Usage: {USAGE}"))
         return
 
     path = term.vfs_abs(args[0])
     try:
+        existed = os.path.isdir(path)
         os.makedirs(path, exist_ok=True)
+        if not existed:
+            get_cache().note_added(path, 0, is_dir=True)
+            vfs.invalidate(path)
         term.lines.append(f"Created folder: {path}")
     except Exception as e:
-        term.lines.append(f"Error: {e}")
+        term.lines.append(fail(term, f"Error: {e}"))
@@ -0,0 +1,53 @@
+from kernel.utils.quota import get_quota, parse_size, format_usage, USERS_FILE
+from kernel.utils.dir_sizes import format_size
+from kernel.utils.fs_init import read_json, write_json
+from PyApps.default.terminal.shell import fail
+
+USAGE = "quota [/R] | quota set <user> <size|unlimited>"
+
+
+def _set_limit(name, value):
+    data = read_json(USERS_FILE, {})
+    for user in data.get("users", []):
+        if user.get("name") == name:
+            if value:
+                user["quota"] = value
+            else:
+                user.pop("quota", None)
+            write_json(USERS_FILE, data)
+            return True
+    return False
+
+
+def stream(term, args, stdin=None):
+    quota = get_quota()
+
+    if args and args[0].lower() == "set":
+        if len(args) != 3:
+            yield fail(term, f"Usage: {USAGE}")
+            return
+        try:
+            limit = parse_size(args[2])
+        except ValueError:
+            yield fail(term, f"quota: bad size '{args[2]}' (e.g. 500MB, 2GB, unlimited)")
+            return
+        if not _set_limit(args[1], limit):
+            yield fail(term, f"quota: no such user '{args[1]}'")
+            return
+        yield f"quota: {args[1]} limited to {format_size(limit) if limit else 'unlimited'}"
+        return
+
+    opts = {a.upper() for a in args}
+    if opts - {"/R"}:
+        yield fail(term, f"Usage: {USAGE}")
+        yield "  /R  re-measure usage from disk now"
+        return
+
+    if "/R" in opts:
+        for name, (old, new) in quota.reconcile().items():
+            if old != new:
+                yield f"  {name}: corrected {format_size(old)} -> {format_size(new)}"
+
+    for name, used, limit in quota.status():
+        flag = "  OVER QUOTA" if limit and used is not None and used > limit else ""
+        yield f"{name:<16}{format_usage(used, limit)}{flag}"
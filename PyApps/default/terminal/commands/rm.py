@@ -1,35 +1,61 @@
 import os
-from userspace.system.trash_manager import move_to_trash
+from kernel.utils.file_ops import get_file_ops, CANCELLED
+from PyApps.default.terminal.jobs import cancel_token, JobCancelled
+from PyApps.default.terminal.shell import fail
 
-def run(term, args):
+USAGE = "rm [-r] <path>..."
+
+
+def stream(term, args, stdin=None):
     if not args:
-        term.lines.append("Usage: rm <file>")
-        term.lines.append("       rm -r <folder>")
+        yield fail(term, "Usage: rm <file>...")
+        yield "       rm -r <folder>..."
         return
 
     recursive = False
-    target_arg = args[0]
-
-    if target_arg == "-r":
+    if args[0] == "-r":
         if len(args) < 2:
-            term.lines.append("Usage: rm -r <folder>")
+            yield fail(term, "Usage: rm -r <folder>...")
             return
         recursive = True
-        target_arg = args[1]
+        args = args[1:]
+
+    targets = []
+    for target_arg in args:
+        target = term.vfs_abs(target_arg)
 
-    target = term.vfs_abs(target_arg)
+        if not os.path.exists(target):
+            yield fail(term, f"rm: cannot remove '{target_arg}': No such file or directory")
+            continue
 
-    if not os.path.exists(target):
-        term.lines.append(f"rm: cannot remove '{target_arg}': No such file or directory")
+        if os.path.isdir(target) and not recursive:
+            yield fail(term, f"rm: cannot remove '{target_arg}': Is a directory")
+            yield "Use rm -r <folder> to remove directories"
+            continue
+
+        targets.append((target_arg, target))
+
+    if not targets:
         return
 
-    if os.path.isdir(target) and not recursive:
-        term.lines.append(f"rm: cannot remove '{target_arg}': Is a directory")
-        term.lines.append("Use rm -r <folder> to remove directories")
+    # One batch: a single trash index commit however many paths are given
+    label = f"Deleting {len(targets)} items" if len(targets) > 1 else f"Deleting {os.path.basename(targets[0][1])}"
+    ops = get_file_ops()
+    op = ops.trash([target for _, target in targets], label=label)
+    for _ in ops.follow(op, cancel_token()):
+        pass
+
+    if op.state == CANCELLED:
+        raise JobCancelled()
+
+    if op.error is not None:
+        yield fail(term, f"rm error: {op.error}")
         return
 
-    try:
-        move_to_trash(target)
-        term.lines.append(f"Moved to trash: {target_arg}")
-    except Exception as e:
-        term.lines.append(f"rm error: {e}")
+    failed = {r.rel: r.error for r in op.results if r.error is not None}
+    for target_arg, target in targets:
+        error = failed.get(target)
+        if error is not None:
+            yield fail(term, f"rm: cannot remove '{target_arg}': {error}")
+        else:
+            yield f"Moved to trash: {target_arg}"
@@ -1,6 +1,11 @@
+from PyApps.default.terminal.shell import fail
+
+USAGE = "start <appname>"
+
+
 def run(term, args):
     if not args:
-        term.lines.append("Usage: start <appname>")
+        term.lines.append(fail(term, f"Usage: {USAGE}"))
         term.lines.append("Apps: notepad, fileexplorer, terminal, settings, trashbin")
         return
 
@@ -9,7 +14,7 @@ def run(term, args):
     valid = ["notepad", "fileexplorer", "terminal", "settings", "trashbin"]
 
     if app not in valid:
-        term.lines.append(f"start: unknown app '{app}'")
+        term.lines.append(fail(term, f"start: unknown app '{app}'"))
         return
 
     # Signal to desktop_init.py
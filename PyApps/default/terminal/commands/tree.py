@@ -1,31 +1,63 @@
 import os
 
-def run(term, args):
-    path = term.cwd if not args else term.vfs_abs(args[0])
+from kernel.utils.fswalk import walk
+from PyApps.default.terminal.shell import fail
 
-    if not os.path.exists(path):
-        if args:
-            term.lines.append(f"tree: path not found: {args[0]}")
+USAGE = "tree [path] [/L depth] [/F] [/S]"
+
+
+def _parse_args(args):
+    path_arg = None
+    depth = None
+    files_only = False
+    sizes = False
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        upper = arg.upper()
+        if upper == "/L":
+            if i + 1 >= len(args) or not args[i + 1].isdigit():
+                raise ValueError("/L needs a depth")
+            depth = int(args[i + 1])
+            i += 1
+        elif upper == "/F":
+            files_only = True
+        elif upper == "/S":
+            sizes = True
+        elif path_arg is None:
+            path_arg = arg
         else:
-            term.lines.append("tree: path not found")
+            raise ValueError(f"unexpected argument '{arg}'")
+        i += 1
+
+    return path_arg, depth, files_only, sizes
+
+
+def stream(term, args, stdin=None):
+    try:
+        path_arg, depth, files_only, sizes = _parse_args(args)
+    except ValueError as e:
+        yield f"tree: {e}"
+        yield fail(term, f"Usage: {USAGE}")
         return
 
-    def walk(p, prefix=""):
-        try:
-            items = sorted(os.listdir(p))
-        except Exception:
-            return
+    path = term.cwd if path_arg is None else term.vfs_abs(path_arg)
 
-        for i, name in enumerate(items):
-            full = os.path.join(p, name)
-            is_last = (i == len(items) - 1)
+    if not os.path.isdir(path):
+        if path_arg:
+            yield fail(term, f"tree: path not found: {path_arg}")
+        else:
+            yield fail(term, "tree: path not found")
+        return
 
-            branch = "└── " if is_last else "├── "
-            term.lines.append(prefix + branch + name)
+    yield path.replace(term.VFS_ROOT, "") or "/"
 
-            if os.path.isdir(full):
-                extension = "    " if is_last else "│   "
-                walk(full, prefix + extension)
+    for item in walk(path, max_depth=depth, files_only=files_only):
+        suffix = f"  ({item.size()} bytes)" if sizes and not item.is_dir else ""
 
-    term.lines.append(path.replace(term.VFS_ROOT, "/"))
-    walk(path)
+        if files_only:
+            yield item.rel + suffix
+        else:
+            branch = "└── " if item.is_last else "├── "
+            yield item.prefix + branch + item.name + suffix
@@ -1,38 +1,122 @@
 import os
-import shutil
 
-def run(term, args):
+from kernel.utils.copy_engine import CopyEngine, LARGE_FILE
+from kernel.utils.file_ops import get_file_ops, CANCELLED
+from PyApps.default.terminal.jobs import cancel_token, JobCancelled
+from PyApps.default.terminal.shell import fail
+
+USAGE = "xcopy <src> <dst> [/J] [/V]"
+
+
+def split_options(args, known):
+    """
+    Separate /X style switches (case-insensitive) from positional args.
+    """
+    opts = set()
+    rest = []
+    for arg in args:
+        if arg.upper() in known:
+            opts.add(arg.upper())
+        else:
+            rest.append(arg)
+    return opts, rest
+
+
+def copy_with_progress(src, dst, unbuffered, cancelled, verify=False):
+    """
+    Copy one file on the shared file-operations queue, yielding a
+    progress line every 10% for big files. With verify, the copy is
+    read back and compared by CRC32.
+    """
+    ops = get_file_ops()
+    op = ops.copy([(src, dst)], unbuffered=unbuffered, verify=verify, label=f"Copying {os.path.basename(src)}")
+
+    next_mark = 10
+    for result in ops.follow(op, cancelled):
+        if result is not None or op.total_bytes < LARGE_FILE:
+            continue
+        pct = op.done_bytes * 100 // op.total_bytes
+        if pct >= next_mark and pct < 100:
+            yield f"  {pct}%  ({op.done_bytes}/{op.total_bytes} bytes)"
+            next_mark = pct // 10 * 10 + 10
+
+    if op.state == CANCELLED:
+        raise JobCancelled()
+    if op.error is not None:
+        raise op.error
+    for result in op.results:
+        if result.error is not None:
+            raise result.error
+    if verify:
+        yield "  verified (crc32)"
+
+
+def stream(term, args, stdin=None):
+    opts, args = split_options(args, {"/J", "/V"})
     if len(args) < 2:
-        term.lines.append("Usage: xcopy <src> <dst>")
+        yield fail(term, f"Usage: {USAGE}")
         return
 
+    unbuffered = "/J" in opts
+    verify = "/V" in opts
+    cancelled = cancel_token()
+
     src_arg, dst_arg = args[0], args[1]
     src = term.vfs_abs(src_arg)
     dst = term.vfs_abs(dst_arg)
 
     if not os.path.exists(src):
-        term.lines.append(f"xcopy: cannot stat '{src_arg}': No such file or directory")
+        yield fail(term, f"xcopy: cannot stat '{src_arg}': No such file or directory")
         return
 
     if os.path.isfile(src):
         try:
             if os.path.isdir(dst):
                 dst = os.path.join(dst, os.path.basename(src))
-            os.makedirs(os.path.dirname(dst), exist_ok=True)
-            shutil.copy2(src, dst)
-            term.lines.append(f"xcopy (file): {src_arg} -> {dst_arg}")
-        except Exception as e:
-            term.lines.append(f"xcopy error: {e}")
+            yield from copy_with_progress(src, dst, unbuffered, cancelled, verify)
+            yield f"xcopy (file): {src_arg} -> {dst_arg}"
+        except OSError as e:
+            yield fail(term, f"xcopy error: {e}")
         return
 
     if os.path.isdir(dst):
         dst = os.path.join(dst, os.path.basename(src))
 
-    try:
-        if os.path.exists(dst):
-            term.lines.append(f"xcopy: destination '{dst_arg}' already exists")
+    if CopyEngine(src, dst).has_manifest():
+        yield f"xcopy: resuming interrupted copy into '{dst_arg}'"
+    elif os.path.exists(dst):
+        yield fail(term, f"xcopy: destination '{dst_arg}' already exists")
+        return
+
+    ops = get_file_ops()
+    op = ops.copy([(src, dst)], unbuffered=unbuffered, verify=verify, label=f"Copying {os.path.basename(src)}")
+
+    copied = 0
+    skipped = 0
+    total_bytes = 0
+    for result in ops.follow(op, cancelled):
+        if result is None:
+            continue
+        if result.skipped:
+            skipped += 1
+        elif result.error is not None:
+            yield fail(term, f"  {result.rel}: {result.error}")
         else:
-            shutil.copytree(src, dst)
-            term.lines.append(f"Copied directory: {src_arg} -> {dst_arg}")
-    except Exception as e:
-        term.lines.append(f"xcopy error: {e}")
+            copied += 1
+            total_bytes += result.size
+            yield f"  {result.rel}"
+
+    if op.state == CANCELLED:
+        raise JobCancelled()
+    if op.error is not None:
+        yield fail(term, f"xcopy error: {op.error}")
+        return
+
+    summary = f"Copied directory: {src_arg} -> {dst_arg} ({copied} files, {total_bytes} bytes"
+    if skipped:
+        summary += f", {skipped} already done"
+    if verify:
+        summary += ", verified"
+    if op.errors:
+        summary += f", {op.errors} failed - rerun to retry"
+    yield summary + ")"
@@ -0,0 +1,291 @@
+import os
+import threading
+from collections import OrderedDict
+
+from kernel.utils.fs_watch import get_watcher
+
+# Directories whose tries are kept in memory at once
+DIR_CACHE_SIZE = 64
+
+# Candidates listed when a Tab press is ambiguous
+MAX_CANDIDATES = 200
+
+
+# ---------------------------------------------------------
+# RADIX TRIE
+# ---------------------------------------------------------
+class _Node:
+    __slots__ = ("edges", "value", "count")
+
+    def __init__(self):
+        self.edges = {}       # first char -> [label, child]
+        self.value = None     # payload when a key ends here
+        self.count = 0        # keys in this subtree
+
+
+class PrefixTrie:
+    """
+    Compressed (radix) trie: every edge carries a string, so 50k
+    names cost about 2x as many nodes instead of one per character.
+    """
+
+    def __init__(self, items=()):
+        self.root = _Node()
+        for key, value in items:
+            self.insert(key, value)
+
+    def __len__(self):
+        return self.root.count
+
+    def insert(self, key, value=True):
+        node = self.root
+        path = [node]
+        while True:
+            if not key:
+                if node.value is None:
+                    for n in path:
+                        n.count += 1
+                node.value = value
+                return
+
+            edge = node.edges.get(key[0])
+            if edge is None:
+                leaf = _Node()
+                leaf.value = value
+                leaf.count = 1
+                node.edges[key[0]] = [key, leaf]
+                for n in path:
+                    n.count += 1
+                return
+
+            label, child = edge
+            common = _common_length(label, key)
+            if common < len(label):
+                # Split the edge at the point the keys diverge
+                mid = _Node()
+                mid.count = child.count
+                mid.edges[label[common]] = [label[common:], child]
+                edge[0] = label[:common]
+                edge[1] = mid
+                child = mid
+
+            key = key[common:]
+            node = child
+            path.append(node)
+
+    def _find(self, prefix):
+        """
+        Node covering 'prefix' plus the part of its edge label that
+        extends past the prefix, or (None, "").
+        """
+        node = self.root
+        while prefix:
+            edge = node.edges.get(prefix[0])
+            if edge is None:
+                return None, ""
+            label, child = edge
+            if len(prefix) <= len(label):
+                if not label.startswith(prefix):
+                    return None, ""
+                return child, label[len(prefix):]
+            if not prefix.startswith(label):
+                return None, ""
+            prefix = prefix[len(label):]
+            node = child
+        return node, ""
+
+    def complete(self, prefix, limit=MAX_CANDIDATES):
+        """
+        Return (common, matches): the longest extension shared by every
+        key starting with 'prefix', and up to 'limit' (key, value)
+        pairs in sorted order.
+        """
+        node, tail = self._find(prefix)
+        if node is None:
+            return "", []
+
+        # Longest common extension: follow single-child chains
+        common = tail
+        walk = node
+        while walk.value is None and len(walk.edges) == 1:
+            label, walk = next(iter(walk.edges.values()))
+            common += label
+
+        matches = []
+        stack = [(prefix + tail, node)]
+        while stack and len(matches) < limit:
+            key, n = stack.pop()
+            if n.value is not None:
+                matches.append((key, n.value))
+            for first in sorted(n.edges, reverse=True):
+                label, child = n.edges[first]
+                stack.append((key + label, child))
+
+        return common, matches
+
+
+def _common_length(a, b):
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+# ---------------------------------------------------------
+# DIRECTORY TRIES
+# ---------------------------------------------------------
+class DirectoryTries:
+    """
+    Per-directory tries of entry names (value: True for folders),
+    built on first use and rebuilt only when the directory's mtime
+    changes. With inotify every cached directory is watched and a trie
+    is trusted until an event drops it, so a Tab press makes no syscall
+    at all; with the polling fallback it costs one stat.
+    """
+
+    def __init__(self, size=DIR_CACHE_SIZE):
+        self.size = size
+        self._tries = OrderedDict()     # path -> (mtime_ns, trie, subscription)
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        path = os.path.abspath(path)
+        watcher = get_watcher()
+
+        with self._lock:
+            cached = self._tries.get(path)
+            if cached is not None and cached[2] is not None and watcher.realtime:
+                self._tries.move_to_end(path)
+                return cached[1]
+
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        with self._lock:
+            cached = self._tries.get(path)
+            if cached is not None and cached[0] == mtime:
+                self._tries.move_to_end(path)
+                return cached[1]
+
+        # Subscribe before scanning so a change made during the scan is
+        # seen; if one arrives the fresh trie is used once, not cached
+        changed = threading.Event()
+
+        def on_event(event):
+            changed.set()
+            self.invalidate(event.path)
+
+        sub = watcher.watch(path, on_event)
+
+        trie = PrefixTrie()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        trie.insert(entry.name, entry.is_dir())
+                    except OSError:
+                        continue
+        except OSError:
+            watcher.unwatch(sub)
+            return None
+
+        evicted = []
+        with self._lock:
+            if changed.is_set():
+                evicted.append((mtime, trie, sub))
+            else:
+                old = self._tries.pop(path, None)
+                if old is not None:
+                    evicted.append(old)
+                self._tries[path] = (mtime, trie, sub)
+            while len(self._tries) > self.size:
+                evicted.append(self._tries.popitem(last=False)[1])
+
+        for entry in evicted:
+            watcher.unwatch(entry[2])
+        return trie
+
+    def invalidate(self, path):
+        """
+        Drop a directory's trie; it is rebuilt on the next Tab.
+        """
+        with self._lock:
+            entry = self._tries.pop(os.path.abspath(path), None)
+        if entry is not None:
+            get_watcher().unwatch(entry[2])
+
+
+_dir_tries = DirectoryTries()
+
+
+def get_directory_tries():
+    return _dir_tries
+
+
+# ---------------------------------------------------------
+# COMPLETER
+# ---------------------------------------------------------
+class Completer:
+    """
+    Tab completion for a terminal: the first word completes against
+    command names, later words against VFS paths relative to term.cwd.
+    """
+
+    def __init__(self, term):
+        self.term = term
+        self._commands = None
+        self._command_names = None
+
+    def _command_trie(self):
+        names = self.term.commands.names()
+        if names != self._command_names:
+            self._command_names = names
+            self._commands = PrefixTrie((name, False) for name in names)
+        return self._commands
+
+    def complete(self, text):
+        """
+        Return (new_text, candidates). candidates is non-empty only
+        when the word is ambiguous and could not be extended.
+        """
+        stripped = text.lstrip()
+        if " " not in stripped:
+            lead = text[:len(text) - len(stripped)]
+            new_text, candidates = self._complete_command(stripped)
+            return lead + new_text, candidates
+
+        head, _, word = text.rpartition(" ")
+        return self._complete_path(head + " ", word)
+
+    def _complete_command(self, word):
+        common, matches = self._command_trie().complete(word.lower())
+        if not matches:
+            return word, []
+        if len(matches) == 1:
+            return matches[0][0] + " ", []
+        if common:
+            return word.lower() + common, []
+        return word, [name for name, _ in matches]
+
+    def _complete_path(self, head, word):
+        dir_part, slash, base = word.rpartition("/")
+        directory = self.term.vfs_abs(dir_part + slash if slash else ".")
+
+        trie = _dir_tries.get(directory)
+        if trie is None:
+            return head + word, []
+
+        common, matches = trie.complete(base)
+        if not matches:
+            return head + word, []
+
+        prefix = head + dir_part + slash
+        if len(matches) == 1:
+            name, is_dir = matches[0]
+            return prefix + name + ("/" if is_dir else " "), []
+        if common:
+            return prefix + base + common, []
+        return head + word, [name + ("/" if is_dir else "") for name, is_dir in matches]
@@ -0,0 +1,232 @@
+import os
+import time
+
+from PyApps.default.terminal.scrollback import Scrollback, SCROLLBACK_LIMIT
+from PyApps.default.terminal.registry import get_registry
+from PyApps.default.terminal.jobs import JobManager, JobTerm
+from PyApps.default.terminal.completion import Completer
+from PyApps.default.terminal.history import get_history
+from userspace.system.log_writer import get_log_writer
+from kernel.vfs import resolve, VFS_ROOT
+from PyApps.default.terminal.shell import (
+    parse,
+    connect,
+    write_redirect,
+    ShellSyntaxError,
+    StageError,
+    UnknownCommand,
+)
+
+LOG_PATH = os.path.join(VFS_ROOT, "System", "Logs", "Apps", "cmd.log")
+
+BANNER = "PyOS Terminal v0.3 (VFS mode)"
+
+# Ambiguous completions are listed this many to a row
+COMPLETION_COLUMNS = 4
+
+
+class ShellEngine:
+    """
+    Headless shell: working directory, VFS path resolution, command
+    dispatch and the output line buffer. Nothing here touches pygame;
+    TerminalApp draws on top of it and the batch runner drives it
+    directly.
+    """
+
+    def __init__(self, scrollback_limit=SCROLLBACK_LIMIT, lines=None, log_path=LOG_PATH):
+        # Virtual filesystem root
+        self.VFS_ROOT = VFS_ROOT
+        self.cwd = self.VFS_ROOT
+
+        # Output; anything with append/extend/clear/len works as a sink
+        if lines is None:
+            lines = Scrollback(scrollback_limit, [BANNER, ""])
+        self.lines = lines
+
+        # Commands like 'clear' reset the view position
+        self.scroll = 0
+
+        # Set through shell.fail() by a command that reports an error
+        self.failed = False
+
+        # Logging
+        self.LOG_PATH = log_path
+        self.log = get_log_writer(log_path, compress=True) if log_path else None
+
+        # Persistent history, mapped only once it is navigated
+        self.history = get_history()
+
+        # Background jobs
+        self.jobs = JobManager(self)
+
+        # Commands (shared, lazily imported)
+        self.commands = None
+        self.load_commands()
+        self.completer = Completer(self)
+
+        self.update_prompt()
+
+    # ---------------------------------------------------------
+    # COMMAND LOADER
+    # ---------------------------------------------------------
+    def load_commands(self):
+        self.commands = get_registry()
+
+    # ---------------------------------------------------------
+    # PATH HELPERS
+    # ---------------------------------------------------------
+    def vfs_abs(self, path):
+        return resolve(path, self.cwd, self.VFS_ROOT)
+
+    def update_prompt(self):
+        shown = self.cwd.replace(self.VFS_ROOT, "")
+        if shown == "":
+            shown = "/"
+        self.prompt = f"{shown}> "
+
+    # ---------------------------------------------------------
+    # COMPLETION
+    # ---------------------------------------------------------
+    def complete_input(self, text):
+        """
+        Tab completion for a partly typed line. Returns the new line;
+        when nothing can be added the candidates are listed instead.
+        """
+        new_text, candidates = self.completer.complete(text)
+        if candidates:
+            self.lines.append(self.prompt + text)
+            width = max(len(c) for c in candidates) + 2
+            for i in range(0, len(candidates), COMPLETION_COLUMNS):
+                row = candidates[i:i + COMPLETION_COLUMNS]
+                self.lines.append("".join(c.ljust(width) for c in row).rstrip())
+            self._scroll_to_bottom()
+        return new_text
+
+    # ---------------------------------------------------------
+    # DISPLAY HOOKS (no-ops without a display)
+    # ---------------------------------------------------------
+    def invalidate_line_cache(self):
+        pass
+
+    def _scroll_to_bottom(self):
+        pass
+
+    # ---------------------------------------------------------
+    # EXECUTE COMMAND
+    # ---------------------------------------------------------
+    def execute_command(self, cmd):
+        """
+        Echo, log, parse and run one command line.
+        """
+        cmd = cmd.strip()
+        self.lines.append(self.prompt + cmd)
+        self._log_command(cmd)
+        self.history.append(cmd)
+
+        if cmd == "":
+            self.lines.append("")
+            self._scroll_to_bottom()
+            return True
+
+        try:
+            pipeline = parse(cmd)
+        except ShellSyntaxError as e:
+            self.lines.append(str(e))
+            self.lines.append("")
+            self._scroll_to_bottom()
+            return False
+
+        return self.run_pipeline(pipeline, cmd)
+
+    def run_pipeline(self, pipeline, cmd):
+        """
+        Run an already parsed command line. Returns False if the shell
+        or a command reported an error.
+        """
+        self.failed = False
+        ok = self._dispatch(pipeline, cmd) and not self.failed
+        self._scroll_to_bottom()
+        return ok
+
+    def _dispatch(self, pipeline, cmd):
+        stage = pipeline.stages[0]
+        command = stage.name
+        simple = len(pipeline.stages) == 1 and pipeline.redirect is None
+
+        mod = self.commands.get(command)
+
+        # Built-in fallback help
+        if command == "help" and mod is None and simple:
+            self.lines.append("Available commands:")
+            for name in self.commands.names():
+                self.lines.append(f"  {name}")
+            self.lines.append("")
+            return True
+
+        # Background job: runs on the worker pool, output is pumped later
+        if pipeline.background:
+            try:
+                job_term = JobTerm(self)
+                stream = connect(job_term, pipeline, self.commands)
+            except UnknownCommand as e:
+                self.lines.append(str(e))
+                self.lines.append("")
+                return False
+
+            def factory():
+                if pipeline.redirect:
+                    write_redirect(job_term, pipeline.redirect, stream)
+                    return []
+                return stream
+
+            job = self.jobs.submit(cmd.rstrip("&").strip(), factory)
+            self.lines.append(f"[{job.id}] {job.command}")
+            return True
+
+        # Plain run(term, args) command writing straight to the terminal
+        if simple and mod is not None and not hasattr(mod, "stream"):
+            ok = True
+            try:
+                mod.run(self, stage.args)
+            except Exception as e:
+                self.lines.append(f"{command}: error: {e}")
+                ok = False
+            self.lines.append("")
+            return ok
+
+        # Streaming pipeline: stages are chained generators
+        ok = True
+        try:
+            stream = connect(self, pipeline, self.commands)
+            if pipeline.redirect:
+                write_redirect(self, pipeline.redirect, stream)
+            else:
+                for line in stream:
+                    self.lines.append(line)
+        except (UnknownCommand, StageError) as e:
+            self.lines.append(str(e))
+            ok = False
+        except Exception as e:
+            self.lines.append(f"{command}: error: {e}")
+            ok = False
+
+        self.lines.append("")
+        return ok
+
+    def wait_for_jobs(self, poll=0.01):
+        """
+        Block until every background job has finished and its output
+        has been moved into the line buffer.
+        """
+        while self.jobs.jobs:
+            if not self.jobs.pump():
+                time.sleep(poll)
+
+    # ---------------------------------------------------------
+    # LOGGING
+    # ---------------------------------------------------------
+    def _log_command(self, cmd):
+        if self.log is None:
+            return
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.log.write(f"[{timestamp}] {cmd}")
@@ -0,0 +1,225 @@
+import os
+import mmap
+import threading
+
+VFS_ROOT = os.path.normpath(os.path.join("config", "live", "PyOS"))
+HISTORY_PATH = os.path.join(VFS_ROOT, "Meta", "cmd_history")
+
+# Past this size (roughly 1M typical commands) the file is rewritten
+# without duplicates, keeping the newest three quarters.
+MAX_BYTES = 32 * 1024 * 1024
+
+# Enough of the file's tail to find the last entry
+TAIL_BYTES = 4096
+
+
+class CommandHistory:
+    """
+    Append-only command history shared by every terminal. The file
+    holds one UTF-8 command per line and is only mapped (not read) when
+    the user first navigates or searches it, so opening a terminal
+    costs nothing. Navigation and reverse search work on byte offsets
+    into the mapping; a cursor is the offset where an entry starts.
+    """
+
+    def __init__(self, path=HISTORY_PATH, max_bytes=MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._file = None
+        self._mm = None
+        self._mapped = 0
+        self._last = None
+
+    # ---------------------------------------------------------
+    # WRITING
+    # ---------------------------------------------------------
+    def append(self, cmd):
+        cmd = cmd.strip()
+        if not cmd or "\n" in cmd:
+            return
+
+        with self._lock:
+            if self._last is None:
+                self._last = self._read_last()
+            if cmd == self._last:
+                return    # consecutive duplicate
+            self._last = cmd
+
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._file = open(self.path, "ab")
+            self._file.write(cmd.encode("utf-8") + b"\n")
+            self._file.flush()
+
+            if self._file.tell() > self.max_bytes:
+                self._compact()
+
+    def _read_last(self):
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                f.seek(max(0, size - TAIL_BYTES))
+                tail = f.read()
+        except OSError:
+            return ""
+        lines = tail.rstrip(b"\n").rsplit(b"\n", 1)
+        return lines[-1].decode("utf-8", "replace") if lines[-1] else ""
+
+    def _compact(self):
+        """
+        Rewrite the file keeping only the newest occurrence of each
+        command, newest first, up to three quarters of max_bytes.
+        Called with the lock held.
+        """
+        self._unmap()
+        self._file.close()
+        self._file = None
+
+        with open(self.path, "rb") as f:
+            entries = f.read().split(b"\n")
+
+        seen = set()
+        kept = []
+        budget = self.max_bytes * 3 // 4
+        for line in reversed(entries):
+            if not line or line in seen:
+                continue
+            budget -= len(line) + 1
+            if budget < 0:
+                break
+            seen.add(line)
+            kept.append(line)
+        kept.reverse()
+
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(b"\n".join(kept) + b"\n" if kept else b"")
+        os.replace(tmp, self.path)
+
+    # ---------------------------------------------------------
+    # MAPPING
+    # ---------------------------------------------------------
+    def _map(self):
+        """
+        (Re)map the file if it grew since the last mapping; returns the
+        mapped length. Called with the lock held.
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+
+        if size != self._mapped:
+            self._unmap()
+            if size:
+                with open(self.path, "rb") as f:
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._mapped = len(self._mm)
+        return self._mapped
+
+    def _unmap(self):
+        if self._mm is not None:
+            self._mm.close()
+        self._mm = None
+        self._mapped = 0
+
+    def end(self):
+        """
+        Cursor just past the newest entry, where navigation starts.
+        """
+        with self._lock:
+            return self._map()
+
+    def after(self, cursor):
+        """
+        Offset just past the entry at 'cursor' (its newline included), so
+        a search from there still sees that entry.
+        """
+        with self._lock:
+            size = self._map()
+            if self._mm is None:
+                return 0
+            end = self._mm.find(b"\n", cursor)
+            return size if end == -1 else end + 1
+
+    def _line_at(self, start, end):
+        return self._mm[start:end].decode("utf-8", "replace")
+
+    # ---------------------------------------------------------
+    # NAVIGATION
+    # ---------------------------------------------------------
+    def previous(self, cursor):
+        """
+        Entry before 'cursor' as (text, cursor), or None at the oldest.
+        """
+        with self._lock:
+            self._map()
+            if self._mm is None or cursor <= 0:
+                return None
+            end = cursor - 1                  # the entry's newline
+            start = self._mm.rfind(b"\n", 0, end) + 1
+            return self._line_at(start, end), start
+
+    def next(self, cursor):
+        """
+        Entry after 'cursor' as (text, cursor), or None past the newest.
+        """
+        with self._lock:
+            size = self._map()
+            if self._mm is None or cursor >= size:
+                return None
+            end = self._mm.find(b"\n", cursor)
+            if end == -1:
+                return None
+            if end + 1 >= size:
+                return None
+            nxt = self._mm.find(b"\n", end + 1)
+            return self._line_at(end + 1, nxt), end + 1
+
+    def search(self, query, cursor, skip=None):
+        """
+        Newest entry containing 'query' that starts before 'cursor', as
+        (text, cursor); entries equal to 'skip' are passed over so
+        repeated commands only show once. None if nothing matches.
+        """
+        needle = query.encode("utf-8")
+        with self._lock:
+            size = self._map()
+            if self._mm is None or not needle:
+                return None
+
+            before = min(cursor, size)
+            while before > 0:
+                hit = self._mm.rfind(needle, 0, before)
+                if hit == -1:
+                    return None
+                start = self._mm.rfind(b"\n", 0, hit) + 1
+                end = self._mm.find(b"\n", hit)
+                if end == -1:
+                    end = size
+                text = self._line_at(start, end)
+                if text != skip:
+                    return text, start
+                before = start
+            return None
+
+    def close(self):
+        with self._lock:
+            self._unmap()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def get_history():
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = CommandHistory()
+        return _history
@@ -0,0 +1,246 @@
+import os
+import queue
+import threading
+
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# Lines moved from job queues into the terminal per frame, so a job
+# spewing output can never stall the frame loop.
+OUTPUT_BATCH = 500
+
+RUNNING = "Running"
+DONE = "Done"
+KILLED = "Killed"
+FAILED = "Failed"
+
+
+class JobCancelled(Exception):
+    pass
+
+
+# ---------------------------------------------------------
+# WORKER POOL
+# ---------------------------------------------------------
+class _WorkerPool:
+    """
+    Small pool of daemon threads shared by every terminal. Daemon
+    threads keep a stuck job from holding the process open on exit.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._tasks = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        with self._lock:
+            if len(self._threads) < self.size:
+                t = threading.Thread(target=self._worker, name=f"pyos-job-{len(self._threads)}", daemon=True)
+                self._threads.append(t)
+                t.start()
+        self._tasks.put((fn, args))
+
+    def _worker(self):
+        while True:
+            fn, args = self._tasks.get()
+            try:
+                fn(*args)
+            except Exception:
+                pass
+
+
+_pool = _WorkerPool(MAX_WORKERS)
+_local = threading.local()
+
+
+def current_job():
+    return getattr(_local, "job", None)
+
+
+def cancelled():
+    """
+    True when the job running on this thread has been killed.
+    Long-running commands poll this between units of work.
+    """
+    job = current_job()
+    return job is not None and job.cancel_event.is_set()
+
+
+def check_cancelled():
+    if cancelled():
+        raise JobCancelled()
+
+
+def cancel_token():
+    """
+    Callable reporting whether the current job was killed. Unlike
+    cancelled() it can be handed to helper threads the job fans out to.
+    """
+    job = current_job()
+    if job is None:
+        return lambda: False
+    return job.cancel_event.is_set
+
+
+# ---------------------------------------------------------
+# JOB TERMINAL
+# ---------------------------------------------------------
+class JobTerm:
+    """
+    Terminal view handed to a background job. The working directory is
+    snapshotted at submit time and attribute writes stay local to the
+    job, so a background 'cd' cannot move the interactive shell.
+    """
+
+    def __init__(self, term):
+        object.__setattr__(self, "_term", term)
+        object.__setattr__(self, "_local", {"cwd": term.cwd})
+
+    def __getattr__(self, name):
+        local = object.__getattribute__(self, "_local")
+        if name in local:
+            return local[name]
+        return getattr(self._term, name)
+
+    def __setattr__(self, name, value):
+        self._local[name] = value
+
+    def vfs_abs(self, path):
+        return type(self._term).vfs_abs(self, path)
+
+    def update_prompt(self):
+        pass
+
+    def invalidate_line_cache(self):
+        pass
+
+
+# ---------------------------------------------------------
+# JOBS
+# ---------------------------------------------------------
+class Job:
+    def __init__(self, job_id, command):
+        self.id = job_id
+        self.command = command
+        self.state = RUNNING
+        self.cancel_event = threading.Event()
+        self.output = queue.SimpleQueue()
+        self.finished = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+
+class JobManager:
+    """
+    Per-terminal job table. Workers push output lines into each job's
+    queue; the UI thread moves them into the terminal with pump().
+    """
+
+    def __init__(self, term):
+        self.term = term
+        self.jobs = {}
+        self.foreground = None
+        self._next_id = 1
+
+    def submit(self, command, factory):
+        """
+        Run factory() on the worker pool. It must return an iterable
+        of output lines and is called on the worker thread.
+        """
+        job = Job(self._next_id, command)
+        self._next_id += 1
+        self.jobs[job.id] = job
+
+        _pool.submit(self._run, job, factory)
+        return job
+
+    def _run(self, job, factory):
+        _local.job = job
+        try:
+            stream = iter(factory())
+            for line in stream:
+                job.output.put(line)
+                if job.cancel_event.is_set():
+                    if hasattr(stream, "close"):
+                        stream.close()
+                    break
+
+            job.state = KILLED if job.cancel_event.is_set() else DONE
+        except JobCancelled:
+            job.state = KILLED
+        except Exception as e:
+            if job.cancel_event.is_set():
+                job.state = KILLED
+            else:
+                job.output.put(str(e))
+                job.state = FAILED
+        finally:
+            _local.job = None
+            job.finished.set()
+
+    # ---------------------------------------------------------
+    # LOOKUP / CONTROL
+    # ---------------------------------------------------------
+    def find(self, spec=None):
+        """
+        Resolve '1', '%1' or None (most recent job).
+        """
+        if spec is None:
+            return self.jobs[max(self.jobs)] if self.jobs else None
+
+        spec = spec.lstrip("%")
+        if not spec.isdigit():
+            return None
+        return self.jobs.get(int(spec))
+
+    def kill(self, job):
+        job.cancel()
+
+    def bring_to_front(self, job):
+        self.foreground = job
+
+    def running(self):
+        return [job for job in self.jobs.values() if not job.finished.is_set()]
+
+    def kill_all(self):
+        for job in self.jobs.values():
+            job.cancel()
+
+    # ---------------------------------------------------------
+    # UI THREAD
+    # ---------------------------------------------------------
+    def pump(self, max_lines=OUTPUT_BATCH):
+        """
+        Move pending job output into the terminal. Returns True if
+        anything was added.
+        """
+        added = False
+        budget = max_lines
+
+        for job in list(self.jobs.values()):
+            while budget > 0:
+                try:
+                    line = job.output.get_nowait()
+                except queue.Empty:
+                    break
+                self.term.lines.append(line)
+                budget -= 1
+                added = True
+
+            if job.finished.is_set() and job.output.empty():
+                del self.jobs[job.id]
+                if job is self.foreground:
+                    self.foreground = None
+                    if job.state != DONE:
+                        self.term.lines.append(f"[{job.id}]  {job.state}  {job.command}")
+                    self.term.lines.append("")
+                else:
+                    self.term.lines.append(f"[{job.id}]+ {job.state:<8} {job.command}")
+                added = True
+
+            if budget <= 0:
+                break
+
+        return added
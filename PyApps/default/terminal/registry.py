@@ -0,0 +1,147 @@
+import os
+import ast
+import json
+import importlib
+import threading
+
+COMMANDS_PACKAGE = "PyApps.default.terminal.commands"
+COMMANDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "commands")
+INDEX_PATH = os.path.join(COMMANDS_DIR, "index.json")
+
+INDEX_VERSION = 1
+
+
+# ---------------------------------------------------------
+# INDEX BUILDING
+# ---------------------------------------------------------
+def _read_usage(path):
+    """
+    Pull the module-level USAGE string out of a command module
+    without importing it.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError):
+        return ""
+
+    for node in tree.body:
+        if not isinstance(node, ast.Assign):
+            continue
+        for target in node.targets:
+            if isinstance(target, ast.Name) and target.id == "USAGE":
+                if isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+                    return node.value.value
+    return ""
+
+
+def build_index(commands_dir=COMMANDS_DIR):
+    """
+    Scan the commands package on disk and return {name: usage}.
+    """
+    index = {}
+    for filename in sorted(os.listdir(commands_dir)):
+        name, ext = os.path.splitext(filename)
+        if ext != ".py" or name.startswith("_"):
+            continue
+        index[name] = _read_usage(os.path.join(commands_dir, filename))
+    return index
+
+
+def write_index(commands_dir=COMMANDS_DIR, index_path=INDEX_PATH):
+    index = build_index(commands_dir)
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump({"version": INDEX_VERSION, "commands": index}, f, indent=2)
+        f.write("\n")
+    return index
+
+
+# ---------------------------------------------------------
+# REGISTRY
+# ---------------------------------------------------------
+class CommandRegistry:
+    """
+    Command name -> module lookup backed by the prebuilt index.
+    Modules are imported the first time their command runs and then
+    stay cached for every terminal sharing this registry.
+    """
+
+    def __init__(self, package=COMMANDS_PACKAGE, index_path=INDEX_PATH):
+        self.package = package
+        self.index_path = index_path
+
+        self._index = None
+        self._modules = {}
+        self._lock = threading.Lock()
+
+    def _load_index(self):
+        if self._index is not None:
+            return self._index
+
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                raise ValueError("stale command index")
+            self._index = data.get("commands", {})
+        except Exception:
+            # Missing or broken index: fall back to scanning sources
+            self._index = build_index(os.path.dirname(self.index_path))
+
+        return self._index
+
+    def names(self):
+        return sorted(self._load_index().keys())
+
+    def usage(self, name):
+        return self._load_index().get(name, "")
+
+    def __contains__(self, name):
+        return name in self._load_index() or self.get(name) is not None
+
+    def get(self, name):
+        """
+        Return the imported command module, or None if there is no
+        such command. Names missing from the index are still tried so
+        a freshly added module works before the index is rebuilt. Only
+        real commands are cached; a typo or a module that fails to
+        import is looked up again next time.
+        """
+        if name in self._modules:
+            return self._modules[name]
+
+        if not name.isidentifier():
+            return None
+
+        with self._lock:
+            if name in self._modules:
+                return self._modules[name]
+
+            try:
+                mod = importlib.import_module(f"{self.package}.{name}")
+            except Exception:
+                mod = None
+
+            if mod is None or not (hasattr(mod, "run") or hasattr(mod, "stream")):
+                return None
+
+            self._modules[name] = mod
+            return mod
+
+
+_registry = None
+
+
+def get_registry():
+    """
+    Process-wide registry shared by every terminal window.
+    """
+    global _registry
+    if _registry is None:
+        _registry = CommandRegistry()
+    return _registry
+
+
+if __name__ == "__main__":
+    names = write_index()
+    print(f"Indexed {len(names)} commands -> {INDEX_PATH}")
@@ -0,0 +1,72 @@
+SCROLLBACK_LIMIT = 5000
+
+
+class Scrollback:
+    """
+    Fixed-capacity ring buffer holding the terminal's output lines.
+    Once the limit is reached the oldest line is dropped on every append,
+    so memory and per-line access cost stay constant.
+    """
+
+    def __init__(self, limit=SCROLLBACK_LIMIT, lines=None):
+        self.limit = max(1, int(limit))
+        self._buf = [None] * self.limit
+        self._start = 0
+        self._count = 0
+
+        # Total number of lines pushed out of the top, used by the
+        # renderer to keep a scrolled-up view steady.
+        self.dropped = 0
+
+        if lines:
+            self.extend(lines)
+
+    # ---------------------------------------------------------
+    # MUTATION
+    # ---------------------------------------------------------
+    def append(self, line):
+        if self._count < self.limit:
+            self._buf[(self._start + self._count) % self.limit] = line
+            self._count += 1
+        else:
+            self._buf[self._start] = line
+            self._start = (self._start + 1) % self.limit
+            self.dropped += 1
+
+    def extend(self, lines):
+        for line in lines:
+            self.append(line)
+
+    def clear(self):
+        self._buf = [None] * self.limit
+        self._start = 0
+        self._count = 0
+
+    # ---------------------------------------------------------
+    # ACCESS
+    # ---------------------------------------------------------
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("scrollback index out of range")
+
+        return self._buf[(self._start + index) % self.limit]
+
+    def __iter__(self):
+        return self.visible(0, self._count)
+
+    def visible(self, first, last):
+        """
+        Yield lines first..last-1 without touching the rest of the buffer.
+        """
+        first = max(0, first)
+        last = min(self._count, last)
+        for i in range(first, last):
+            yield self._buf[(self._start + i) % self.limit]
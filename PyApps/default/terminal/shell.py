@@ -0,0 +1,215 @@
+import os
+import shlex
+
+from PyApps.default.terminal.jobs import check_cancelled
+from kernel.utils import dedup
+from kernel.utils.quota import get_quota, note_added
+
+# Operators understood by the command line parser
+PIPE = "|"
+REDIRECT_WRITE = ">"
+REDIRECT_APPEND = ">>"
+BACKGROUND = "&"
+
+
+class ShellSyntaxError(Exception):
+    pass
+
+
+class UnknownCommand(Exception):
+    def __init__(self, command):
+        super().__init__(f"Unknown command: {command}")
+        self.command = command
+
+
+class StageError(Exception):
+    """
+    Raised when a pipeline stage fails, carrying the stage's name.
+    """
+
+    def __init__(self, command, error):
+        super().__init__(f"{command}: error: {error}")
+        self.command = command
+        self.error = error
+
+
+class Stage:
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+
+class Pipeline:
+    def __init__(self, stages, redirect=None, background=False):
+        self.stages = stages
+        self.redirect = redirect     # (">" or ">>", target) or None
+        self.background = background
+
+
+# ---------------------------------------------------------
+# PARSER
+# ---------------------------------------------------------
+def tokenize(cmd):
+    lexer = shlex.shlex(cmd, posix=True, punctuation_chars="|>&")
+    lexer.whitespace_split = True
+    lexer.escape = ""      # keep backslashes in paths
+    try:
+        return list(lexer)
+    except ValueError as e:
+        raise ShellSyntaxError(str(e))
+
+
+def parse(cmd):
+    """
+    Parse 'a x | b y > file &' into a Pipeline.
+    """
+    tokens = tokenize(cmd)
+
+    background = False
+    if tokens and tokens[-1] == BACKGROUND:
+        background = True
+        tokens = tokens[:-1]
+
+    stages = []
+    current = []
+    redirect = None
+
+    i = 0
+    while i < len(tokens):
+        tok = tokens[i]
+
+        if tok == PIPE:
+            if not current:
+                raise ShellSyntaxError("syntax error near '|'")
+            stages.append(current)
+            current = []
+
+        elif tok in (REDIRECT_WRITE, REDIRECT_APPEND):
+            if i + 1 >= len(tokens) or tokens[i + 1] in (PIPE, REDIRECT_WRITE, REDIRECT_APPEND):
+                raise ShellSyntaxError(f"syntax error near '{tok}'")
+            if i + 2 != len(tokens):
+                raise ShellSyntaxError("redirection must end the command")
+            redirect = (tok, tokens[i + 1])
+            break
+
+        elif set(tok) <= {"|", ">", "&"}:
+            raise ShellSyntaxError(f"syntax error near '{tok}'")
+
+        else:
+            current.append(tok)
+
+        i += 1
+
+    if not current:
+        raise ShellSyntaxError("syntax error: missing command")
+    stages.append(current)
+
+    return Pipeline(
+        [Stage(parts[0].lower(), parts[1:]) for parts in stages],
+        redirect,
+        background,
+    )
+
+
+# ---------------------------------------------------------
+# COMMAND ADAPTERS
+# ---------------------------------------------------------
+class _CaptureTerm:
+    """
+    Stand-in terminal handed to run(term, args) commands inside a
+    pipeline. Output lines are captured; every other attribute read or
+    write goes straight through to the real terminal.
+    """
+
+    def __init__(self, term):
+        object.__setattr__(self, "_term", term)
+        object.__setattr__(self, "lines", [])
+
+    def __getattr__(self, name):
+        return getattr(self._term, name)
+
+    def __setattr__(self, name, value):
+        if name == "lines":
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._term, name, value)
+
+
+def _run_adapter(mod, term, args, stdin):
+    if stdin is not None:
+        stdin.close()
+
+    capture = _CaptureTerm(term)
+    mod.run(capture, args)
+    yield from capture.lines
+
+
+def fail(term, message):
+    """
+    Mark the running command as failed and return message, so commands
+    can write: yield fail(term, "copy error: ...") or
+    term.lines.append(fail(term, ...)). run_pipeline() reports it.
+    """
+    term.failed = True
+    return message
+
+
+def command_stream(mod, term, args, stdin=None):
+    """
+    Return a generator of output lines for a command module, using its
+    stream(term, args, stdin) entry point when it has one.
+    """
+    if hasattr(mod, "stream"):
+        return mod.stream(term, args, stdin)
+    return _run_adapter(mod, term, args, stdin)
+
+
+def _guard(name, gen):
+    try:
+        yield from gen
+    except StageError:
+        raise
+    except Exception as e:
+        raise StageError(name, e)
+
+
+# ---------------------------------------------------------
+# EXECUTION
+# ---------------------------------------------------------
+def connect(term, pipeline, registry):
+    """
+    Chain the pipeline's stages into one generator of output lines.
+    Unknown commands raise UnknownCommand before anything runs.
+    """
+    stream = None
+    for stage in pipeline.stages:
+        mod = registry.get(stage.name)
+        if mod is None:
+            raise UnknownCommand(stage.name)
+        stream = _guard(stage.name, command_stream(mod, term, stage.args, stream))
+    return stream
+
+
+def write_redirect(term, redirect, stream):
+    mode, target = redirect
+    path = term.vfs_abs(target)
+
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+
+    # Output size isn't known up front; refuse only when already over
+    quota = get_quota()
+    quota.check(path, 0)
+    old_size = os.path.getsize(path) if os.path.isfile(path) else 0
+
+    dedup.detach(path, keep_data=mode == REDIRECT_APPEND)
+    try:
+        with open(path, "a" if mode == REDIRECT_APPEND else "w", encoding="utf-8") as f:
+            for line in stream:
+                f.write(line)
+                f.write("\n")
+                check_cancelled()
+    finally:
+        new_size = os.path.getsize(path) if os.path.isfile(path) else 0
+        note_added(path, new_size - old_size)
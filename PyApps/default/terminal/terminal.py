@@ -1,22 +1,26 @@
 import pygame
 import os
-import time
-import importlib
-import pkgutil
+from collections import OrderedDict
+
+from PyApps.default.terminal.scrollback import SCROLLBACK_LIMIT
+from PyApps.default.terminal.engine import ShellEngine
+from userspace.system.assets import load_font
 
 FONT_PATH = os.path.join("res", "fonts", "msa", "Ac437_TridentEarly_8x14.ttf")
 
+LINE_HEIGHT = 24
+TOP_MARGIN = 10
+
+# Rendered line surfaces kept around; only a screenful is ever drawn,
+# so this just has to comfortably cover the visible viewport.
+LINE_CACHE_SIZE = 256
 
-class TerminalApp:
-    def __init__(self):
-        self.font = pygame.font.Font(FONT_PATH, 18)
 
-        # Virtual filesystem root
-        self.VFS_ROOT = os.path.normpath(os.path.join("config", "live", "PyOS"))
-        self.cwd = self.VFS_ROOT
+class TerminalApp(ShellEngine):
+    def __init__(self, scrollback_limit=SCROLLBACK_LIMIT):
+        self.font = load_font(FONT_PATH, 18)
 
         # Terminal state
-        self.lines = ["PyOS Terminal v0.3 (VFS mode)", ""]
         self.input_text = ""
         self.cursor_visible = True
         self.cursor_timer = 0
@@ -26,78 +30,63 @@ class TerminalApp:
         self.bg_color = (20, 20, 20)
 
         # Scrolling
-        self.scroll = 0
         self.auto_scroll = True
         self.last_surface_height = 0
+        self._seen_dropped = 0
 
-        # Logging
-        self.LOG_PATH = os.path.join(
-            self.VFS_ROOT, "System", "Logs", "Apps", "cmd.log"
-        )
+        # Rendered line surfaces (text -> Surface), LRU ordered
+        self._line_cache = OrderedDict()
 
-        # Commands
-        self.commands = {}
-        self.load_commands()
+        # History navigation (Up/Down) and reverse search (Ctrl+R)
+        self.history_cursor = None
+        self.history_saved = ""
+        self.search_query = None
+        self.search_match = ""
+        self.search_cursor = 0
 
-        self.update_prompt()
+        # cwd, output lines, commands, jobs and logging
+        super().__init__(scrollback_limit)
 
     # ---------------------------------------------------------
-    # COMMAND LOADER
+    # DRAW
     # ---------------------------------------------------------
-    def load_commands(self):
-        self.commands = {}
-
-        pkg_name = __package__ + ".commands" if __package__ else "PyApps.default.terminal.commands"
-
-        try:
-            cmdpkg = importlib.import_module(pkg_name)
-        except ImportError:
-            return
-
-        for info in pkgutil.iter_modules(cmdpkg.__path__):
-            mod_name = f"{pkg_name}.{info.name}"
-            try:
-                mod = importlib.import_module(mod_name)
-            except Exception:
-                continue
-
-            if hasattr(mod, "run"):
-                self.commands[info.name] = mod.run
+    def update(self, surface, mouse_pos):
+        height = surface.get_height()
+        self.last_surface_height = height
+        surface.fill(self.bg_color)
 
-    # ---------------------------------------------------------
-    # PATH HELPERS
-    # ---------------------------------------------------------
-    def vfs_abs(self, path):
-        if not os.path.isabs(path):
-            path = os.path.join(self.cwd, path)
-        path = os.path.normpath(path)
+        # Output from background jobs arrives here, on the UI thread
+        if self.jobs.pump():
+            self._scroll_to_bottom()
 
-        if not path.startswith(self.VFS_ROOT):
-            return self.VFS_ROOT
+        # Keep a scrolled-up view in place while old lines fall off the top
+        dropped = self.lines.dropped - self._seen_dropped
+        if dropped:
+            self._seen_dropped = self.lines.dropped
+            if not self.auto_scroll:
+                self.scroll = max(0, self.scroll - dropped * LINE_HEIGHT)
 
-        return path
+        # Only the lines inside the viewport are drawn
+        total = len(self.lines)
+        first = max(0, (self.scroll - TOP_MARGIN) // LINE_HEIGHT)
+        last = min(total, (self.scroll + height - TOP_MARGIN) // LINE_HEIGHT + 1)
 
-    def update_prompt(self):
-        shown = self.cwd.replace(self.VFS_ROOT, "")
-        if shown == "":
-            shown = "/"
-        self.prompt = f"{shown}> "
+        y = TOP_MARGIN - self.scroll + first * LINE_HEIGHT
+        for line in self.lines.visible(first, last):
+            surface.blit(self._render_line(line), (10, y))
+            y += LINE_HEIGHT
 
-    # ---------------------------------------------------------
-    # DRAW
-    # ---------------------------------------------------------
-    def update(self, surface, mouse_pos):
-        self.last_surface_height = surface.get_height()
-        surface.fill(self.bg_color)
+        y = TOP_MARGIN - self.scroll + total * LINE_HEIGHT
 
-        y = 10 - self.scroll
-        for line in self.lines:
-            txt = self.font.render(line, True, self.text_color)
-            surface.blit(txt, (10, y))
-            y += 24
+        # A foreground job owns the terminal until it finishes
+        if self.jobs.foreground is not None:
+            return
 
         # Input line
-        input_line = self.prompt + self.input_text
+        if self.search_query is not None:
+            input_line = f"(reverse-i-search)'{self.search_query}': {self.search_match}"
+        else:
+            input_line = self.prompt + self.input_text
         txt = self.font.render(input_line, True, self.text_color)
         surface.blit(txt, (10, y))
 
@@ -112,6 +101,24 @@ class TerminalApp:
             cy = y
             pygame.draw.rect(surface, self.text_color, (cx, cy + 2, 12, 20))
 
+    def _render_line(self, line):
+        surf = self._line_cache.get(line)
+        if surf is not None:
+            self._line_cache.move_to_end(line)
+            return surf
+
+        surf = self.font.render(line, True, self.text_color)
+        self._line_cache[line] = surf
+        if len(self._line_cache) > LINE_CACHE_SIZE:
+            self._line_cache.popitem(last=False)
+        return surf
+
+    def invalidate_line_cache(self):
+        """
+        Drop every cached line surface (colors changed or screen cleared).
+        """
+        self._line_cache.clear()
+
     # ---------------------------------------------------------
     # EVENTS
     # ---------------------------------------------------------
@@ -121,7 +128,7 @@ class TerminalApp:
             self.scroll -= event.y * 30
             self.scroll = max(0, self.scroll)
 
-            max_scroll = max(0, len(self.lines) * 24 + 40 - self.last_surface_height)
+            max_scroll = max(0, len(self.lines) * LINE_HEIGHT + 40 - self.last_surface_height)
 
             if self.scroll < old_scroll:
                 self.auto_scroll = False
@@ -131,76 +138,108 @@ class TerminalApp:
 
             return
 
+        if event.type == pygame.KEYDOWN and self.jobs.foreground is not None:
+            if event.key == pygame.K_c and event.mod & pygame.KMOD_CTRL:
+                self.jobs.kill(self.jobs.foreground)
+                self.lines.append("^C")
+            return
+
+        if event.type == pygame.KEYDOWN and self.search_query is not None:
+            self._handle_search_key(event)
+            return
+
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_BACKSPACE:
                 self.input_text = self.input_text[:-1]
 
             elif event.key == pygame.K_RETURN:
+                self.history_cursor = None
                 self.execute_command(self.input_text)
                 self.input_text = ""
 
+            elif event.key == pygame.K_UP:
+                self.history_up()
+
+            elif event.key == pygame.K_DOWN:
+                self.history_down()
+
+            elif event.key == pygame.K_r and event.mod & pygame.KMOD_CTRL:
+                self.search_query = ""
+                self.search_match = ""
+                self.search_cursor = self.history.end()
+
+            elif event.key == pygame.K_TAB:
+                self.input_text = self.complete_input(self.input_text)
+
             else:
                 if event.unicode and event.unicode.isprintable():
                     self.input_text += event.unicode
 
     # ---------------------------------------------------------
-    # EXECUTE COMMAND
+    # HISTORY
     # ---------------------------------------------------------
-    def execute_command(self, cmd):
-        cmd = cmd.strip()
-        self.lines.append(self.prompt + cmd)
-        self._log_command(cmd)
-
-        if cmd == "":
-            self.lines.append("")
-            self._scroll_to_bottom()
+    def history_up(self):
+        if self.history_cursor is None:
+            self.history_saved = self.input_text
+            self.history_cursor = self.history.end()
+
+        entry = self.history.previous(self.history_cursor)
+        while entry is not None and entry[0] == self.input_text:
+            entry = self.history.previous(entry[1])
+        if entry is not None:
+            self.input_text, self.history_cursor = entry
+
+    def history_down(self):
+        if self.history_cursor is None:
             return
 
-        parts = cmd.split()
-        command = parts[0].lower()
-        args = parts[1:]
-
-        # Built-in fallback help
-        if command == "help" and "help" not in self.commands:
-            self.lines.append("Available commands:")
-            for name in sorted(self.commands.keys()):
-                self.lines.append(f"  {name}")
-            self.lines.append("")
-            self._scroll_to_bottom()
-            return
-
-        # Modular command
-        if command in self.commands:
-            try:
-                self.commands[command](self, args)
-            except Exception as e:
-                self.lines.append(f"{command}: error: {e}")
-            self.lines.append("")
-            self._scroll_to_bottom()
-            return
-
-        # Unknown
-        self.lines.append(f"Unknown command: {command}")
-        self.lines.append("")
-        self._scroll_to_bottom()
+        entry = self.history.next(self.history_cursor)
+        if entry is None:
+            self.input_text = self.history_saved
+            self.history_cursor = None
+        else:
+            self.input_text, self.history_cursor = entry
+
+    def _search(self, before, skip=None):
+        found = self.history.search(self.search_query, before, skip)
+        if found is not None:
+            self.search_match, self.search_cursor = found
+        elif not self.search_query:
+            self.search_match = ""
+
+    def _handle_search_key(self, event):
+        ctrl = event.mod & pygame.KMOD_CTRL
+
+        if event.key == pygame.K_r and ctrl:
+            # Next older match, skipping repeats of the one shown
+            self._search(self.search_cursor, self.search_match)
+
+        elif event.key == pygame.K_BACKSPACE:
+            self.search_query = self.search_query[:-1]
+            self._search(self.history.end())
+
+        elif event.key == pygame.K_ESCAPE or (event.key == pygame.K_g and ctrl):
+            self.search_query = None
+
+        elif event.key == pygame.K_RETURN:
+            self.search_query = None
+            self.execute_command(self.search_match)
+            self.input_text = ""
+
+        elif event.unicode and event.unicode.isprintable() and not ctrl:
+            # Incremental: the entry shown stays a candidate
+            self.search_query += event.unicode
+            start = self.history.after(self.search_cursor) if self.search_match else self.history.end()
+            self._search(start)
+
+        else:
+            self.input_text = self.search_match
+            self.search_query = None
 
     # ---------------------------------------------------------
     # SCROLL
     # ---------------------------------------------------------
     def _scroll_to_bottom(self):
         if self.auto_scroll:
-            total_height = len(self.lines) * 24 + 40
+            total_height = len(self.lines) * LINE_HEIGHT + 40
             self.scroll = max(0, total_height - self.last_surface_height)
-
-    # ---------------------------------------------------------
-    # LOGGING
-    # ---------------------------------------------------------
-    def _log_command(self, cmd):
-        try:
-            log_dir = os.path.dirname(self.LOG_PATH)
-            os.makedirs(log_dir, exist_ok=True)
-            with open(self.LOG_PATH, "a", encoding="utf-8") as f:
-                timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-                f.write(f"[{timestamp}] {cmd}\n")
-        except Exception:
-            pass
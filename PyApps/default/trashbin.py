@@ -2,23 +2,31 @@ import pygame
 import os
 import time
 
-from userspace.system.trash_manager import (
-    list_trash,
-    restore,
-    delete_permanently,
-    empty_trash,
-)
+from userspace.system.trash_manager import list_trash, count_trash, FILES_DIR
+from kernel.utils.fs_watch import DirectoryMonitor
+from kernel.utils.file_ops import get_file_ops, PRIORITY_INTERACTIVE
+from userspace.system.assets import load_font
+from userspace.ui.file_ops_panel import FileOpsPanel, FILEOP_EVENT, pump as pump_file_ops
 
 FONT_PATH = os.path.join("res", "fonts", "msa", "Ac437_TridentEarly_8x14.ttf")
 
 
 class TrashBinApp:
     def __init__(self):
-        self.font = pygame.font.Font(FONT_PATH, 18)
-        self.small = pygame.font.Font(FONT_PATH, 14)
-
-        self.items = list_trash()
-        self.selected = None
+        self.font = load_font(FONT_PATH, 18)
+        self.small = load_font(FONT_PATH, 14)
+
+        # Only the rows on screen are read from the index
+        self.items = []
+        self.count = 0
+        self.page = None
+        self.stale = True
+        # Ctrl+click adds to the selection
+        self.selected = set()
+
+        # Items trashed from Explorer or the terminal show up live
+        self.monitor = DirectoryMonitor(FILES_DIR)
+        self.monitor.changed()
         self.last_click = 0
         self.scroll = 0
 
@@ -28,10 +36,22 @@ class TrashBinApp:
         self.context_menu = None
         self.context_pos = (0, 0)
 
+        self.ops_panel = FileOpsPanel()
+
+        # Running "Empty Trash", shown as a bar in the header
+        self.empty_op = None
+
     # ---------------------------------------------------------
     # UPDATE / DRAW
     # ---------------------------------------------------------
     def update(self, surface, mouse_pos):
+        pump_file_ops()
+
+        rows = (surface.get_height() - self.header_height - 30) // self.row_height + 2
+        first = self.scroll // self.row_height
+        if self.monitor.changed() or self.stale or self.page != (first, rows):
+            self.load_page(first, rows)
+
         surface.fill((240, 240, 240))
 
         # Header
@@ -39,13 +59,17 @@ class TrashBinApp:
         title = self.font.render("Recycle Bin", True, (0, 0, 0))
         surface.blit(title, (10, 8))
 
-        # Empty Trash button
+        # Empty Trash button; turns into Cancel while emptying
+        emptying = self.empty_op is not None and self.empty_op.active
         btn_rect = pygame.Rect(surface.get_width() - 150, 5, 140, 30)
-        pygame.draw.rect(surface, (180, 60, 60), btn_rect)
-        txt = self.font.render("Empty Trash", True, (255, 255, 255))
+        pygame.draw.rect(surface, (120, 120, 120) if emptying else (180, 60, 60), btn_rect)
+        txt = self.font.render("Cancel" if emptying else "Empty Trash", True, (255, 255, 255))
         surface.blit(txt, (btn_rect.x + 10, btn_rect.y + 5))
         self.empty_btn_rect = btn_rect
 
+        if emptying:
+            self.draw_empty_progress(surface, btn_rect.x - 20)
+
         # Column headers
         y = self.header_height
         pygame.draw.rect(surface, (220, 220, 220), (0, y, surface.get_width(), 30))
@@ -55,7 +79,7 @@ class TrashBinApp:
 
         # Items
         y += 30
-        start_y = y - self.scroll
+        start_y = y - self.scroll + first * self.row_height
 
         for item in self.items:
             row_rect = pygame.Rect(0, start_y, surface.get_width(), self.row_height)
@@ -63,7 +87,7 @@ class TrashBinApp:
             # Hover / selected
             if row_rect.collidepoint(mouse_pos):
                 pygame.draw.rect(surface, (210, 210, 255), row_rect)
-            if self.selected == item["id"]:
+            if item["id"] in self.selected:
                 pygame.draw.rect(surface, (180, 200, 255), row_rect)
 
             # Draw text
@@ -82,6 +106,25 @@ class TrashBinApp:
         if self.context_menu:
             self.draw_context_menu(surface)
 
+        self.ops_panel.draw(surface)
+
+    def draw_empty_progress(self, surface, right):
+        op = self.empty_op
+        bar = pygame.Rect(180, 12, max(0, right - 180), 16)
+        pygame.draw.rect(surface, (255, 255, 255), bar)
+        fill = bar.copy()
+        fill.width = int(bar.width * op.progress)
+        pygame.draw.rect(surface, (180, 60, 60), fill)
+        pygame.draw.rect(surface, (0, 0, 0), bar, 1)
+        label = self.small.render(f"{op.done_items} / {op.total_items}", True, (0, 0, 0))
+        surface.blit(label, (bar.x + 6, bar.y + 1))
+
+    def load_page(self, first, rows):
+        self.count = count_trash()
+        self.items = list_trash(first, rows)
+        self.page = (first, rows)
+        self.stale = False
+
     # ---------------------------------------------------------
     # CONTEXT MENU
     # ---------------------------------------------------------
@@ -110,12 +153,21 @@ class TrashBinApp:
         else:
             lx, ly = None, None
 
+        # Restores and deletes landing: re-read the visible rows
+        if event.type == FILEOP_EVENT:
+            self.stale = True
+            return
+
         # Scroll
         if event.type == pygame.MOUSEWHEEL:
             self.scroll -= event.y * 30
-            self.scroll = max(0, self.scroll)
+            self.scroll = max(0, min(self.scroll, (self.count - 1) * self.row_height))
             return
 
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.ops_panel.handle_click((lx, ly)):
+                return
+
         # Context menu click
         if self.context_menu:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -130,8 +182,10 @@ class TrashBinApp:
         # Empty trash button
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if self.empty_btn_rect.collidepoint((lx, ly)):
-                empty_trash()
-                self.items = list_trash()
+                if self.empty_op is not None and self.empty_op.active:
+                    self.empty_op.cancel()
+                else:
+                    self.empty()
                 return
 
         # Click on items
@@ -145,11 +199,12 @@ class TrashBinApp:
             now = pygame.time.get_ticks()
 
             if clicked:
-                if now - self.last_click < 300:
-                    restore(clicked["id"])
-                    self.items = list_trash()
+                if pygame.key.get_mods() & pygame.KMOD_CTRL:
+                    self.selected ^= {clicked["id"]}
+                elif now - self.last_click < 300:
+                    self.restore([clicked["id"]])
                 else:
-                    self.selected = clicked["id"]
+                    self.selected = {clicked["id"]}
 
                 self.last_click = now
                 return
@@ -158,24 +213,51 @@ class TrashBinApp:
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
             for item in self.items:
                 if item["rect"].collidepoint((lx, ly)):
-                    self.selected = item["id"]
+                    if item["id"] not in self.selected:
+                        self.selected = {item["id"]}
+                    ids = ",".join(sorted(self.selected))
+                    count = f" ({len(self.selected)})" if len(self.selected) > 1 else ""
                     self.context_menu = [
-                        ("Restore", f"restore::{item['id']}"),
-                        ("Delete Permanently", f"delete::{item['id']}"),
+                        (f"Restore{count}", f"restore::{ids}"),
+                        (f"Delete Permanently{count}", f"delete::{ids}"),
                     ]
                     self.context_pos = (lx, ly)
                     return
 
+        # Delete key removes the selection for good
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_DELETE and self.selected:
+            self.delete(sorted(self.selected))
+
     # ---------------------------------------------------------
     # CONTEXT COMMANDS
     # ---------------------------------------------------------
     def run_context_command(self, cmd):
         if cmd.startswith("restore::"):
-            tid = cmd.split("::")[1]
-            restore(tid)
-            self.items = list_trash()
+            self.restore(cmd.split("::")[1].split(","))
 
         elif cmd.startswith("delete::"):
-            tid = cmd.split("::")[1]
-            delete_permanently(tid)
-            self.items = list_trash()
+            self.delete(cmd.split("::")[1].split(","))
+
+    # ---------------------------------------------------------
+    # FILE OPERATIONS
+    # ---------------------------------------------------------
+    # Queued on the shared file-operations service as one batch each;
+    # the list refreshes when they finish.
+    def refresh(self, op=None):
+        self.stale = True
+
+    def restore(self, ids):
+        self.selected -= set(ids)
+        label = f"Restoring {len(ids)} items" if len(ids) > 1 else "Restoring"
+        get_file_ops().restore(ids, priority=PRIORITY_INTERACTIVE, label=label, on_done=self.refresh)
+
+    def delete(self, ids):
+        self.selected -= set(ids)
+        label = f"Deleting {len(ids)} items" if len(ids) > 1 else "Deleting"
+        get_file_ops().purge(ids, priority=PRIORITY_INTERACTIVE, label=label, on_done=self.refresh)
+
+    def empty(self):
+        # Items are deleted several at a time in the background and
+        # leave the list as they go; cancelling keeps the rest.
+        self.selected = set()
+        self.empty_op = get_file_ops().empty_trash(label="Emptying trash", on_done=self.refresh)
@@ -11,6 +11,8 @@ from extra.public.boot.booterr_log import log_error
 from boot.bootextr.string import fade_in_text, fade_out_all
 from kernel.main.login import login_main
 from kernel.utils.fs_init import init_pyfs
+from kernel.utils.journal import get_journal
+from userspace.system.assets import load_font, load_image
 
 FONT_PATH = os.path.join("res", "fonts", "msa", "Ac437_TridentEarly_8x14.ttf")
 LOGO_PATH = os.path.join("res", "images", "msa", "boot", "splash_logo_msa.png")
@@ -20,7 +22,12 @@ FG_COLOR = (255, 255, 255)
 
 
 def main():
-    init_pyfs()
+    # Replays metadata changes a crash left in the journal
+    get_journal()
+
+    # --repair re-checks every default directory and file, not just the
+    # ones added since the last boot
+    init_pyfs(repair="--repair" in sys.argv[1:])
     try:
         pygame.init()
 
@@ -32,7 +39,7 @@ def main():
         screen.fill(BG_COLOR)
 
         # Load logo
-        logo = pygame.image.load(LOGO_PATH).convert_alpha()
+        logo = load_image(LOGO_PATH).convert_alpha()
         scale = (width * 0.3) / logo.get_width()
         logo = pygame.transform.scale(
             logo,
@@ -41,7 +48,7 @@ def main():
         logo_rect = logo.get_rect(center=(width // 2, int(height * 0.30)))
 
         # Load font
-        font = pygame.font.Font(FONT_PATH, int(height * 0.06))
+        font = load_font(FONT_PATH, int(height * 0.06))
 
         # Draw logo + welcome
         screen.blit(logo, logo_rect)
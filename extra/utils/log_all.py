@@ -3,14 +3,15 @@ import pygame
 import datetime
 import traceback
 
+from userspace.system.log_writer import get_log_writer
+
 LOG_DIR = "logs"
 LOG_FILE = os.path.join(LOG_DIR, "full_log.txt")
 
 
 class LogAll:
     def __init__(self):
-        os.makedirs(LOG_DIR, exist_ok=True)
-        self.file = open(LOG_FILE, "a", encoding="utf-8")
+        self.writer = get_log_writer(LOG_FILE)
         self.start_time = datetime.datetime.now()
 
         self.log("========== LOGGER STARTED ==========")
@@ -25,8 +26,7 @@ class LogAll:
         line = f"[{timestamp}] {text}"
 
         print(line)
-        self.file.write(line + "\n")
-        self.file.flush()
+        self.writer.write(line)
 
     # ---------------------------------------------------------
     # EVENT LOGGING
@@ -104,4 +104,4 @@ class LogAll:
     # ---------------------------------------------------------
     def close(self):
         self.log("========== LOGGER STOPPED ==========")
-        self.file.close()
+        self.writer.close()
@@ -1,6 +1,7 @@
 import os
 import pygame
 from kernel.utils.config import config_main
+from userspace.system.assets import load_font, load_image
 
 LOGIN_BG_PATH = os.path.join("res", "images", "msa", "boot", "img100.jpg")
 FONT_PATH     = os.path.join("res", "fonts", "msa", "Ac437_TridentEarly_8x14.ttf")
@@ -15,11 +16,11 @@ ERROR_COLOR   = (255, 80, 80)
 def login_main(screen):
     width, height = screen.get_size()
 
-    login_bg = pygame.image.load(LOGIN_BG_PATH).convert()
+    login_bg = load_image(LOGIN_BG_PATH).convert()
     login_bg = pygame.transform.scale(login_bg, (width, height))
 
-    font_big = pygame.font.Font(FONT_PATH, int(height * 0.07))
-    font_small = pygame.font.Font(FONT_PATH, int(height * 0.045))
+    font_big = load_font(FONT_PATH, int(height * 0.07))
+    font_small = load_font(FONT_PATH, int(height * 0.045))
 
     username = ""
     password = ""
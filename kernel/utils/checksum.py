@@ -0,0 +1,206 @@
+import os
+import json
+import zlib
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+PYOS_ROOT = os.path.join("config", "live", "PyOS")
+MANIFEST_PATH = os.path.join(PYOS_ROOT, "Meta", "checksums.json")
+
+# zlib and hashlib drop the GIL on big buffers, so large reads let the
+# hashing threads actually run in parallel.
+CHUNK_SIZE = 4 * 1024 * 1024
+MAX_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
+STRONG_HASH = "sha256"
+
+
+# ---------------------------------------------------------
+# HASHING
+# ---------------------------------------------------------
+def checksum_file(path, strong=None):
+    """
+    Stream a file once and return {"crc32": "xxxxxxxx"} plus the
+    strong digest (e.g. "sha256") if one was asked for.
+    """
+    crc = 0
+    digest = hashlib.new(strong) if strong else None
+
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            buf = f.read(CHUNK_SIZE)
+            if not buf:
+                break
+            crc = zlib.crc32(buf, crc)
+            if digest is not None:
+                digest.update(buf)
+
+    result = {"crc32": f"{crc & 0xFFFFFFFF:08x}"}
+    if digest is not None:
+        result[strong] = digest.hexdigest()
+    return result
+
+
+def hash_files(paths, strong=None, workers=MAX_WORKERS):
+    """
+    Hash many files in parallel. Yields (path, result, error) in
+    completion order with a bounded number of files in flight.
+    """
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pyos-hash") as pool:
+        pending = {}
+        for path in paths:
+            pending[pool.submit(checksum_file, path, strong)] = path
+            if len(pending) >= workers * 4:
+                yield from _drain(pending, wait_all=False)
+        yield from _drain(pending, wait_all=True)
+
+
+def _drain(pending, wait_all):
+    while pending:
+        ready, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in ready:
+            path = pending.pop(fut)
+            try:
+                yield path, fut.result(), None
+            except OSError as e:
+                yield path, None, e
+        if not wait_all:
+            return
+
+
+# ---------------------------------------------------------
+# MANIFEST
+# ---------------------------------------------------------
+class ChecksumManifest:
+    """
+    Cached checksums keyed by path relative to the VFS root. An entry is
+    trusted as long as the file's size and mtime still match, so
+    unchanged files are never re-hashed.
+    """
+
+    def __init__(self, path=MANIFEST_PATH, root=PYOS_ROOT):
+        self.path = path
+        self.root = os.path.abspath(root)
+        self.entries = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.entries = data.get("files", {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return
+            data = {"version": 1, "files": dict(self.entries)}
+            self.dirty = False
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def rel(self, path):
+        """
+        Manifest key for a path, or None if it is outside the root.
+        """
+        full = os.path.abspath(path)
+        if full != self.root and not full.startswith(self.root + os.sep):
+            return None
+        return os.path.relpath(full, self.root).replace(os.sep, "/")
+
+    # ---------------------------------------------------------
+    # ENTRIES
+    # ---------------------------------------------------------
+    def lookup(self, path, st=None, strong=None):
+        """
+        Cached checksums if still valid for the file on disk, else None.
+        """
+        key = self.rel(path)
+        if key is None:
+            return None
+
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        if st is None:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return None
+
+        if entry.get("size") != st.st_size or entry.get("mtime_ns") != st.st_mtime_ns:
+            return None
+        if strong and strong not in entry:
+            return None
+        return entry
+
+    def record(self, path, result, st=None):
+        key = self.rel(path)
+        if key is None:
+            return
+
+        if st is None:
+            st = os.stat(path)
+
+        entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        entry.update(result)
+        with self._lock:
+            self.entries[key] = entry
+            self.dirty = True
+
+    def forget(self, key):
+        with self._lock:
+            if self.entries.pop(key, None) is not None:
+                self.dirty = True
+
+    def checksum(self, path, strong=None):
+        """
+        Checksums for a file, served from the manifest when unchanged.
+        """
+        st = os.stat(path)
+        cached = self.lookup(path, st, strong)
+        if cached is not None:
+            return cached
+
+        result = checksum_file(path, strong)
+        self.record(path, result, st)
+        return result
+
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+
+def get_manifest():
+    global _manifest
+    with _manifest_lock:
+        if _manifest is None:
+            _manifest = ChecksumManifest()
+        return _manifest
+
+
+def verify_copy(src, dst, strong=None):
+    """
+    True if dst has the same content as src. The source checksum comes
+    from the manifest when it is already known.
+    """
+    manifest = get_manifest()
+    expected = manifest.checksum(src, strong)
+    actual = checksum_file(dst, strong)
+    if expected["crc32"] != actual["crc32"]:
+        return False
+    if strong and expected.get(strong) != actual.get(strong):
+        return False
+
+    manifest.record(dst, actual)
+    return True
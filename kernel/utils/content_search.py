@@ -0,0 +1,204 @@
+import os
+import re
+import mmap
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+# Files sniffed for a NUL byte to decide they are binary
+BINARY_SNIFF = 8192
+
+# Newlines are counted in windows so -n never copies a big file at once
+COUNT_WINDOW = 16 * 1024 * 1024
+
+MAX_LINE = 500
+BATCH_SIZE = 64
+
+# Below this many files the scan stays in-process; starting worker
+# processes costs more than it saves.
+POOL_THRESHOLD = BATCH_SIZE
+
+MAX_WORKERS = os.cpu_count() or 1
+
+_compiled = {}
+
+
+def compile_pattern(pattern, ignore_case=False):
+    """
+    Bytes regex for scanning mmapped files. Matching is ASCII-only:
+    \\w, \\b, \\d, \\s and ignore_case only know ASCII letters.
+    """
+    key = (pattern, ignore_case)
+    regex = _compiled.get(key)
+    if regex is None:
+        flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        regex = re.compile(pattern.encode("utf-8"), flags)
+        _compiled[key] = regex
+    return regex
+
+
+def compile_text_pattern(pattern, ignore_case=False):
+    """
+    str regex for lines already decoded (e.g. piped input), with the
+    same ASCII-only rules as compile_pattern() so a search gives the
+    same answer whichever way the text arrives.
+    """
+    return re.compile(pattern, re.ASCII | (re.IGNORECASE if ignore_case else 0))
+
+
+def _count_newlines(mm, start, end):
+    count = 0
+    while start < end:
+        stop = min(end, start + COUNT_WINDOW)
+        count += mm[start:stop].count(b"\n")
+        start = stop
+    return count
+
+
+def scan_file(path, pattern, ignore_case=False, list_only=False, line_numbers=False):
+    """
+    Search one file through mmap. Returns (matches, error) where
+    matches is a list of (line_no, text); binary files never match.
+    """
+    regex = compile_pattern(pattern, ignore_case)
+
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return [], None
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        return [], e
+
+    matches = []
+    try:
+        if mm.find(b"\0", 0, BINARY_SNIFF) != -1:
+            return [], None
+
+        pos = 0
+        line_no = 1
+        counted_to = 0
+
+        while pos <= size:
+            m = regex.search(mm, pos)
+            if m is None:
+                break
+
+            line_start = mm.rfind(b"\n", 0, m.start()) + 1
+            line_end = mm.find(b"\n", m.start())
+            if line_end == -1:
+                line_end = size
+
+            if line_numbers:
+                line_no += _count_newlines(mm, counted_to, line_start)
+                counted_to = line_start
+
+            text = mm[line_start:min(line_end, line_start + MAX_LINE)]
+            matches.append((line_no, text.decode("utf-8", "replace").rstrip("\r")))
+
+            if list_only:
+                break
+            pos = line_end + 1
+    finally:
+        mm.close()
+
+    return matches, None
+
+
+def scan_batch(paths, pattern, ignore_case=False, list_only=False, line_numbers=False):
+    """
+    Worker entry point: scan a batch of files in one round trip.
+    """
+    results = []
+    for path in paths:
+        matches, error = scan_file(path, pattern, ignore_case, list_only, line_numbers)
+        if matches or error:
+            results.append((path, matches, error))
+    return results
+
+
+# ---------------------------------------------------------
+# PROCESS POOL
+# ---------------------------------------------------------
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that runs pygame and helper
+            # threads is not safe
+            ctx = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=ctx)
+        return _pool
+
+
+def _shutdown_pool():
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(_shutdown_pool)
+
+
+def search_files(paths, pattern, ignore_case=False, list_only=False, line_numbers=False, cancelled=None):
+    """
+    Stream (path, matches, error) for every file with a hit, in
+    completion order. Small inputs are scanned in-process; larger ones
+    are fanned out to a process pool in batches.
+    """
+    compile_pattern(pattern, ignore_case)   # fail fast on a bad regex
+    opts = (pattern, ignore_case, list_only, line_numbers)
+
+    paths = iter(paths)
+    head = []
+    for path in paths:
+        head.append(path)
+        if len(head) >= POOL_THRESHOLD:
+            break
+
+    if len(head) < POOL_THRESHOLD:
+        for path in head:
+            if cancelled is not None and cancelled():
+                return
+            matches, error = scan_file(path, *opts)
+            if matches or error:
+                yield path, matches, error
+        return
+
+    pool = _get_pool()
+    pending = set()
+    batch = head
+
+    try:
+        for path in paths:
+            batch.append(path)
+            if len(batch) < BATCH_SIZE:
+                continue
+
+            pending.add(pool.submit(scan_batch, batch, *opts))
+            batch = []
+
+            if len(pending) >= MAX_WORKERS * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield from fut.result()
+                if cancelled is not None and cancelled():
+                    return
+
+        if batch:
+            pending.add(pool.submit(scan_batch, batch, *opts))
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield from fut.result()
+            if cancelled is not None and cancelled():
+                return
+    finally:
+        for fut in pending:
+            fut.cancel()
@@ -0,0 +1,259 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from kernel.utils.fswalk import walk
+from kernel.utils.checksum import verify_copy
+from kernel.utils import dedup
+
+# Files at least this big go through the kernel copy path
+LARGE_FILE = 8 * 1024 * 1024
+
+CHUNK_SIZE = 1024 * 1024
+UNBUFFERED_CHUNK_SIZE = 8 * 1024 * 1024
+
+MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+KERNEL_COPY = hasattr(os, "copy_file_range") or hasattr(os, "sendfile")
+
+# Written into the destination root while a tree copy is in progress;
+# one relative path per completed file.
+MANIFEST_NAME = ".pyos-copy-manifest"
+
+
+class CopyCancelled(Exception):
+    pass
+
+
+# ---------------------------------------------------------
+# SINGLE FILE
+# ---------------------------------------------------------
+def _kernel_copy(fsrc, fdst, size):
+    """
+    Yield progress while copying between descriptors without pulling
+    the data into Python (only used when KERNEL_COPY is true).
+    """
+    offset = 0
+    if hasattr(os, "copy_file_range"):
+        copy = lambda n: os.copy_file_range(fsrc, fdst, n)
+    else:
+        copy = lambda n: os.sendfile(fdst, fsrc, None, n)
+
+    while offset < size:
+        sent = copy(min(CHUNK_SIZE * 8, size - offset))
+        if sent == 0:
+            break
+        offset += sent
+        yield offset
+
+
+def _unbuffered_copy(fsrc, fdst):
+    """
+    Large sequential reads that tell the kernel to drop the pages
+    behind us, so a huge copy doesn't evict everything else.
+    """
+    fadvise = getattr(os, "posix_fadvise", None)
+    offset = 0
+    while True:
+        buf = os.read(fsrc, UNBUFFERED_CHUNK_SIZE)
+        if not buf:
+            break
+        view = memoryview(buf)
+        while view:
+            n = os.write(fdst, view)
+            view = view[n:]
+        if fadvise:
+            fadvise(fsrc, offset, len(buf), os.POSIX_FADV_DONTNEED)
+            os.fdatasync(fdst)
+            fadvise(fdst, offset, len(buf), os.POSIX_FADV_DONTNEED)
+        offset += len(buf)
+        yield offset
+
+
+def _buffered_copy(fsrc, fdst):
+    offset = 0
+    while True:
+        buf = os.read(fsrc, CHUNK_SIZE)
+        if not buf:
+            break
+        view = memoryview(buf)
+        while view:
+            n = os.write(fdst, view)
+            view = view[n:]
+        offset += len(buf)
+        yield offset
+
+
+def copy_file_steps(src, dst, unbuffered=False, cancelled=None):
+    """
+    Copy src to dst, yielding (bytes_done, total) after every chunk so
+    the caller can report progress. Raises CopyCancelled if the
+    cancelled() callable turns true mid-copy. Inside Users/ with dedup
+    on, dst shares src's data instead and no bytes are copied.
+    """
+    total = os.path.getsize(src)
+    if dedup.share(src, dst):
+        yield total, total
+        return
+
+    dedup.detach(dst, keep_data=False)
+    fsrc = os.open(src, os.O_RDONLY)
+    try:
+        fdst = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            if unbuffered:
+                steps = _unbuffered_copy(fsrc, fdst)
+            elif total >= LARGE_FILE and KERNEL_COPY:
+                steps = _kernel_copy(fsrc, fdst, total)
+            else:
+                steps = _buffered_copy(fsrc, fdst)
+
+            done = 0
+            try:
+                for done in steps:
+                    if cancelled is not None and cancelled():
+                        raise CopyCancelled(src)
+                    yield done, total
+            except OSError:
+                if total < LARGE_FILE or unbuffered or done:
+                    raise
+                # copy_file_range can refuse (cross-device on old
+                # kernels, odd filesystems); fall back to read/write.
+                os.lseek(fsrc, 0, os.SEEK_SET)
+                for done in _buffered_copy(fsrc, fdst):
+                    if cancelled is not None and cancelled():
+                        raise CopyCancelled(src)
+                    yield done, total
+        finally:
+            os.close(fdst)
+    finally:
+        os.close(fsrc)
+
+    shutil.copystat(src, dst)
+
+
+def copy_file(src, dst, unbuffered=False, cancelled=None):
+    for _ in copy_file_steps(src, dst, unbuffered, cancelled):
+        pass
+    return os.path.getsize(dst)
+
+
+# ---------------------------------------------------------
+# TREE COPY
+# ---------------------------------------------------------
+class CopyResult:
+    __slots__ = ("rel", "size", "error", "skipped")
+
+    def __init__(self, rel, size=0, error=None, skipped=False):
+        self.rel = rel
+        self.size = size
+        self.error = error
+        self.skipped = skipped
+
+
+class CopyEngine:
+    """
+    Parallel tree copy. Directories are created up front on the calling
+    thread; files are fanned out to a thread pool (the copy syscalls
+    release the GIL). Completed files are appended to a manifest in the
+    destination so an interrupted copy resumes where it stopped.
+    """
+
+    def __init__(self, src, dst, workers=MAX_WORKERS, unbuffered=False, cancelled=None, verify=False):
+        self.src = src
+        self.dst = dst
+        self.workers = max(1, workers)
+        self.unbuffered = unbuffered
+        self.verify = verify
+        self.cancelled = cancelled
+
+        self.manifest_path = os.path.join(dst, MANIFEST_NAME)
+        self.errors = 0
+
+    # ---------------------------------------------------------
+    # MANIFEST
+    # ---------------------------------------------------------
+    def has_manifest(self):
+        return os.path.exists(self.manifest_path)
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return {line.rstrip("\n") for line in f if line.strip()}
+        except OSError:
+            return set()
+
+    # ---------------------------------------------------------
+    # RUN
+    # ---------------------------------------------------------
+    def _copy_one(self, rel):
+        src = os.path.join(self.src, rel)
+        dst = os.path.join(self.dst, rel)
+        try:
+            size = copy_file(src, dst, self.unbuffered, self.cancelled)
+            if self.verify and not verify_copy(src, dst):
+                return CopyResult(rel, size, error="checksum mismatch after copy")
+            return CopyResult(rel, size)
+        except CopyCancelled:
+            raise
+        except OSError as e:
+            return CopyResult(rel, error=e)
+
+    def run(self):
+        """
+        Generator of CopyResult objects in completion order.
+        """
+        done = self._load_manifest()
+        os.makedirs(self.dst, exist_ok=True)
+
+        manifest = open(self.manifest_path, "a", encoding="utf-8")
+        max_in_flight = self.workers * 4
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pyos-copy")
+        pending = set()
+        finished = False
+
+        try:
+            for item in walk(self.src, sort=False):
+                if self.cancelled is not None and self.cancelled():
+                    raise CopyCancelled(self.src)
+
+                if item.is_dir:
+                    os.makedirs(os.path.join(self.dst, item.rel), exist_ok=True)
+                    continue
+
+                if item.rel in done:
+                    yield CopyResult(item.rel, skipped=True)
+                    continue
+
+                pending.add(pool.submit(self._copy_one, item.rel))
+
+                if len(pending) >= max_in_flight:
+                    ready, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from self._collect(ready, manifest)
+
+            while pending:
+                ready, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from self._collect(ready, manifest)
+
+            finished = True
+        finally:
+            for fut in pending:
+                fut.cancel()
+            pool.shutdown(wait=True)
+            manifest.close()
+
+            # Keep the manifest around if anything failed so a rerun
+            # only retries the files that are missing.
+            if finished and not self.errors:
+                shutil.copystat(self.src, self.dst)
+                os.remove(self.manifest_path)
+
+    def _collect(self, futures, manifest):
+        results = [fut.result() for fut in futures]
+        for result in results:
+            if result.error is None:
+                manifest.write(result.rel + "\n")
+            else:
+                self.errors += 1
+        manifest.flush()
+        yield from results
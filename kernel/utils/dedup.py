@@ -0,0 +1,421 @@
+import os
+import json
+import errno
+import shutil
+import hashlib
+import atexit
+import threading
+
+from kernel import vfs
+from kernel.utils.fswalk import iter_files
+from kernel.utils.journal import get_journal
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+VFS_ROOT = vfs.VFS_ROOT
+USERS_ROOT = os.path.join(VFS_ROOT, "Users")
+STORE_ROOT = os.path.join(VFS_ROOT, "Meta", "dedup")
+OBJECTS_DIR = os.path.join(STORE_ROOT, "objects")
+INDEX_PATH = os.path.join(STORE_ROOT, "index.json")
+
+SETTINGS_SECTION = "Storage"
+SETTINGS_KEY = "dedup"
+
+# Files are hashed this much at a time
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# Smaller files cost more in inodes and index entries than they save
+MIN_SIZE = 4096
+
+# Linux ioctl that makes dst share src's extents (btrfs, XFS, bcachefs)
+FICLONE = 0x40049409
+
+# Errors that mean "this filesystem can't share here", not a real failure
+_UNSUPPORTED = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP,
+                errno.EOPNOTSUPP, errno.EINVAL, errno.ENOTTY, errno.EBADF}
+
+
+def _settings_enabled():
+    from userspace.system.settings_manager import SettingsManager
+    value = SettingsManager().get(SETTINGS_SECTION, SETTINGS_KEY, fallback="false")
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def in_users(path):
+    return vfs.is_inside(os.path.normpath(path), USERS_ROOT)
+
+
+# ---------------------------------------------------------
+# SHARING PRIMITIVES
+# ---------------------------------------------------------
+def _reflink(src, dst):
+    if fcntl is None:
+        return False
+    try:
+        fsrc = os.open(src, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        fdst = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            fcntl.ioctl(fdst, FICLONE, fsrc)
+        except OSError:
+            os.close(fdst)
+            os.remove(dst)
+            return False
+        os.close(fdst)
+    finally:
+        os.close(fsrc)
+    shutil.copystat(src, dst)
+    return True
+
+
+def _link_over(src, dst):
+    """
+    Make dst another name for src's inode, replacing whatever dst was.
+    """
+    tmp = f"{dst}.pyos-link"
+    try:
+        os.remove(tmp)
+    except OSError:
+        pass
+    os.link(src, tmp)
+    try:
+        os.replace(tmp, dst)
+    except OSError:
+        os.remove(tmp)
+        raise
+
+
+def detach(path, keep_data=True):
+    """
+    Call before writing to a file in place. If the file shares its
+    inode with other copies it gets a private one first (a real copy
+    when keep_data, or simply unlinked when the caller truncates it
+    anyway), so the write doesn't show up in every copy. Reflinks need
+    nothing: the filesystem copies their blocks on write.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return
+    if st.st_nlink <= 1 or not vfs.is_inside(os.path.abspath(path), os.path.abspath(VFS_ROOT)):
+        return
+
+    if not keep_data:
+        os.remove(path)
+    else:
+        tmp = f"{path}.pyos-cow"
+        shutil.copy2(path, tmp)
+        os.replace(tmp, path)
+    vfs.invalidate(path)
+
+
+# ---------------------------------------------------------
+# STORE
+# ---------------------------------------------------------
+class DedupStore:
+    """
+    Content-addressed store for Users/. Every file body is kept once,
+    as objects/<hh>/<sha256>, and each user file holding that content
+    is a hard link to the object. Copies inside Users/ are reflinks
+    where the filesystem can clone, hard links otherwise, so copying a
+    folder only writes metadata; detach() gives a file its own data
+    before an in-place write.
+
+    Copies share an inode straight away without hashing anything;
+    scan() later hashes new files and folds identical ones into their
+    object. Hashes are cached per inode in index.json.
+    """
+
+    def __init__(self, index_path=INDEX_PATH, objects_dir=OBJECTS_DIR):
+        self.index_path = index_path
+        self.objects_dir = objects_dir
+        self.hashes = {}          # "dev:ino" -> [size, mtime_ns, sha256]
+        self.dirty = False
+        self._lock = threading.Lock()
+
+        self._enabled = None
+        self._settings_version = None
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self.hashes = json.load(f).get("inodes", {})
+        except (OSError, ValueError):
+            self.hashes = {}
+
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"inodes": self.hashes}, f, separators=(",", ":"))
+            os.replace(tmp, self.index_path)
+            self.dirty = False
+
+    @property
+    def enabled(self):
+        """
+        The Storage/dedup setting, re-read only when settings change.
+        """
+        from userspace.system.settings_manager import SETTINGS_PATH
+        version = get_journal().version(SETTINGS_PATH)
+        if self._enabled is None or version != self._settings_version:
+            self._settings_version = version
+            try:
+                self._enabled = _settings_enabled()
+            except Exception:
+                self._enabled = False
+        return self._enabled
+
+    # ---------------------------------------------------------
+    # COPY
+    # ---------------------------------------------------------
+    def share(self, src, dst):
+        """
+        Create dst as a copy of src without copying data, if dedup is
+        on and both are regular files' paths under Users/. Returns True
+        when dst was created, False if the caller should copy normally.
+        """
+        if not (self.enabled and in_users(src) and in_users(dst)):
+            return False
+        if os.path.islink(src) or not os.path.isfile(src):
+            return False
+
+        if os.path.lexists(dst):
+            os.remove(dst)
+
+        try:
+            if not _reflink(src, dst):
+                _link_over(src, dst)
+        except OSError as e:
+            if e.errno in _UNSUPPORTED:
+                return False
+            raise
+        vfs.invalidate(dst)
+        return True
+
+    def copy2(self, src, dst):
+        """
+        shutil.copy2 replacement (e.g. for copytree's copy_function).
+        """
+        if os.path.isdir(dst):
+            dst = os.path.join(dst, os.path.basename(src))
+        if not self.share(src, dst):
+            shutil.copy2(src, dst)
+        return dst
+
+    # ---------------------------------------------------------
+    # HASHING
+    # ---------------------------------------------------------
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def digest(self, path, st=None):
+        """
+        sha256 of a file, read CHUNK_SIZE at a time and cached per inode
+        for as long as its size and mtime are unchanged.
+        """
+        st = st or os.stat(path)
+        key = f"{st.st_dev}:{st.st_ino}"
+        with self._lock:
+            cached = self.hashes.get(key)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                h.update(chunk)
+        digest = h.hexdigest()
+
+        with self._lock:
+            self.hashes[key] = [st.st_size, st.st_mtime_ns, digest]
+            self.dirty = True
+        return digest
+
+    def ingest(self, path):
+        """
+        Fold one file into the store. Returns the bytes freed: the file's
+        size once the last name of a duplicate inode is linked over.
+        """
+        st = os.stat(path)
+        if st.st_size < MIN_SIZE:
+            return 0
+
+        digest = self.digest(path, st)
+        obj = self._object_path(digest)
+        try:
+            ost = os.stat(obj)
+        except OSError:
+            ost = None
+
+        if ost is None:
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            os.link(path, obj)
+            return 0
+        if (ost.st_dev, ost.st_ino) == (st.st_dev, st.st_ino):
+            return 0
+
+        # The object may have been written in place since it was stored
+        # (digest() rehashes it if its size or mtime moved); if so this
+        # file becomes the object for its content
+        if ost.st_size != st.st_size or self.digest(obj, ost) != digest:
+            _link_over(path, obj)
+            return 0
+
+        # Nor may the file have changed while it was being hashed
+        try:
+            nst = os.stat(path)
+        except OSError:
+            return 0
+        if (nst.st_ino, nst.st_size, nst.st_mtime_ns) != (st.st_ino, st.st_size, st.st_mtime_ns):
+            return 0
+
+        _link_over(obj, path)
+        vfs.invalidate(path)
+        return st.st_size if st.st_nlink == 1 else 0
+
+    def scan(self, root=USERS_ROOT, cancelled=None):
+        """
+        Ingest every file under root. Yields (path, saved_bytes, error).
+        """
+        for entry in iter_files(root):
+            if cancelled is not None and cancelled():
+                break
+            if entry.is_symlink():
+                continue
+            path = entry.path
+            try:
+                yield path, self.ingest(path), None
+            except OSError as e:
+                if e.errno in _UNSUPPORTED:
+                    yield path, 0, "filesystem cannot hard link here"
+                else:
+                    yield path, 0, e
+        self.save()
+
+    # ---------------------------------------------------------
+    # MAINTENANCE
+    # ---------------------------------------------------------
+    def _objects(self):
+        if not os.path.isdir(self.objects_dir):
+            return
+        for entry in iter_files(self.objects_dir):
+            try:
+                yield entry.path, os.stat(entry.path)
+            except OSError:
+                pass
+
+    def gc(self):
+        """
+        Drop objects no user file links to any more, and hash cache
+        entries for inodes that are gone. Returns (objects, bytes) freed.
+        """
+        removed = 0
+        freed = 0
+        live = set()
+        for path, st in self._objects():
+            if st.st_nlink <= 1:
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                removed += 1
+                freed += st.st_size
+            else:
+                live.add(f"{st.st_dev}:{st.st_ino}")
+
+        with self._lock:
+            stale = [k for k in self.hashes if k not in live]
+            for key in stale:
+                del self.hashes[key]
+            if stale:
+                self.dirty = True
+        self.save()
+        return removed, freed
+
+    def stats(self, root=USERS_ROOT):
+        """
+        Logical vs. physical usage of root plus store totals, as a dict.
+        Reflinked copies can't be told apart from real ones, so they
+        count as physical.
+        """
+        files = 0
+        logical = 0
+        physical = 0
+        seen = set()
+        for entry in iter_files(root):
+            if entry.is_symlink():
+                continue
+            try:
+                st = os.stat(entry.path)
+            except OSError:
+                continue
+            files += 1
+            logical += st.st_size
+            ident = (st.st_dev, st.st_ino)
+            if ident not in seen:
+                seen.add(ident)
+                physical += st.st_size
+
+        objects = 0
+        object_bytes = 0
+        orphans = 0
+        for _, st in self._objects():
+            objects += 1
+            object_bytes += st.st_size
+            if st.st_nlink <= 1:
+                orphans += 1
+
+        return {
+            "enabled": self.enabled,
+            "files": files,
+            "logical": logical,
+            "physical": physical,
+            "saved": logical - physical,
+            "objects": objects,
+            "object_bytes": object_bytes,
+            "orphans": orphans,
+        }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DedupStore()
+        return _store
+
+
+def _save_on_exit():
+    if _store is not None:
+        try:
+            _store.save()
+        except OSError:
+            pass
+
+
+atexit.register(_save_on_exit)
+
+
+def share(src, dst):
+    return get_store().share(src, dst)
+
+
+def copy2(src, dst):
+    return get_store().copy2(src, dst)
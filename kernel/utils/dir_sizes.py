@@ -0,0 +1,298 @@
+import os
+import json
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+PYOS_ROOT = os.path.join("config", "live", "PyOS")
+CACHE_PATH = os.path.join(PYOS_ROOT, "Meta", "dir_sizes.json")
+
+MAX_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+
+class DirSizeCache:
+    """
+    Recursive directory sizes, cached per directory.
+
+    Each entry stores the directory's mtime, the bytes of its direct
+    files ("own") and its recursive total. An entry stays valid while
+    the directory's mtime is unchanged; when it changes only that one
+    directory is re-listed and its subdirectories' cached totals are
+    reused. Commands that add or remove data call note_added() /
+    note_removed() so ancestors are adjusted without re-walking.
+    """
+
+    def __init__(self, path=CACHE_PATH, root=PYOS_ROOT):
+        self.path = path
+        self.root = os.path.abspath(root)
+        self.entries = {}
+        self.dirty = False
+        self._lock = threading.RLock()
+        self._pool = None
+        self._inflight = {}
+        self.load()
+
+    # ---------------------------------------------------------
+    # PERSISTENCE
+    # ---------------------------------------------------------
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("dirs", {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return
+            data = {"version": 1, "dirs": dict(self.entries)}
+            self.dirty = False
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def _key(self, path):
+        full = os.path.abspath(path)
+        if full == self.root:
+            return ""
+        if not full.startswith(self.root + os.sep):
+            return None
+        return os.path.relpath(full, self.root).replace(os.sep, "/")
+
+    # ---------------------------------------------------------
+    # SIZING
+    # ---------------------------------------------------------
+    def _valid(self, key, mtime_ns):
+        entry = self.entries.get(key)
+        return entry is not None and entry["mtime_ns"] == mtime_ns
+
+    def cached(self, path):
+        """
+        Cached total if the directory is unchanged, else None. One stat.
+        """
+        key = self._key(path)
+        if key is None:
+            return None
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            if self._valid(key, mtime):
+                return self.entries[key]["total"]
+        return None
+
+    def size(self, path, parallel=True):
+        """
+        Recursive size of a directory in bytes. Subdirectories without a
+        valid cache entry are sized in parallel.
+        """
+        cached = self.cached(path)
+        if cached is not None:
+            return cached
+
+        own, subdirs = self._list(path)
+
+        missing = [d for d in subdirs if self.cached(d) is None]
+        if parallel and len(missing) > 1:
+            # Warm the cache for each uncached subtree concurrently; the
+            # sum below then only reads cached totals.
+            list(self._get_pool().map(self._size_serial, missing))
+
+        total = own + sum(self._size_serial(d) for d in subdirs)
+        self._store(path, own, total)
+        return total
+
+    def _size_serial(self, path):
+        """
+        Iterative post-order sizing of a subtree, reusing valid entries.
+        """
+        cached = self.cached(path)
+        if cached is not None:
+            return cached
+
+        # stack frames: [path, own, subdirs, next child index, child total]
+        own, subdirs = self._list(path)
+        stack = [[path, own, subdirs, 0, 0]]
+        result = 0
+
+        while stack:
+            frame = stack[-1]
+            dir_path, own, subdirs, i, acc = frame
+
+            if i < len(subdirs):
+                frame[3] = i + 1
+                child = subdirs[i]
+                cached = self.cached(child)
+                if cached is not None:
+                    frame[4] += cached
+                else:
+                    c_own, c_subdirs = self._list(child)
+                    stack.append([child, c_own, c_subdirs, 0, 0])
+                continue
+
+            total = own + acc
+            self._store(dir_path, own, total)
+            stack.pop()
+            if stack:
+                stack[-1][4] += total
+            else:
+                result = total
+
+        return result
+
+    def _list(self, path):
+        own = 0
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        else:
+                            own += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return own, subdirs
+
+    def _store(self, path, own, total):
+        key = self._key(path)
+        if key is None:
+            return
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        with self._lock:
+            self.entries[key] = {"mtime_ns": mtime, "own": own, "total": total}
+            self.dirty = True
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="pyos-du")
+            return self._pool
+
+    def size_async(self, path):
+        """
+        Non-blocking lookup for UIs: the cached total, or None while the
+        size is computed in the background.
+        """
+        cached = self.cached(path)
+        if cached is not None:
+            return cached
+
+        key = os.path.abspath(path)
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is None:
+                fut = self._get_pool().submit(self.size, path, False)
+                self._inflight[key] = fut
+                fut.add_done_callback(lambda _f: self._inflight.pop(key, None))
+        return None
+
+    # ---------------------------------------------------------
+    # INCREMENTAL UPDATES
+    # ---------------------------------------------------------
+    def _adjust(self, parent, delta, own_delta):
+        """
+        Apply a size delta to 'parent' and all its cached ancestors. The
+        stored mtime is left alone: if the change bumped it, the parent
+        is re-listed on the next lookup (its subdirectories' totals are
+        reused), and anything else that changed in it is picked up too.
+        """
+        key = self._key(parent)
+        if key is None:
+            return
+
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry["own"] += own_delta
+                entry["total"] += delta
+
+            while key:
+                key = key.rpartition("/")[0]
+                entry = self.entries.get(key)
+                if entry is not None:
+                    entry["total"] += delta
+            self.dirty = True
+
+    def note_added(self, path, nbytes, is_dir=False):
+        """
+        'path' was created (or grew) by nbytes.
+        """
+        parent = os.path.dirname(os.path.abspath(path))
+        self._adjust(parent, nbytes, 0 if is_dir else nbytes)
+
+    def measure(self, path):
+        """
+        Size of a file or directory; call before removing it so the
+        amount can be passed to note_removed().
+        """
+        if os.path.isdir(path):
+            return self.size(path, parallel=False)
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    def forget(self, path):
+        """
+        Drop the entries for a directory and everything below it.
+        """
+        key = self._key(path)
+        if key is None:
+            return
+        with self._lock:
+            prefix = key + "/" if key else ""
+            for k in [k for k in self.entries if k == key or k.startswith(prefix)]:
+                del self.entries[k]
+            self.dirty = True
+
+    def note_removed(self, path, nbytes, is_dir=False):
+        """
+        'path' (nbytes in total) was removed.
+        """
+        full = os.path.abspath(path)
+        if is_dir:
+            self.forget(full)
+        self._adjust(os.path.dirname(full), -nbytes, 0 if is_dir else -nbytes)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DirSizeCache()
+        return _cache
+
+
+def _save_on_exit():
+    if _cache is not None:
+        try:
+            _cache.save()
+        except OSError:
+            pass
+
+
+atexit.register(_save_on_exit)
+
+
+def format_size(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TB"
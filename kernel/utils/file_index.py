@@ -0,0 +1,351 @@
+import os
+import time
+import sqlite3
+import threading
+
+PYOS_ROOT = os.path.join("config", "live", "PyOS")
+INDEX_DB = os.path.join(PYOS_ROOT, "Meta", "fs_index.db")
+
+SCHEMA_VERSION = 1
+GLOB_CHARS = set("*?[")
+
+# update() commits and lets searches in after this many directories
+UPDATE_BATCH = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_name ON entries(name_lower);
+CREATE INDEX IF NOT EXISTS entries_parent ON entries(parent);
+
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Trigram full-text index over names for substring search; needs
+# SQLite 3.34+, otherwise substring queries fall back to a scan.
+TRIGRAM_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5(
+    name, content='entries', content_rowid='id', tokenize='trigram'
+)
+"""
+
+# Keep the trigram index in step with single-row changes. A build from
+# an empty index skips these and rebuilds the trigram table in one pass,
+# which is an order of magnitude faster.
+TRIGRAM_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+        INSERT INTO names(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+        INSERT INTO names(names, rowid, name) VALUES ('delete', old.id, old.name);
+    END
+    """,
+]
+
+
+class FileEntry:
+    __slots__ = ("path", "name", "is_dir", "size", "mtime_ns")
+
+    def __init__(self, path, name, is_dir, size, mtime_ns):
+        self.path = path
+        self.name = name
+        self.is_dir = bool(is_dir)
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+
+def _has_glob(pattern):
+    return any(c in GLOB_CHARS for c in pattern)
+
+
+def _literal_prefix(pattern):
+    for i, c in enumerate(pattern):
+        if c in GLOB_CHARS:
+            return pattern[:i]
+    return pattern
+
+
+def _join(parent, name):
+    return f"{parent}/{name}" if parent else name
+
+
+class FileIndex:
+    """
+    Persistent index of every VFS path (name, size, mtime, type) in
+    SQLite. update() is incremental: a directory is only re-listed when
+    its mtime differs from the one recorded at the last scan. It commits
+    every UPDATE_BATCH directories, so searches are not held up by a
+    long reindex.
+    """
+
+    def __init__(self, db_path=INDEX_DB, root=PYOS_ROOT):
+        self.db_path = db_path
+        self.root = os.path.abspath(root)
+        self._lock = threading.RLock()
+        self._update_lock = threading.Lock()     # one update() at a time
+
+        # The database lives inside the VFS; never index its own files
+        db_rel = os.path.relpath(os.path.abspath(db_path), self.root).replace(os.sep, "/")
+        self._skip = {db_rel + suffix for suffix in ("", "-wal", "-shm", "-journal")}
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self.db:
+            self.db.executescript(SCHEMA)
+            try:
+                self.db.execute(TRIGRAM_TABLE)
+                for trigger in TRIGRAM_TRIGGERS:
+                    self.db.execute(trigger)
+                self.trigram = True
+            except sqlite3.OperationalError:
+                self.trigram = False
+
+            row = self.db.execute("SELECT value FROM meta WHERE key='version'").fetchone()
+            if row is None or int(row[0]) != SCHEMA_VERSION:
+                self.db.execute("DELETE FROM entries")
+                self.db.execute("DELETE FROM dirs")
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(SCHEMA_VERSION),))
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+    # ---------------------------------------------------------
+    # INCREMENTAL UPDATE
+    # ---------------------------------------------------------
+    def update(self, cancelled=None):
+        """
+        Bring the index in line with the disk. Returns the number of
+        directories that had to be re-listed.
+        """
+        with self._update_lock:
+            with self._lock, self.db:
+                # A build from an empty index (or one interrupted before
+                # its trigram rebuild) fills the trigram table at the end
+                bulk = self.trigram and (
+                    self.db.execute("SELECT 1 FROM entries LIMIT 1").fetchone() is None
+                    or self.db.execute("SELECT 1 FROM meta WHERE key='names_rebuild'").fetchone() is not None
+                )
+                if bulk:
+                    self.db.execute("DROP TRIGGER IF EXISTS entries_ai")
+                    self.db.execute("DROP TRIGGER IF EXISTS entries_ad")
+                    self.db.execute("INSERT OR REPLACE INTO meta VALUES ('names_rebuild', '1')")
+                known_dirs = dict(self.db.execute("SELECT path, mtime_ns FROM dirs"))
+
+            stack = [""]
+            rescanned = 0
+            while stack and not (cancelled is not None and cancelled()):
+                with self._lock, self.db:
+                    rescanned += self._update_batch(stack, known_dirs, cancelled)
+
+            with self._lock, self.db:
+                if bulk:
+                    self.db.execute("INSERT INTO names(names) VALUES ('rebuild')")
+                    for trigger in TRIGRAM_TRIGGERS:
+                        self.db.execute(trigger)
+                    self.db.execute("DELETE FROM meta WHERE key='names_rebuild'")
+
+                self.db.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('updated_at', ?)", (str(time.time()),)
+                )
+        return rescanned
+
+    def _update_batch(self, stack, known_dirs, cancelled):
+        """
+        Walk up to UPDATE_BATCH directories off 'stack' in one
+        transaction. Returns how many were re-listed.
+        """
+        rescanned = 0
+        for _ in range(UPDATE_BATCH):
+            if not stack or (cancelled is not None and cancelled()):
+                break
+
+            rel = stack.pop()
+            full = os.path.join(self.root, rel) if rel else self.root
+            try:
+                mtime = os.stat(full).st_mtime_ns
+            except OSError:
+                self._drop(rel)
+                continue
+
+            if known_dirs.get(rel) == mtime:
+                # Unchanged: children come from the index, no listdir
+                for (name,) in self.db.execute(
+                    "SELECT name FROM entries WHERE parent=? AND is_dir=1", (rel,)
+                ):
+                    stack.append(_join(rel, name))
+                continue
+
+            rescanned += 1
+            stack.extend(self._rescan(rel, full))
+            self.db.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?)", (rel, mtime))
+        return rescanned
+
+    def _rescan(self, rel, full):
+        """
+        Diff one directory against the index; returns child dirs.
+        """
+        old = {
+            name: (is_dir, size, mtime)
+            for name, is_dir, size, mtime in self.db.execute(
+                "SELECT name, is_dir, size, mtime_ns FROM entries WHERE parent=?", (rel,)
+            )
+        }
+
+        subdirs = []
+        inserts = []
+        deletes = []
+        try:
+            with os.scandir(full) as it:
+                for entry in it:
+                    child = _join(rel, entry.name)
+                    if child in self._skip:
+                        continue
+
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+
+                    row = (int(is_dir), 0 if is_dir else st.st_size, st.st_mtime_ns)
+                    if is_dir:
+                        subdirs.append(child)
+
+                    prev = old.pop(entry.name, None)
+                    if prev == row:
+                        continue
+                    if prev is not None:
+                        if prev[0] and not is_dir:
+                            self._drop(child)
+                        deletes.append((child,))
+
+                    inserts.append((child, rel, entry.name, entry.name.lower()) + row)
+        except OSError:
+            pass
+
+        for name, prev in old.items():
+            child = _join(rel, name)
+            deletes.append((child,))
+            if prev[0]:
+                self._drop(child)
+
+        if deletes:
+            self.db.executemany("DELETE FROM entries WHERE path=?", deletes)
+        if inserts:
+            self.db.executemany(
+                "INSERT INTO entries (path, parent, name, name_lower, is_dir, size, mtime_ns) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                inserts,
+            )
+
+        return subdirs
+
+    def _drop(self, rel):
+        """
+        Forget everything below a directory that no longer exists.
+        """
+        like = rel.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "/%"
+        self.db.execute("DELETE FROM entries WHERE path LIKE ? ESCAPE '\\'", (like,))
+        self.db.execute("DELETE FROM dirs WHERE path=? OR path LIKE ? ESCAPE '\\'", (rel, like))
+
+    # ---------------------------------------------------------
+    # QUERIES
+    # ---------------------------------------------------------
+    def search(self, query, limit=200, kind=None):
+        """
+        Find entries by name. Queries containing * ? or [ are globs
+        matched against the whole name; anything else is a
+        case-insensitive substring. kind may be "file" or "dir".
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        where = []
+        params = []
+
+        if kind == "file":
+            where.append("e.is_dir=0")
+        elif kind == "dir":
+            where.append("e.is_dir=1")
+
+        source = "entries e"
+        if _has_glob(query):
+            prefix = _literal_prefix(query)
+            if prefix:
+                # Range on the name index narrows the GLOB scan
+                where.append("e.name_lower >= ? AND e.name_lower < ?")
+                params += [prefix, prefix + "\uffff"]
+            where.append("e.name_lower GLOB ?")
+            params.append(query)
+        elif self.trigram and len(query) >= 3:
+            source = "names n JOIN entries e ON e.id = n.rowid"
+            where.append("names MATCH ?")
+            params.append('"' + query.replace('"', '""') + '"')
+        else:
+            where.append("instr(e.name_lower, ?) > 0")
+            params.append(query)
+
+        sql = (
+            f"SELECT e.path, e.name, e.is_dir, e.size, e.mtime_ns FROM {source} "
+            f"WHERE {' AND '.join(where)} ORDER BY e.path LIMIT ?"
+        )
+        params.append(limit)
+
+        with self._lock:
+            rows = self.db.execute(sql, params).fetchall()
+        return [FileEntry(*row) for row in rows]
+
+    def count(self):
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def abspath(self, entry):
+        return os.path.join(self.root, *entry.path.split("/"))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """
+    Shared index for the live VFS (File Explorer, start menu, find).
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = FileIndex()
+        return _index
+
+
+def search(query, limit=200, kind=None, refresh=True):
+    index = get_index()
+    if refresh:
+        index.update()
+    return index.search(query, limit, kind)
@@ -0,0 +1,517 @@
+import os
+import time
+import heapq
+import shutil
+import itertools
+import threading
+from collections import deque
+
+from kernel import vfs
+from kernel.utils.copy_engine import CopyEngine, CopyResult, CopyCancelled, copy_file_steps
+from kernel.utils.checksum import verify_copy, get_manifest
+from kernel.utils.dir_sizes import get_cache
+from kernel.utils.quota import get_quota, note_added, note_moved
+
+# Operations running at once; the rest wait in the queue
+MAX_WORKERS = 3
+
+# Lower runs first. Anything the user is looking at goes in as
+# INTERACTIVE; BACKGROUND work never gets the last free worker.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 10
+PRIORITY_BACKGROUND = 20
+
+# While a higher-priority operation is running, lower ones are held to
+# roughly this many bytes per second so they can't starve it of disk.
+THROTTLE_RATE = 16 * 1024 * 1024
+
+# Events a subscriber that stops pumping can fall behind by; older
+# ones are dropped
+EVENT_BACKLOG = 1000
+
+COPY = "copy"
+MOVE = "move"
+TRASH = "trash"
+RESTORE = "restore"
+PURGE = "purge"
+EMPTY = "empty"
+
+QUEUED = "Queued"
+RUNNING = "Running"
+DONE = "Done"
+FAILED = "Failed"
+CANCELLED = "Cancelled"
+
+PROGRESS = "progress"
+FINISHED = "finished"
+
+
+class FileOp:
+    """
+    One queued or running operation. Workers update the counters and
+    append a CopyResult per finished item; readers only look.
+    """
+
+    def __init__(self, op_id, kind, items, dest, priority, label, options, on_done):
+        self.id = op_id
+        self.kind = kind
+        self.items = list(items)
+        self.dest = dest
+        self.priority = priority
+        self.label = label or f"{kind} {len(self.items)} item(s)"
+        self.options = options
+        self.on_done = on_done
+
+        self.state = QUEUED
+        self.error = None
+        self.errors = 0
+        self.results = []
+        self.done_bytes = 0
+        self.total_bytes = 0
+        self.done_items = 0
+        self.total_items = len(self.items)
+        self.started_at = None
+
+        self.cancel_event = threading.Event()
+        self.finished = threading.Event()
+
+    @property
+    def active(self):
+        return self.state in (QUEUED, RUNNING)
+
+    @property
+    def progress(self):
+        """
+        0.0 - 1.0, by bytes when the size is known, else by items.
+        """
+        if self.state == DONE:
+            return 1.0
+        if self.total_bytes:
+            return min(1.0, self.done_bytes / self.total_bytes)
+        if self.total_items:
+            return min(1.0, self.done_items / self.total_items)
+        return 0.0
+
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def wait(self, timeout=None):
+        return self.finished.wait(timeout)
+
+
+class FileOpEvent:
+    __slots__ = ("op", "kind")
+
+    def __init__(self, op, kind):
+        self.op = op
+        self.kind = kind
+
+
+class Subscription:
+    """
+    One consumer's event queue; see FileOpsService.subscribe().
+    """
+
+    def __init__(self):
+        self.events = deque(maxlen=EVENT_BACKLOG)
+        self.progress_queued = set()    # op ids with a progress event waiting
+
+
+class FileOpsService:
+    """
+    Shared queue for copy, move, trash, restore, purge and empty-trash
+    operations.
+    A few daemon workers take operations in priority order; each one
+    keeps the size cache, quotas and the VFS cache up to date itself so
+    callers don't have to. Progress and completion events are queued
+    only for subscribers, each of which drains its own queue once per
+    frame with pump(); on_done callbacks run once, from whichever pump()
+    comes first, on the UI thread. Terminal commands use follow() to
+    wait for an operation instead.
+    """
+
+    def __init__(self, workers=MAX_WORKERS):
+        self.workers = max(1, workers)
+        self._queue = []
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._threads = []
+        self._running = []
+        self._ops = []
+        self._subs = []
+        self._done = deque()    # finished ops whose on_done hasn't run
+
+    # ---------------------------------------------------------
+    # SUBMIT
+    # ---------------------------------------------------------
+    def submit(self, kind, items, dest=None, priority=PRIORITY_NORMAL, label=None, on_done=None, **options):
+        op = FileOp(next(self._ids), kind, items, dest, priority, label, options, on_done)
+        with self._cond:
+            heapq.heappush(self._queue, (priority, op.id, op))
+            self._ops.append(op)
+            if len(self._threads) < self.workers:
+                t = threading.Thread(target=self._worker, name=f"pyos-fileop-{len(self._threads)}", daemon=True)
+                self._threads.append(t)
+                t.start()
+            self._cond.notify_all()
+        return op
+
+    def copy(self, pairs, **kwargs):
+        """
+        pairs: [(src, dst)]; dst is the full target path.
+        Options: unbuffered, verify.
+        """
+        return self.submit(COPY, pairs, **kwargs)
+
+    def move(self, pairs, **kwargs):
+        return self.submit(MOVE, pairs, **kwargs)
+
+    def trash(self, paths, **kwargs):
+        return self.submit(TRASH, paths, **kwargs)
+
+    def restore(self, trash_ids, **kwargs):
+        return self.submit(RESTORE, trash_ids, **kwargs)
+
+    def purge(self, trash_ids, **kwargs):
+        return self.submit(PURGE, trash_ids, **kwargs)
+
+    def empty_trash(self, **kwargs):
+        return self.submit(EMPTY, [], **kwargs)
+
+    def active(self):
+        """
+        Operations that are queued or running, oldest first.
+        """
+        with self._cond:
+            return list(self._ops)
+
+    # ---------------------------------------------------------
+    # EVENTS
+    # ---------------------------------------------------------
+    def subscribe(self):
+        """
+        Start queueing events for a new consumer; pass the returned
+        Subscription to pump().
+        """
+        sub = Subscription()
+        with self._cond:
+            self._subs.append(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._cond:
+            if sub in self._subs:
+                self._subs.remove(sub)
+
+    def _emit(self, op, kind):
+        with self._cond:
+            if kind == FINISHED and op.on_done is not None:
+                self._done.append(op)
+            for sub in self._subs:
+                if kind == PROGRESS:
+                    # At most one progress event per operation between pumps
+                    if op.id in sub.progress_queued:
+                        continue
+                    sub.progress_queued.add(op.id)
+                sub.events.append(FileOpEvent(op, kind))
+
+    def pump(self, sub=None):
+        """
+        Drain sub's pending events; call once per frame from the UI
+        thread. Runs on_done for operations that finished.
+        """
+        with self._cond:
+            events = []
+            if sub is not None:
+                events = list(sub.events)
+                sub.events.clear()
+                sub.progress_queued.clear()
+            done = list(self._done)
+            self._done.clear()
+
+        for op in done:
+            try:
+                op.on_done(op)
+            except Exception:
+                pass
+        return events
+
+    def follow(self, op, cancelled=None, poll=0.1):
+        """
+        Yield op's CopyResults as they finish, plus None every poll
+        seconds so the caller can report progress. Cancels op when
+        cancelled() turns true or the generator is closed early. Returns
+        when op is finished.
+        """
+        seen = 0
+        try:
+            while True:
+                finished = op.finished.wait(poll)
+                if cancelled is not None and cancelled():
+                    op.cancel()
+                results = op.results
+                while seen < len(results):
+                    yield results[seen]
+                    seen += 1
+                if finished:
+                    return
+                yield None
+        finally:
+            # Closed early (e.g. the job was killed): stop the work too
+            if not op.finished.is_set():
+                op.cancel()
+
+    # ---------------------------------------------------------
+    # WORKERS
+    # ---------------------------------------------------------
+    def _next(self):
+        """
+        Pop the next operation, waiting while the queue is empty or only
+        BACKGROUND work is left and it would take the last free worker.
+        """
+        with self._cond:
+            while True:
+                if self._queue:
+                    priority = self._queue[0][0]
+                    busy = sum(1 for op in self._running if op.priority >= PRIORITY_BACKGROUND)
+                    if priority < PRIORITY_BACKGROUND or busy < self.workers - 1:
+                        op = heapq.heappop(self._queue)[2]
+                        self._running.append(op)
+                        return op
+                self._cond.wait()
+
+    def _worker(self):
+        while True:
+            op = self._next()
+            try:
+                self._run(op)
+            finally:
+                with self._cond:
+                    self._running.remove(op)
+                    self._ops.remove(op)
+                    self._cond.notify_all()
+                op.finished.set()
+                self._emit(op, FINISHED)
+
+    def _run(self, op):
+        if op.cancelled():
+            op.state = CANCELLED
+            return
+
+        op.state = RUNNING
+        op.started_at = time.monotonic()
+        handler = {
+            COPY: self._copy,
+            MOVE: self._move,
+            TRASH: self._trash,
+            RESTORE: self._restore,
+            PURGE: self._purge,
+            EMPTY: self._empty,
+        }[op.kind]
+
+        try:
+            handler(op)
+        except CopyCancelled:
+            op.state = CANCELLED
+            return
+        except Exception as e:
+            op.error = e
+            op.state = FAILED
+            return
+
+        if op.cancelled() and op.done_items < op.total_items:
+            op.state = CANCELLED
+        elif op.errors:
+            op.state = FAILED
+        else:
+            op.state = DONE
+
+    def _throttle(self, op, nbytes):
+        """
+        Hold op back while something more urgent is running.
+        """
+        with self._cond:
+            busy = any(other.priority < op.priority for other in self._running)
+        if busy and nbytes > 0:
+            time.sleep(nbytes / THROTTLE_RATE)
+
+    def _advance(self, op, result):
+        # Batch trash operations report from several threads at once
+        with self._cond:
+            op.results.append(result)
+            op.done_items += 1
+            if result.error is not None:
+                op.errors += 1
+        self._emit(op, PROGRESS)
+
+    # ---------------------------------------------------------
+    # OPERATIONS
+    # ---------------------------------------------------------
+    def _copy(self, op):
+        sizes = get_cache()
+        quota = get_quota()
+
+        plan = []
+        for src, dst in op.items:
+            nbytes = sizes.measure(src)
+            old = os.path.getsize(dst) if os.path.isfile(dst) else 0
+            quota.check(dst, nbytes - old)
+            plan.append((src, dst, nbytes, old))
+            op.total_bytes += nbytes
+
+        for src, dst, nbytes, old in plan:
+            if op.cancelled():
+                break
+            if os.path.isdir(src):
+                self._copy_tree(op, src, dst)
+            else:
+                self._copy_file(op, src, dst, old)
+
+        if op.options.get("verify"):
+            get_manifest().save()
+
+    def _copy_file(self, op, src, dst, old):
+        name = os.path.basename(src)
+        os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+
+        base = op.done_bytes
+        last = 0
+        error = None
+        try:
+            for done, total in copy_file_steps(src, dst, op.options.get("unbuffered", False), op.cancelled):
+                self._throttle(op, done - last)
+                last = done
+                op.done_bytes = base + done
+                self._emit(op, PROGRESS)
+            if op.options.get("verify") and not verify_copy(src, dst):
+                error = OSError(f"verify failed: '{dst}' does not match '{src}'")
+        finally:
+            note_added(dst, (os.path.getsize(dst) if os.path.isfile(dst) else 0) - old)
+            vfs.invalidate(dst)
+
+        self._advance(op, CopyResult(name, last, error=error))
+
+    def _copy_tree(self, op, src, dst):
+        engine = CopyEngine(src, dst, unbuffered=op.options.get("unbuffered", False),
+                            cancelled=op.cancelled, verify=op.options.get("verify", False))
+        copied = 0
+        try:
+            for result in engine.run():
+                if result.error is None and not result.skipped:
+                    copied += result.size
+                    op.done_bytes += result.size
+                    self._throttle(op, result.size)
+                op.results.append(result)
+                if result.error is not None:
+                    op.errors += 1
+                self._emit(op, PROGRESS)
+        finally:
+            # Also counts the part of an interrupted copy that landed
+            note_added(dst, copied, is_dir=True)
+            vfs.invalidate(dst)
+        op.done_items += 1
+
+    def _move(self, op):
+        sizes = get_cache()
+        quota = get_quota()
+
+        for src, dst in op.items:
+            if op.cancelled():
+                break
+            name = os.path.basename(src)
+            try:
+                is_dir = os.path.isdir(src)
+                nbytes = sizes.measure(src)
+                quota.check_move(src, dst, nbytes)
+                shutil.move(src, dst)
+            except OSError as e:
+                self._advance(op, CopyResult(name, error=e))
+                continue
+
+            note_moved(src, dst, nbytes, is_dir)
+            vfs.invalidate(src)
+            vfs.invalidate(dst)
+            op.done_bytes += nbytes
+            self._advance(op, CopyResult(name, nbytes))
+
+    # Trash operations go through the batch APIs: one index commit per
+    # operation, with per-item progress reported as items finish.
+    def _trash(self, op):
+        from userspace.system.trash_manager import move_to_trash_many
+        sizes = get_cache()
+
+        def progress(r):
+            if r.error is not None:
+                self._advance(op, CopyResult(r.item, error=r.error))
+                return
+            entry = r.entry
+            sizes.note_removed(r.item, entry["size"], entry["is_dir"])
+            sizes.note_added(entry["trash_path"], entry["size"], entry["is_dir"])
+            with self._cond:
+                op.done_bytes += entry["size"]
+            self._advance(op, CopyResult(r.item, entry["size"]))
+
+        op.total_bytes = sum(sizes.measure(path) for path in op.items)
+        move_to_trash_many(op.items, op.cancelled, progress)
+
+    def _restore(self, op):
+        from userspace.system.trash_manager import restore_many, entry_size
+        sizes = get_cache()
+
+        def progress(r):
+            if r.error is not None:
+                self._advance(op, CopyResult(str(r.trash_id or r.item), error=r.error))
+                return
+            entry = r.entry
+            size = entry_size(entry)
+            sizes.note_removed(entry["trash_path"], size, entry["is_dir"])
+            sizes.note_added(r.item, size, entry["is_dir"])
+            self._advance(op, CopyResult(entry["name"], size))
+
+        restore_many(op.items, op.cancelled, progress)
+
+    def _purge(self, op):
+        from userspace.system.trash_manager import delete_many
+        delete_many(op.items, op.cancelled, self._purged(op))
+
+    def _empty(self, op):
+        from userspace.system.trash_manager import empty_trash, get_index
+        # Only what is in the trash now; items trashed meanwhile stay
+        index = get_index()
+        upto = index.max_id()
+        if upto is None:
+            return
+        op.total_items = index.count(upto)
+        empty_trash(op.cancelled, self._purged(op), upto)
+
+    def _purged(self, op):
+        """
+        Progress callback for deletes out of the trash.
+        """
+        from userspace.system.trash_manager import entry_size
+        sizes = get_cache()
+
+        def progress(r):
+            if r.error is not None:
+                self._advance(op, CopyResult(str(r.item), error=r.error))
+                return
+            entry = r.entry
+            sizes.note_removed(entry["trash_path"], entry_size(entry), entry["is_dir"])
+            self._advance(op, CopyResult(entry["name"], entry_size(entry)))
+
+        return progress
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_file_ops():
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = FileOpsService()
+        return _service
@@ -1,8 +1,16 @@
 import os
 import json
+import hashlib
+
+from kernel.utils.journal import get_journal
 
 PYOS_ROOT = os.path.join("config", "live", "PyOS")
 
+# Records which DIRS / DEFAULT_FILES a previous boot already applied.
+# Bump BOOT_STAMP_VERSION to force every install through a full check.
+BOOT_STAMP = os.path.join(PYOS_ROOT, "Meta", "boot_stamp.json")
+BOOT_STAMP_VERSION = 1
+
 DIRS = {
     "system": [
         "System",
@@ -82,56 +90,135 @@ DEFAULT_FILES = {
         "exec": "PyApps/default/fileexplorer.py",
         "icon": "fileexplorer.png",
         "type": "system"
+    },
+
+    # Desktop metadata
+    "Users/admin/Desktop/desktop.json": {
+        "desktop_version": 1,
+        "icons": [
+            {
+                "name": "Trash",
+                "file": "Trash.lnk",
+                "icon": "trashbin.png",
+                "type": "shortcut"
+            },
+            {
+                "name": "File Explorer",
+                "file": "FileExplorer.lnk",
+                "icon": "fileexplorer.png",
+                "type": "shortcut"
+            }
+        ]
     }
 }
 
+DEFAULT_TEXT_FILES = {
+    "System/README.txt": (
+        "PyOS System Directory\n"
+        "----------------------\n"
+        "This directory contains core OS components.\n"
+    ),
+}
+
 
 def write_json(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    """
+    Replace a metadata file through the journal. The file itself is
+    rewritten at the next checkpoint; read it back with read_json().
+    """
+    get_journal().put(path, data)
 
 
-def init_pyfs():
-    os.makedirs(PYOS_ROOT, exist_ok=True)
+def read_json(path, default=None):
+    return get_journal().read(path, default)
+
 
-    # Create directories
+# ---------------------------------------------------------
+# BOOT STAMP
+# ---------------------------------------------------------
+def _manifest():
+    """
+    {item key: content hash} for everything init_pyfs creates. Keys
+    are "d:<dir>" and "f:<file>"; a changed default file gets a new
+    hash and is treated as a new item.
+    """
+    items = {}
     for group in DIRS.values():
         for d in group:
-            os.makedirs(os.path.join(PYOS_ROOT, d), exist_ok=True)
-
-    # Create default files
+            items["d:" + d] = ""
     for rel_path, content in DEFAULT_FILES.items():
-        abs_path = os.path.join(PYOS_ROOT, rel_path)
-        if not os.path.exists(abs_path):
-            write_json(abs_path, content)
-
-    # System README
-    readme_path = os.path.join(PYOS_ROOT, "System", "README.txt")
-    if not os.path.exists(readme_path):
-        with open(readme_path, "w", encoding="utf-8") as f:
-            f.write(
-                "PyOS System Directory\n"
-                "----------------------\n"
-                "This directory contains core OS components.\n"
-            )
+        data = json.dumps(content, sort_keys=True).encode("utf-8")
+        items["f:" + rel_path] = hashlib.sha256(data).hexdigest()
+    for rel_path, text in DEFAULT_TEXT_FILES.items():
+        items["f:" + rel_path] = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return items
 
-    # Desktop metadata
-    desktop_info = os.path.join(PYOS_ROOT, "Users/admin/Desktop/desktop.json")
-    if not os.path.exists(desktop_info):
-        write_json(desktop_info, {
-            "desktop_version": 1,
-            "icons": [
-                {
-                    "name": "Trash",
-                    "file": "Trash.lnk",
-                    "icon": "trashbin.png",
-                    "type": "shortcut"
-                },
-                {
-                    "name": "File Explorer",
-                    "file": "FileExplorer.lnk",
-                    "icon": "fileexplorer.png",
-                    "type": "shortcut"
-                }
-            ]
-        })
+
+def _manifest_hash(items):
+    data = json.dumps([BOOT_STAMP_VERSION, sorted(items.items())]).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def _read_stamp():
+    try:
+        with open(BOOT_STAMP, "r", encoding="utf-8") as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if stamp.get("version") != BOOT_STAMP_VERSION:
+        return None
+    return stamp
+
+
+def _apply(key):
+    kind, rel_path = key.split(":", 1)
+    abs_path = os.path.join(PYOS_ROOT, rel_path)
+
+    if kind == "d":
+        os.makedirs(abs_path, exist_ok=True)
+        return
+
+    if os.path.exists(abs_path):
+        return
+    os.makedirs(os.path.dirname(abs_path), exist_ok=True)
+    if rel_path in DEFAULT_TEXT_FILES:
+        with open(abs_path, "w", encoding="utf-8") as f:
+            f.write(DEFAULT_TEXT_FILES[rel_path])
+    else:
+        write_json(abs_path, DEFAULT_FILES[rel_path])
+
+
+def init_pyfs(repair=False):
+    """
+    Make sure the VFS skeleton exists. A boot whose DIRS/DEFAULT_FILES
+    match the stamp from the last boot does nothing but read the stamp;
+    after a schema change only the new items are applied. repair=True
+    checks every item on disk. Returns the number of items checked.
+    """
+    items = _manifest()
+    digest = _manifest_hash(items)
+
+    stamp = None if repair else _read_stamp()
+    if stamp is not None and stamp.get("hash") == digest:
+        return 0
+
+    if stamp is None:
+        todo = list(items)
+    else:
+        done = stamp.get("items", {})
+        todo = [key for key, value in items.items() if done.get(key) != value]
+
+    os.makedirs(PYOS_ROOT, exist_ok=True)
+    # Directories first so files always have a parent
+    for key in sorted(todo, key=lambda k: (not k.startswith("d:"), k)):
+        _apply(key)
+
+    # Default files go to disk now: apps read some of them directly
+    get_journal().checkpoint()
+
+    os.makedirs(os.path.dirname(BOOT_STAMP), exist_ok=True)
+    tmp = BOOT_STAMP + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": BOOT_STAMP_VERSION, "hash": digest, "items": items}, f, indent=2)
+    os.replace(tmp, BOOT_STAMP)
+    return len(todo)
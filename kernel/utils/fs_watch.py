@@ -0,0 +1,362 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import weakref
+import threading
+
+from kernel import vfs
+
+# Directories are polled this often when inotify is unavailable
+POLL_INTERVAL = 1.0
+
+CREATED = "created"
+DELETED = "deleted"
+CHANGED = "changed"
+RESCAN = "rescan"         # events were lost; treat everything as changed
+
+# inotify(7) constants
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_CLOSE_WRITE
+    | IN_ATTRIB | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class FsEvent:
+    __slots__ = ("path", "name", "kind")
+
+    def __init__(self, path, name, kind):
+        self.path = path      # watched directory
+        self.name = name      # entry inside it, or None for the directory
+        self.kind = kind
+
+
+# ---------------------------------------------------------
+# BACKENDS
+# ---------------------------------------------------------
+class _Inotify:
+    """
+    Minimal inotify binding through ctypes (Linux only).
+    """
+
+    realtime = True
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is Linux only")
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def add(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def remove(self, wd):
+        self.libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self, timeout):
+        """
+        Yield (wd, mask, name) for pending events, waiting up to
+        'timeout' seconds for the first one.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        pos = 0
+        while pos + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, pos)
+            pos += _EVENT_HEADER.size
+            name = data[pos:pos + length].rstrip(b"\0")
+            pos += length
+            yield wd, mask, os.fsdecode(name) if name else None
+
+
+class _Poller:
+    """
+    Fallback: one stat per watched directory per POLL_INTERVAL.
+    """
+
+    realtime = False
+
+    def __init__(self):
+        self.mtimes = {}
+        self._next_wd = 1
+        self._paths = {}
+
+    def add(self, path):
+        wd = self._next_wd
+        self._next_wd += 1
+        self._paths[wd] = path
+        self.mtimes[wd] = self._mtime(path)
+        return wd
+
+    def remove(self, wd):
+        self._paths.pop(wd, None)
+        self.mtimes.pop(wd, None)
+
+    def _mtime(self, path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def read(self, timeout):
+        time.sleep(timeout)
+        for wd, path in list(self._paths.items()):
+            mtime = self._mtime(path)
+            if mtime != self.mtimes.get(wd):
+                self.mtimes[wd] = mtime
+                yield wd, (IN_DELETE_SELF if mtime is None else IN_ATTRIB), None
+
+
+# ---------------------------------------------------------
+# WATCHER
+# ---------------------------------------------------------
+class Subscription:
+    __slots__ = ("path", "callback")
+
+    def __init__(self, path, callback):
+        self.path = path
+        self.callback = callback
+
+
+class FsWatcher:
+    """
+    Directory change notifications for the whole desktop. Each watched
+    directory gets one kernel watch no matter how many subscribers it
+    has. Events invalidate the shared VFS cache first, then go to every
+    subscriber's callback on the watcher thread; callbacks should only
+    flag work for their own thread. When a watched directory is removed
+    its subscribers are kept and the watch is re-armed once the path
+    exists again, with a RESCAN event.
+    """
+
+    def __init__(self):
+        try:
+            self.backend = _Inotify()
+        except (OSError, AttributeError):
+            self.backend = _Poller()
+
+        self._lock = threading.Lock()
+        self._subs = {}        # path -> [Subscription]
+        self._wds = {}         # path -> wd
+        self._paths = {}       # wd -> path
+        self._orphans = set()  # paths with subscribers but no live watch
+        self._thread = None
+
+    @property
+    def realtime(self):
+        return self.backend.realtime
+
+    def watch(self, path, callback):
+        path = os.path.abspath(path)
+        sub = Subscription(path, callback)
+
+        with self._lock:
+            if path not in self._wds:
+                try:
+                    wd = self.backend.add(path)
+                except OSError:
+                    return None
+                self._wds[path] = wd
+                self._paths[wd] = path
+                self._orphans.discard(path)
+            self._subs.setdefault(path, []).append(sub)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="pyos-fswatch", daemon=True)
+                self._thread.start()
+        return sub
+
+    def unwatch(self, sub):
+        if sub is None:
+            return
+        with self._lock:
+            subs = self._subs.get(sub.path, [])
+            if sub in subs:
+                subs.remove(sub)
+            if not subs:
+                self._subs.pop(sub.path, None)
+                self._orphans.discard(sub.path)
+                wd = self._wds.pop(sub.path, None)
+                if wd is not None:
+                    self._paths.pop(wd, None)
+                    self.backend.remove(wd)
+
+    def _rearm(self):
+        """
+        Watch orphaned paths again if they were recreated; subscribers
+        get a RESCAN since anything may have changed meanwhile.
+        """
+        rearmed = []
+        with self._lock:
+            for path in list(self._orphans):
+                try:
+                    wd = self.backend.add(path)
+                except OSError:
+                    continue
+                self._orphans.discard(path)
+                self._wds[path] = wd
+                self._paths[wd] = path
+                rearmed.append(path)
+
+        for path in rearmed:
+            vfs.invalidate(path)
+            self._dispatch(FsEvent(path, None, RESCAN))
+
+    def _loop(self):
+        while True:
+            if self._orphans:
+                self._rearm()
+            for wd, mask, name in self.backend.read(POLL_INTERVAL):
+                if mask & IN_Q_OVERFLOW:
+                    vfs.get_cache().clear()
+                    with self._lock:
+                        paths = list(self._subs)
+                    for path in paths:
+                        self._dispatch(FsEvent(path, None, RESCAN))
+                    continue
+
+                with self._lock:
+                    path = self._paths.get(wd)
+                if path is None:
+                    continue
+
+                if mask & IN_IGNORED:
+                    # The kernel dropped the watch (directory removed);
+                    # keep the subscribers and re-arm when it comes back
+                    with self._lock:
+                        self._paths.pop(wd, None)
+                        if self._wds.get(path) == wd:
+                            del self._wds[path]
+                            if path in self._subs:
+                                self._orphans.add(path)
+                    continue
+
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    kind = CREATED
+                elif mask & (IN_DELETE | IN_MOVED_FROM | IN_DELETE_SELF | IN_MOVE_SELF):
+                    kind = DELETED
+                else:
+                    kind = CHANGED
+
+                vfs.invalidate(os.path.join(path, name) if name else path)
+                self._dispatch(FsEvent(path, name, kind))
+
+    def _dispatch(self, event):
+        with self._lock:
+            subs = list(self._subs.get(event.path, ()))
+        for sub in subs:
+            try:
+                sub.callback(event)
+            except Exception:
+                pass
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def get_watcher():
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = FsWatcher()
+        return _watcher
+
+
+def watch(path, callback):
+    return get_watcher().watch(path, callback)
+
+
+def unwatch(sub):
+    get_watcher().unwatch(sub)
+
+
+# ---------------------------------------------------------
+# UI HELPER
+# ---------------------------------------------------------
+class DirectoryMonitor:
+    """
+    Change flag for one directory, for frame loops: changed() is True
+    once after the directory was modified (and on first use), so a
+    listing only has to be re-read when something actually happened.
+    Holds its subscription weakly; an app going away unsubscribes.
+    """
+
+    def __init__(self, path=None):
+        self.path = None
+        self._sub = None
+        self._flag = threading.Event()
+        self._flag.set()
+        if path is not None:
+            self.set_path(path)
+
+    def set_path(self, path):
+        if path == self.path:
+            return
+        unwatch(self._sub)
+        self.path = path
+        self._flag.set()
+
+        ref = weakref.ref(self)
+
+        def on_event(event):
+            monitor = ref()
+            if monitor is not None:
+                monitor._flag.set()
+
+        self._sub = watch(path, on_event) if os.path.isdir(path) else None
+
+    def changed(self):
+        if self._flag.is_set():
+            self._flag.clear()
+            return True
+        return False
+
+    def touch(self):
+        """
+        Force a refresh on the next changed() (after our own writes).
+        """
+        self._flag.set()
+
+    def close(self):
+        unwatch(self._sub)
+        self._sub = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
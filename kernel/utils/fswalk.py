@@ -0,0 +1,92 @@
+import os
+
+
+class WalkItem:
+    """
+    One entry produced by walk(). 'prefix' is the tree-drawing indent
+    inherited from the parents ("│   " / "    " per level).
+    """
+
+    __slots__ = ("entry", "depth", "is_dir", "is_last", "prefix", "rel")
+
+    def __init__(self, entry, depth, is_dir, is_last, prefix, rel):
+        self.entry = entry
+        self.depth = depth
+        self.is_dir = is_dir
+        self.is_last = is_last
+        self.prefix = prefix
+        self.rel = rel
+
+    @property
+    def name(self):
+        return self.entry.name
+
+    @property
+    def path(self):
+        return self.entry.path
+
+    def size(self):
+        try:
+            return self.entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            return 0
+
+
+def _scan(path, sort, on_error):
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError as e:
+        if on_error is not None:
+            on_error(path, e)
+        return []
+
+    if sort:
+        entries.sort(key=lambda e: e.name)
+    return entries
+
+
+def walk(root, max_depth=None, files_only=False, sort=True, follow_symlinks=False, on_error=None):
+    """
+    Iterative pre-order walk of 'root' built on os.scandir.
+
+    Yields WalkItem objects as it goes, reusing each DirEntry's cached
+    type information instead of stat'ing every path. Depth 1 is the
+    direct children of root; max_depth=None means unlimited. Memory is
+    bounded by the directories on the current path, not the tree size,
+    and deep trees cannot hit the recursion limit.
+    """
+    stack = [[_scan(root, sort, on_error), 0, "", 1, ""]]
+
+    while stack:
+        frame = stack[-1]
+        entries, i, prefix, depth, rel_dir = frame
+
+        if i >= len(entries):
+            stack.pop()
+            continue
+        frame[1] = i + 1
+
+        entry = entries[i]
+        is_last = i == len(entries) - 1
+        try:
+            is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+        except OSError:
+            is_dir = False
+
+        rel = rel_dir + entry.name
+
+        if not (files_only and is_dir):
+            yield WalkItem(entry, depth, is_dir, is_last, prefix, rel)
+
+        if is_dir and (max_depth is None or depth < max_depth):
+            child_prefix = prefix + ("    " if is_last else "│   ")
+            stack.append([_scan(entry.path, sort, on_error), 0, child_prefix, depth + 1, rel + "/"])
+
+
+def iter_files(root, follow_symlinks=False, on_error=None):
+    """
+    Unordered stream of DirEntry objects for every file below root.
+    """
+    for item in walk(root, files_only=True, sort=False, follow_symlinks=follow_symlinks, on_error=on_error):
+        yield item.entry
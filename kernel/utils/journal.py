@@ -0,0 +1,398 @@
+import os
+import copy
+import time
+import json
+import zlib
+import atexit
+import threading
+import configparser
+
+from kernel import vfs
+
+VFS_ROOT = vfs.VFS_ROOT
+JOURNAL_PATH = os.path.join(VFS_ROOT, "Meta", "journal.log")
+
+# A burst of mutations arriving within this window shares one fsync
+GROUP_COMMIT_DELAY = 0.02
+
+# Snapshots are rewritten (and the log truncated) once the log passes
+# this size, or when nothing has been logged for COMPACT_IDLE seconds.
+COMPACT_BYTES = 1024 * 1024
+COMPACT_IDLE = 2.0
+
+PUT = "put"
+SET = "set"
+DELETE = "del"
+
+
+class _Doc:
+    __slots__ = ("value", "mtime_ns", "version", "dirty")
+
+    def __init__(self, value, mtime_ns):
+        self.value = value
+        self.mtime_ns = mtime_ns
+        self.version = 0
+        self.dirty = False
+
+
+# ---------------------------------------------------------
+# SNAPSHOT FORMATS
+# ---------------------------------------------------------
+def _is_ini(path):
+    return path.endswith(".ini")
+
+
+def _read_snapshot(path):
+    """
+    (value, mtime_ns) of a snapshot file; value is None if it is missing.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None, None
+    try:
+        if _is_ini(path):
+            parser = configparser.ConfigParser()
+            parser.read(path, encoding="utf-8")
+            return {s: dict(parser[s]) for s in parser.sections()}, mtime
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f), mtime
+    except (OSError, ValueError, configparser.Error):
+        return None, mtime
+
+
+def _write_snapshot(path, value):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        if _is_ini(path):
+            parser = configparser.ConfigParser()
+            parser.read_dict(value or {})
+            parser.write(f)
+        else:
+            json.dump(value, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    vfs.invalidate(path)
+    return os.stat(path).st_mtime_ns
+
+
+# ---------------------------------------------------------
+# RECORDS
+# ---------------------------------------------------------
+def _apply(doc, record):
+    op = record["op"]
+    if op == PUT:
+        doc.value = record["value"]
+        return
+
+    keys = record["keys"]
+    if not isinstance(doc.value, dict):
+        doc.value = {}
+    node = doc.value
+    for key in keys[:-1]:
+        child = node.get(key)
+        if not isinstance(child, dict):
+            if op == DELETE:
+                return
+            child = node[key] = {}
+        node = child
+
+    if op == SET:
+        node[keys[-1]] = record["value"]
+    else:
+        node.pop(keys[-1], None)
+
+
+def _encode(record):
+    data = json.dumps(record, separators=(",", ":"))
+    return f"{zlib.crc32(data.encode('utf-8')):08x} {data}\n".encode("utf-8")
+
+
+def _decode(line):
+    """
+    Record for one log line, or None if it is torn or corrupt.
+    """
+    try:
+        text = line.decode("utf-8")
+        crc, data = text.rstrip("\n").split(" ", 1)
+        if int(crc, 16) != zlib.crc32(data.encode("utf-8")):
+            return None
+        return json.loads(data)
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+# ---------------------------------------------------------
+# JOURNAL
+# ---------------------------------------------------------
+class Journal:
+    """
+    Write-ahead journal for small metadata files (JSON, or INI for
+    settings). Readers get the current value from memory; a mutation
+    updates memory and appends a short record to Meta/journal.log. A
+    committer thread writes whatever accumulated over GROUP_COMMIT_DELAY
+    with one fsync, so a burst of 1,000 updates costs a few fsyncs
+    instead of 1,000 whole-file rewrites. Snapshot files are rewritten
+    atomically in the background and the log is truncated; after a
+    crash replay() reapplies the log to the snapshots. Records are
+    idempotent (put / set / delete), so replaying a record a snapshot
+    already holds is harmless.
+
+    Files edited outside PyOS are picked up on the next read as long as
+    there are no unwritten changes to them.
+    """
+
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = path
+        self._docs = {}
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._io_lock = threading.Lock()
+        self._buffer = []
+        self._seq = 0
+        self._durable = 0
+        self._log_bytes = 0
+        self._file = None
+        self._thread = None
+
+    # ---------------------------------------------------------
+    # DOCUMENTS
+    # ---------------------------------------------------------
+    def _key(self, path):
+        return os.path.abspath(path)
+
+    def _doc(self, key):
+        """
+        In-memory document for key, (re)loading the snapshot if it is
+        new to us or was changed on disk. Called with the lock held.
+        """
+        doc = self._docs.get(key)
+        if doc is not None:
+            if doc.dirty:
+                return doc
+            st = vfs.stat_path(key)
+            if (st.st_mtime_ns if st is not None else None) == doc.mtime_ns:
+                return doc
+
+        value, mtime = _read_snapshot(key)
+        if doc is None:
+            doc = self._docs[key] = _Doc(value, mtime)
+        else:
+            doc.value, doc.mtime_ns = value, mtime
+            doc.version += 1
+        return doc
+
+    def read(self, path, default=None):
+        """
+        Deep copy of a document's current value (default if missing).
+        """
+        with self._lock:
+            value = self._doc(self._key(path)).value
+            return default if value is None else copy.deepcopy(value)
+
+    def get(self, path, keys, default=None):
+        """
+        Deep copy of one nested value, without copying the document.
+        """
+        with self._lock:
+            node = self._doc(self._key(path)).value
+            for key in keys:
+                if not isinstance(node, dict) or key not in node:
+                    return default
+                node = node[key]
+            return copy.deepcopy(node)
+
+    def version(self, path):
+        """
+        Counter that changes whenever the document does; cheap enough
+        to poll for change detection.
+        """
+        with self._lock:
+            return self._doc(self._key(path)).version
+
+    # ---------------------------------------------------------
+    # MUTATIONS
+    # ---------------------------------------------------------
+    def put(self, path, value):
+        return self._log({"op": PUT, "path": path, "value": value})
+
+    def set(self, path, keys, value):
+        return self._log({"op": SET, "path": path, "keys": list(keys), "value": value})
+
+    def delete(self, path, keys):
+        return self._log({"op": DELETE, "path": path, "keys": list(keys)})
+
+    def _log(self, record):
+        """
+        Apply a record in memory and queue it for the log. Returns its
+        sequence number for sync().
+        """
+        line = _encode(record)
+        with self._cond:
+            doc = self._doc(self._key(record["path"]))
+            _apply(doc, copy.deepcopy(record))
+            doc.version += 1
+            doc.dirty = True
+
+            self._seq += 1
+            self._buffer.append(line)
+            self._start()
+            self._cond.notify_all()
+            return self._seq
+
+    def sync(self, seq=None):
+        """
+        Block until record seq (default: everything so far) is on disk.
+        """
+        with self._cond:
+            target = self._seq if seq is None else seq
+            while self._durable < target:
+                self._cond.wait()
+
+    # ---------------------------------------------------------
+    # COMMIT
+    # ---------------------------------------------------------
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="pyos-journal", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._buffer:
+                    self._cond.wait(COMPACT_IDLE)
+                idle = not self._buffer
+                dirty = any(doc.dirty for doc in self._docs.values())
+
+            if idle:
+                if dirty:
+                    self.checkpoint()
+                continue
+
+            # Let the rest of a burst arrive so it shares the fsync
+            time.sleep(GROUP_COMMIT_DELAY)
+            self._commit()
+            if self._log_bytes > COMPACT_BYTES:
+                self.checkpoint()
+
+    def _commit(self):
+        """
+        Write and fsync everything buffered so far.
+        """
+        with self._io_lock:
+            with self._lock:
+                lines = self._buffer
+                self._buffer = []
+                seq = self._seq
+            if lines:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    self._file = open(self.path, "ab")
+                    self._log_bytes = self._file.tell()
+                data = b"".join(lines)
+                self._file.write(data)
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._log_bytes += len(data)
+
+        with self._cond:
+            self._durable = max(self._durable, seq)
+            self._cond.notify_all()
+
+    def checkpoint(self):
+        """
+        Write every changed document to its snapshot file and empty the
+        log. Records logged meanwhile stay queued for the new log.
+        """
+        self._commit()
+        with self._io_lock:
+            with self._lock:
+                pending = [(key, copy.deepcopy(doc.value)) for key, doc in self._docs.items() if doc.dirty]
+                for key, _ in pending:
+                    self._docs[key].dirty = False
+
+            for key, value in pending:
+                try:
+                    mtime = _write_snapshot(key, value)
+                except OSError:
+                    with self._lock:
+                        self._docs[key].dirty = True
+                    return
+                with self._lock:
+                    self._docs[key].mtime_ns = mtime
+
+            if self._file is not None:
+                self._file.truncate(0)
+                self._file.seek(0)
+                os.fsync(self._file.fileno())
+            elif os.path.exists(self.path):
+                os.truncate(self.path, 0)
+            self._log_bytes = 0
+
+    # ---------------------------------------------------------
+    # RECOVERY
+    # ---------------------------------------------------------
+    def replay(self):
+        """
+        Reapply a log left behind by a crash to the snapshots, then
+        checkpoint. Stops at the first torn or corrupt record. Returns
+        the number of records applied.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                lines = f.readlines()
+        except OSError:
+            return 0
+
+        applied = 0
+        with self._lock:
+            for line in lines:
+                record = _decode(line)
+                if record is None:
+                    break
+                doc = self._doc(self._key(record["path"]))
+                _apply(doc, record)
+                doc.version += 1
+                doc.dirty = True
+                applied += 1
+
+        if lines:
+            self.checkpoint()
+        return applied
+
+    def close(self):
+        self.checkpoint()
+        with self._io_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_journal():
+    """
+    Shared journal; the first call replays whatever a crash left behind.
+    """
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = Journal()
+            _journal.replay()
+        return _journal
+
+
+def _close_on_exit():
+    if _journal is not None:
+        try:
+            _journal.close()
+        except OSError:
+            pass
+
+
+atexit.register(_close_on_exit)
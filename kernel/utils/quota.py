@@ -0,0 +1,353 @@
+import os
+import json
+import time
+import errno
+import atexit
+import threading
+
+from kernel import vfs
+from kernel.utils.dir_sizes import get_cache, format_size
+from kernel.utils.journal import get_journal
+
+VFS_ROOT = vfs.VFS_ROOT
+USERS_FILE = os.path.join(VFS_ROOT, "Meta", "users.json")
+STATE_PATH = os.path.join(VFS_ROOT, "Meta", "quota.json")
+
+# Counters drift when files change behind PyOS's back (other programs,
+# in-place edits); a background pass re-measures every home this often.
+RECONCILE_INTERVAL = 15 * 60
+
+_UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+
+
+class QuotaExceeded(OSError):
+    def __init__(self, user, used, limit, need):
+        super().__init__(
+            errno.EDQUOT,
+            f"quota exceeded for '{user}': {format_size(used)} of {format_size(limit)} used"
+            + (f", {format_size(need)} more needed" if need else ""),
+        )
+        self.user = user
+
+
+def parse_size(value):
+    """
+    Bytes for 1048576, "1048576", "512MB" or "2 GB"; 0 means no limit.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip().upper().replace(" ", "")
+    if text in ("", "0", "NONE", "UNLIMITED"):
+        return 0
+    for unit in sorted(_UNITS, key=len, reverse=True):
+        if text.endswith(unit) and text[:-len(unit)]:
+            return int(float(text[:-len(unit)]) * _UNITS[unit])
+    return int(text)
+
+
+def format_usage(used, limit):
+    if used is None:
+        return "measuring..." if not limit else f"measuring... (limit {format_size(limit)})"
+    if not limit:
+        return f"{format_size(used)} used (no limit)"
+    return f"{format_size(used)} of {format_size(limit)} ({used * 100 // limit}%)"
+
+
+class QuotaManager:
+    """
+    Per-user storage quotas. Limits come from the optional "quota" field
+    of each user in Meta/users.json (bytes or "500MB"; missing or 0 is
+    unlimited). Usage is a counter per user, kept in Meta/quota.json and
+    moved by note_added()/note_removed() wherever PyOS writes, copies,
+    moves or purges files, so check() is a dict lookup instead of a
+    tree walk. Items in the trash still count for the user they came
+    from until they are deleted for good. reconcile() re-measures.
+    """
+
+    def __init__(self, users_file=USERS_FILE, state_path=STATE_PATH):
+        self.users_file = users_file
+        self.state_path = state_path
+        self.users = {}           # name -> {"home": abs path, "limit": bytes}
+        self.state = {}           # name -> {"used": bytes, "reconciled": ts}
+        self.dirty = False
+
+        self._lock = threading.Lock()
+        self._reconcile_lock = threading.Lock()
+        self._users_version = None
+        self._pending = None      # name -> delta seen during a reconcile
+        self._thread = None
+        self._wake = threading.Event()
+
+        self.load()
+
+    # ---------------------------------------------------------
+    # PERSISTENCE
+    # ---------------------------------------------------------
+    def load(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                self.state = json.load(f).get("users", {})
+        except (OSError, ValueError):
+            self.state = {}
+
+    def save(self):
+        with self._lock:
+            if not self.dirty:
+                return
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            tmp = self.state_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"users": self.state}, f, indent=2)
+            os.replace(tmp, self.state_path)
+            self.dirty = False
+
+    def _load_users(self):
+        """
+        Re-read users.json if it changed since the last call.
+        """
+        journal = get_journal()
+        version = journal.version(self.users_file)
+        if version == self._users_version:
+            return
+        self._users_version = version
+
+        users = {}
+        try:
+            data = journal.read(self.users_file, {})
+            for user in data.get("users", []):
+                try:
+                    limit = parse_size(user.get("quota", 0))
+                except ValueError:
+                    limit = 0
+                home = os.path.abspath(os.path.join(VFS_ROOT, user["home"]))
+                users[user["name"]] = {"home": home, "limit": limit}
+        except (KeyError, TypeError, AttributeError):
+            pass
+
+        with self._lock:
+            self.users = users
+
+    # ---------------------------------------------------------
+    # LOOKUPS
+    # ---------------------------------------------------------
+    def owner(self, path):
+        """
+        Name of the user whose home holds path, or None.
+        """
+        self._load_users()
+        path = os.path.abspath(path)
+        best = None
+        best_len = -1
+        for name, user in self.users.items():
+            home = user["home"]
+            if (path == home or path.startswith(home + os.sep)) and len(home) > best_len:
+                best, best_len = name, len(home)
+        return best
+
+    def used(self, name):
+        """
+        Counter for a user, or None until the background thread has
+        measured their home for the first time (never on the caller's
+        thread: this runs on UI frames and saves).
+        """
+        entry = self.state.get(name)
+        if entry is None:
+            if name in self.users:
+                self._wake.set()
+                return None
+            return 0
+        return entry.get("used", 0)
+
+    def limit(self, name):
+        self._load_users()
+        return self.users.get(name, {}).get("limit", 0)
+
+    def status(self):
+        """
+        [(name, used, limit)] for every user; used is None while still
+        being measured.
+        """
+        self._load_users()
+        return [(name, self.used(name), user["limit"]) for name, user in sorted(self.users.items())]
+
+    # ---------------------------------------------------------
+    # ACCOUNTING
+    # ---------------------------------------------------------
+    def check(self, path, nbytes):
+        """
+        Raise QuotaExceeded if writing nbytes more under path would put
+        its owner over quota. Allowed while the owner's usage is unknown.
+        """
+        if nbytes < 0:
+            return
+        name = self.owner(path)
+        if name is None:
+            return
+        limit = self.limit(name)
+        if not limit:
+            return
+        used = self.used(name)
+        if used is None:
+            return
+        if used + nbytes > limit or (nbytes == 0 and used > limit):
+            raise QuotaExceeded(name, used, limit, nbytes)
+
+    def check_move(self, src, dst, nbytes):
+        if self.owner(src) != self.owner(dst):
+            self.check(dst, nbytes)
+
+    def _charge(self, name, delta):
+        if name is None or not delta:
+            return
+        with self._lock:
+            if self._pending is not None and name in self._pending:
+                self._pending[name] += delta
+            entry = self.state.get(name)
+            if entry is None:
+                return    # not measured yet; the first reconcile sees this on disk
+            entry["used"] = max(0, entry["used"] + delta)
+            self.dirty = True
+
+    def note_added(self, path, nbytes):
+        self._charge(self.owner(path), nbytes)
+
+    def note_removed(self, path, nbytes):
+        self._charge(self.owner(path), -nbytes)
+
+    def note_moved(self, src, dst, nbytes):
+        """
+        Moves only count when they cross from one user to another.
+        """
+        old, new = self.owner(src), self.owner(dst)
+        if old != new:
+            self._charge(old, -nbytes)
+            self._charge(new, nbytes)
+
+    # ---------------------------------------------------------
+    # RECONCILIATION
+    # ---------------------------------------------------------
+    def _trash_bytes(self):
+        """
+        {name: bytes} of trashed items, by the user they came from.
+        """
+        from userspace.system.trash_manager import measure_trash
+        totals = {}
+        for original_path, nbytes in measure_trash():
+            name = self.owner(original_path)
+            if name is not None:
+                totals[name] = totals.get(name, 0) + nbytes
+        return totals
+
+    def reconcile(self, names=None):
+        """
+        Re-measure homes (and their share of the trash) from disk and
+        reset the counters. Changes noted while measuring are added on
+        top. Returns {name: (old, new)}.
+        """
+        with self._reconcile_lock:
+            return self._reconcile(names)
+
+    def _reconcile(self, names):
+        self._load_users()
+        names = list(self.users) if names is None else [n for n in names if n in self.users]
+        with self._lock:
+            self._pending = {name: 0 for name in names}
+
+        sizes = get_cache()
+        results = {}
+        try:
+            trash = self._trash_bytes()
+            for name in names:
+                home = self.users[name]["home"]
+                sizes.forget(home)
+                measured = sizes.size(home) if os.path.isdir(home) else 0
+                measured += trash.get(name, 0)
+                with self._lock:
+                    entry = self.state.setdefault(name, {"used": 0, "reconciled": 0})
+                    old = entry["used"]
+                    entry["used"] = measured + self._pending.get(name, 0)
+                    entry["reconciled"] = time.time()
+                    results[name] = (old, entry["used"])
+                    self.dirty = True
+        finally:
+            with self._lock:
+                self._pending = None
+        sizes.save()
+        self.save()
+        return results
+
+    def _due(self):
+        self._load_users()
+        now = time.time()
+        return [
+            name for name in self.users
+            if now - self.state.get(name, {}).get("reconciled", 0) >= RECONCILE_INTERVAL
+        ]
+
+    def _loop(self):
+        while True:
+            self._wake.clear()
+            due = self._due()
+            if due:
+                try:
+                    self.reconcile(due)
+                except OSError:
+                    pass
+            # used() wakes us early for a user it hasn't seen yet
+            self._wake.wait(RECONCILE_INTERVAL / 10)
+
+    def start(self):
+        """
+        Start the background reconcile thread (once).
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="pyos-quota", daemon=True)
+                self._thread.start()
+
+
+_quota = None
+_quota_lock = threading.Lock()
+
+
+def get_quota():
+    global _quota
+    with _quota_lock:
+        if _quota is None:
+            _quota = QuotaManager()
+            _quota.start()
+        return _quota
+
+
+def _save_on_exit():
+    if _quota is not None:
+        try:
+            _quota.save()
+        except OSError:
+            pass
+
+
+atexit.register(_save_on_exit)
+
+
+# ---------------------------------------------------------
+# BOOKKEEPING
+# ---------------------------------------------------------
+def note_added(path, nbytes, is_dir=False):
+    """
+    'path' was created or changed size by nbytes: update its owner's
+    usage and the cached directory sizes. Anything that writes files
+    outside the file-ops service must call this (or note_moved()).
+    """
+    get_cache().note_added(path, nbytes, is_dir)
+    get_quota().note_added(path, nbytes)
+
+
+def note_moved(src, dst, nbytes, is_dir=False):
+    """
+    'src' (nbytes in total) was moved or renamed to 'dst'.
+    """
+    sizes = get_cache()
+    sizes.note_removed(src, nbytes, is_dir)
+    sizes.note_added(dst, nbytes, is_dir)
+    get_quota().note_moved(src, dst, nbytes)
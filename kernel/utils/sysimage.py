@@ -0,0 +1,247 @@
+import io
+import os
+import sys
+import json
+import mmap
+import zlib
+import struct
+import threading
+
+# Single read-only file holding every boot-time asset
+IMAGE_PATH = "system.img"
+
+PACK_SOURCES = [
+    "res",
+    os.path.join("config", "live", "PyOS", "System"),
+    os.path.join("config", "live", "PyOS", "Languages"),
+    os.path.join("config", "live", "PyOS", "Apps", "Installed"),
+]
+PACK_EXCLUDE = {
+    os.path.join("config", "live", "PyOS", "System", "Logs"),
+}
+
+# Loose files win over packed ones when this is set, so assets can be
+# edited without repacking
+DEV_ENV = "PYOS_DEV"
+
+MAGIC = b"PYOSIMG1"
+HEADER = struct.Struct("<8sIIQQ")     # magic, version, count, index offset, index length
+IMAGE_VERSION = 1
+ALIGN = 64
+
+STORED = 0
+DEFLATE = 1
+
+# Already-compressed formats are always stored
+NO_COMPRESS = {".png", ".jpg", ".jpeg", ".gif", ".mp3", ".ogg", ".zip", ".gz"}
+
+# Deflate is kept only if it saves at least this fraction
+MIN_SAVING = 0.10
+
+
+def _key(path):
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+# ---------------------------------------------------------
+# PACKING
+# ---------------------------------------------------------
+def pack(out_path=IMAGE_PATH, sources=PACK_SOURCES, compress=False):
+    """
+    Build an image from the source trees. Layout: header, entries each
+    aligned to ALIGN bytes, then a JSON index of
+    {path: [offset, stored length, size, codec]}. Returns the entry count.
+    """
+    files = []
+    for source in sources:
+        for dirpath, dirnames, filenames in os.walk(source):
+            dirnames[:] = sorted(
+                d for d in dirnames if os.path.join(dirpath, d) not in PACK_EXCLUDE
+            )
+            for name in sorted(filenames):
+                files.append(os.path.join(dirpath, name))
+
+    index = {}
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"\0" * HEADER.size)
+
+        for path in files:
+            with open(path, "rb") as src:
+                data = src.read()
+
+            codec = STORED
+            stored = data
+            ext = os.path.splitext(path)[1].lower()
+            if compress and ext not in NO_COMPRESS and data:
+                packed = zlib.compress(data, 9)
+                if len(packed) <= len(data) * (1 - MIN_SAVING):
+                    codec = DEFLATE
+                    stored = packed
+
+            pad = -f.tell() % ALIGN
+            f.write(b"\0" * pad)
+            index[_key(path)] = [f.tell(), len(stored), len(data), codec]
+            f.write(stored)
+
+        index_data = json.dumps(index, separators=(",", ":")).encode("utf-8")
+        index_offset = f.tell()
+        f.write(index_data)
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, IMAGE_VERSION, len(index), index_offset, len(index_data)))
+
+    os.replace(tmp, out_path)
+    return len(index)
+
+
+# ---------------------------------------------------------
+# READING
+# ---------------------------------------------------------
+class ImageError(Exception):
+    pass
+
+
+class SystemImage:
+    """
+    Read-only view of a packed image through one mmap. Stored entries
+    come back as memoryview slices of the mapping (no copy); deflated
+    entries are inflated on each read.
+    """
+
+    def __init__(self, path=IMAGE_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < HEADER.size:
+            raise ImageError(f"{path}: truncated image")
+        magic, version, count, offset, length = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != IMAGE_VERSION:
+            raise ImageError(f"{path}: not a v{IMAGE_VERSION} system image")
+
+        # Boot touches most of the image; ask for it in one sequential read
+        if hasattr(self._mm, "madvise") and hasattr(mmap, "MADV_WILLNEED"):
+            self._mm.madvise(mmap.MADV_WILLNEED)
+
+        self._view = memoryview(self._mm)
+        self.index = json.loads(bytes(self._view[offset:offset + length]))
+        if len(self.index) != count:
+            raise ImageError(f"{path}: index is damaged")
+
+    def __contains__(self, path):
+        return _key(path) in self.index
+
+    def names(self):
+        return list(self.index)
+
+    def read(self, path):
+        """
+        Entry contents as a memoryview (stored) or bytes (deflated).
+        """
+        try:
+            offset, stored, size, codec = self.index[_key(path)]
+        except KeyError:
+            raise FileNotFoundError(path)
+
+        data = self._view[offset:offset + stored]
+        if codec == DEFLATE:
+            return zlib.decompress(data)
+        return data
+
+
+class AssetFile(io.RawIOBase):
+    """
+    Seekable binary file over a buffer, for loaders that want a file
+    object (pygame.image.load, pygame.font.Font). readinto() copies
+    straight from the mapping into the caller's buffer.
+    """
+
+    def __init__(self, data, name=""):
+        super().__init__()
+        self._data = memoryview(data)
+        self._pos = 0
+        self.name = name
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buf):
+        n = min(len(buf), len(self._data) - self._pos)
+        if n <= 0:
+            return 0
+        buf[:n] = self._data[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._data)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+
+_image = None
+_image_loaded = False
+_image_lock = threading.Lock()
+
+
+def get_image():
+    """
+    The shared image, or None when there is none (or it is unusable).
+    """
+    global _image, _image_loaded
+    with _image_lock:
+        if not _image_loaded:
+            _image_loaded = True
+            try:
+                _image = SystemImage()
+            except (OSError, ImageError, ValueError):
+                _image = None
+        return _image
+
+
+def _dev_mode():
+    return os.environ.get(DEV_ENV, "") not in ("", "0")
+
+
+def read_asset(path):
+    """
+    Contents of an asset: from the image unless in dev mode with a
+    loose copy on disk, falling back to the loose file otherwise.
+    """
+    image = get_image()
+    if image is not None and path in image:
+        if not (_dev_mode() and os.path.exists(path)):
+            return image.read(path)
+
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def asset_exists(path):
+    image = get_image()
+    return (image is not None and path in image) or os.path.exists(path)
+
+
+def open_asset(path):
+    return AssetFile(read_asset(path), os.path.basename(path))
+
+
+def read_json(path):
+    return json.loads(bytes(read_asset(path)).decode("utf-8"))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    out = next((a for a in args if not a.startswith("--")), IMAGE_PATH)
+    count = pack(out, compress="--compress" in args)
+    print(f"Packed {count} files -> {out} ({os.path.getsize(out)} bytes)")
@@ -0,0 +1,270 @@
+import os
+import stat
+import time
+import threading
+from collections import OrderedDict
+
+VFS_ROOT = os.path.normpath(os.path.join("config", "live", "PyOS"))
+
+# How long a cached stat or listing is trusted before it is checked
+# against the disk again. Frame loops ask the same questions many times
+# a second; one syscall per TTL is enough to notice outside changes.
+STAT_TTL = 1.0
+
+STAT_CACHE_SIZE = 50000
+LISTING_CACHE_SIZE = 256
+
+
+# ---------------------------------------------------------
+# PATH RESOLUTION
+# ---------------------------------------------------------
+def is_inside(path, root=VFS_ROOT):
+    return path == root or path.startswith(root + os.sep)
+
+
+def resolve(path, cwd=VFS_ROOT, root=VFS_ROOT):
+    """
+    Host path for a VFS path. '/a/b' is taken from the VFS root, other
+    relative paths from cwd, and host paths already under the root are
+    kept. Anything that would escape the root resolves to the root.
+    """
+    if is_inside(os.path.normpath(path), root):
+        full = path
+    elif path.startswith(("/", "\\")):
+        full = os.path.join(root, path.lstrip("/\\"))
+    else:
+        full = os.path.join(cwd, path)
+
+    full = os.path.normpath(full)
+    if not is_inside(full, root):
+        return root
+    return full
+
+
+def to_vfs(path, root=VFS_ROOT):
+    """
+    '/a/b' style display path for a host path under the root.
+    """
+    rel = os.path.relpath(os.path.normpath(path), root)
+    if rel == ".":
+        return "/"
+    return "/" + rel.replace(os.sep, "/")
+
+
+# ---------------------------------------------------------
+# STAT CACHE
+# ---------------------------------------------------------
+class VfsEntry:
+    __slots__ = ("name", "path", "is_dir")
+
+    def __init__(self, name, path, is_dir):
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+
+
+class _Listing:
+    __slots__ = ("mtime_ns", "checked", "entries", "types")
+
+    def __init__(self, mtime_ns, checked, entries):
+        self.mtime_ns = mtime_ns
+        self.checked = checked
+        self.entries = entries
+        self.types = {e.name: e.is_dir for e in entries}
+
+
+class VfsCache:
+    """
+    Shared stat and directory-listing cache. Answers are served from
+    memory for up to 'ttl' seconds (or 'max_age' per call; 0 forces a
+    fresh syscall). An expired listing costs one stat of the directory
+    and is only re-read when the directory's mtime moved. Types of
+    listed children come from scandir for free, so isdir() on anything
+    just listed needs no syscall at all.
+    """
+
+    def __init__(self, ttl=STAT_TTL):
+        self.ttl = ttl
+        self._stats = OrderedDict()       # path -> (checked, stat_result or None)
+        self._listings = OrderedDict()    # dir path -> _Listing
+        self._lock = threading.Lock()
+
+        # Keys are absolute so 'config/x' and '/.../config/x' share an
+        # entry. The desktop never changes directory, so the cwd is
+        # taken once instead of a getcwd() per lookup.
+        self._cwd = os.getcwd()
+
+    def _key(self, path):
+        if not os.path.isabs(path):
+            path = os.path.join(self._cwd, path)
+        return os.path.normpath(path)
+
+    # ---------------------------------------------------------
+    # STAT
+    # ---------------------------------------------------------
+    def stat(self, path, max_age=None):
+        """
+        os.stat() result, or None if the path does not exist.
+        """
+        key = self._key(path)
+        age = self.ttl if max_age is None else max_age
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._stats.get(key)
+            if cached is not None and now - cached[0] <= age:
+                return cached[1]
+
+        try:
+            st = os.stat(key)
+        except OSError:
+            st = None
+
+        with self._lock:
+            self._stats[key] = (now, st)
+            self._stats.move_to_end(key)
+            if len(self._stats) > STAT_CACHE_SIZE:
+                self._stats.popitem(last=False)
+        return st
+
+    def _kind(self, path, max_age):
+        """
+        True for a folder, False for a file, None if missing.
+        """
+        key = self._key(path)
+        age = self.ttl if max_age is None else max_age
+        parent, name = os.path.split(key)
+
+        with self._lock:
+            listing = self._listings.get(parent)
+            if listing is not None and time.monotonic() - listing.checked <= age:
+                return listing.types.get(name)
+
+        st = self.stat(key, max_age)
+        if st is None:
+            return None
+        return stat.S_ISDIR(st.st_mode)
+
+    def exists(self, path, max_age=None):
+        return self._kind(path, max_age) is not None
+
+    def isdir(self, path, max_age=None):
+        return self._kind(path, max_age) is True
+
+    def isfile(self, path, max_age=None):
+        return self._kind(path, max_age) is False
+
+    def getsize(self, path, max_age=None):
+        st = self.stat(path, max_age)
+        if st is None:
+            raise FileNotFoundError(path)
+        return st.st_size
+
+    # ---------------------------------------------------------
+    # LISTINGS
+    # ---------------------------------------------------------
+    def scandir(self, path, max_age=None):
+        """
+        VfsEntry list for a directory in disk order; [] if unreadable.
+        """
+        key = self._key(path)
+        age = self.ttl if max_age is None else max_age
+        now = time.monotonic()
+
+        with self._lock:
+            listing = self._listings.get(key)
+            if listing is not None and now - listing.checked <= age:
+                return listing.entries
+
+        try:
+            mtime = os.stat(key).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._listings.pop(key, None)
+            return []
+
+        if listing is not None and listing.mtime_ns == mtime:
+            listing.checked = now
+            return listing.entries
+
+        entries = []
+        try:
+            with os.scandir(key) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    entries.append(VfsEntry(entry.name, entry.path, is_dir))
+        except OSError:
+            return []
+
+        with self._lock:
+            self._listings[key] = _Listing(mtime, now, entries)
+            self._listings.move_to_end(key)
+            if len(self._listings) > LISTING_CACHE_SIZE:
+                self._listings.popitem(last=False)
+        return entries
+
+    def listdir(self, path, max_age=None):
+        return [e.name for e in self.scandir(path, max_age)]
+
+    # ---------------------------------------------------------
+    # INVALIDATION
+    # ---------------------------------------------------------
+    def invalidate(self, path):
+        """
+        Forget what is known about 'path' and its parent's listing.
+        Call after creating, removing or renaming something.
+        """
+        key = self._key(path)
+        with self._lock:
+            self._stats.pop(key, None)
+            self._listings.pop(key, None)
+            parent = os.path.dirname(key)
+            self._stats.pop(parent, None)
+            self._listings.pop(parent, None)
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+            self._listings.clear()
+
+
+_cache = VfsCache()
+
+
+def get_cache():
+    return _cache
+
+
+def stat_path(path, max_age=None):
+    return _cache.stat(path, max_age)
+
+
+def exists(path, max_age=None):
+    return _cache.exists(path, max_age)
+
+
+def isdir(path, max_age=None):
+    return _cache.isdir(path, max_age)
+
+
+def isfile(path, max_age=None):
+    return _cache.isfile(path, max_age)
+
+
+def getsize(path, max_age=None):
+    return _cache.getsize(path, max_age)
+
+
+def scandir(path, max_age=None):
+    return _cache.scandir(path, max_age)
+
+
+def listdir(path, max_age=None):
+    return _cache.listdir(path, max_age)
+
+
+def invalidate(path):
+    _cache.invalidate(path)
@@ -0,0 +1,27 @@
+from PyApps.default.terminal.history import CommandHistory
+
+
+def make_history(tmp_path, commands):
+    history = CommandHistory(path=str(tmp_path / "cmd_history"))
+    for cmd in commands:
+        history.append(cmd)
+    return history
+
+
+def test_incremental_search_keeps_current_match(tmp_path):
+    history = make_history(tmp_path, ["copy a b", "git commit", "dir"])
+
+    text, cursor = history.search("c", history.end())
+    assert text == "git commit"
+
+    # Typing another character searches again from just past the entry
+    # shown, which still contains "co"
+    text, cursor = history.search("co", history.after(cursor))
+    assert text == "git commit"
+
+
+def test_after_points_past_entry(tmp_path):
+    history = make_history(tmp_path, ["one", "two"])
+
+    assert history.after(0) == len("one\n")
+    assert history.after(len("one\n")) == history.end()
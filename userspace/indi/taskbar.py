@@ -1,5 +1,6 @@
 import os
 import pygame
+from userspace.system.assets import load_font, load_image
 
 TRASH_ICON_PATH = os.path.join("res", "images", "main", "imageres", "trashbin.png")
 EXPLORER_ICON_PATH = os.path.join("res", "images", "main", "imageres", "fileexplorer.png")
@@ -13,13 +14,13 @@ class Taskbar:
         self.taskbar_height = taskbar_height
 
         # Load icons
-        self.start_icon = pygame.image.load(START_ICON_PATH).convert_alpha()
+        self.start_icon = load_image(START_ICON_PATH).convert_alpha()
         self.start_icon = pygame.transform.scale(self.start_icon, (40, 40))
 
-        self.trash_icon = pygame.image.load(TRASH_ICON_PATH).convert_alpha()
+        self.trash_icon = load_image(TRASH_ICON_PATH).convert_alpha()
         self.trash_icon = pygame.transform.scale(self.trash_icon, (40, 40))
 
-        self.explorer_icon = pygame.image.load(EXPLORER_ICON_PATH).convert_alpha()
+        self.explorer_icon = load_image(EXPLORER_ICON_PATH).convert_alpha()
         self.explorer_icon = pygame.transform.scale(self.explorer_icon, (40, 40))
 
         # Positions
@@ -33,7 +34,7 @@ class Taskbar:
         self.explorer_rect = pygame.Rect(self.explorer_pos[0], self.explorer_pos[1], 40, 40)
 
         self.hover_color = (0, 120, 255, 120)
-        self.font = pygame.font.Font(font_path, int(self.taskbar_height * 0.45))
+        self.font = load_font(font_path, int(self.taskbar_height * 0.45))
 
     def draw(self, screen):
         pygame.draw.rect(screen, (20, 20, 20), (0, self.height - self.taskbar_height, self.width, self.taskbar_height))
@@ -0,0 +1,21 @@
+import os
+import pygame
+
+from kernel.utils.sysimage import open_asset
+
+
+def load_image(path):
+    """
+    pygame Surface for an asset, decoded straight out of the system
+    image when it is packed. Call convert()/convert_alpha() as usual.
+    """
+    return pygame.image.load(open_asset(path), os.path.basename(path))
+
+
+def load_font(path, size):
+    """
+    pygame Font for an asset. Each font gets its own file object since
+    SDL keeps reading glyphs from it for the font's lifetime.
+    """
+    return pygame.font.Font(open_asset(path), size)
+
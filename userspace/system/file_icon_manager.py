@@ -1,6 +1,10 @@
 import os
 import pygame
 
+from kernel import vfs
+from kernel.utils.sysimage import asset_exists
+from userspace.system.assets import load_image
+
 ICON_DIR = "res/images/main/fileicons"
 
 DEFAULT_FILE_ICON = os.path.join(ICON_DIR, "file.png")
@@ -32,16 +36,16 @@ class FileIconManager:
             return self.cache[filename]
 
         path = os.path.join(ICON_DIR, filename)
-        if not os.path.exists(path):
+        if not asset_exists(path):
             path = DEFAULT_FILE_ICON
 
-        img = pygame.image.load(path).convert_alpha()
+        img = load_image(path).convert_alpha()
         img = pygame.transform.scale(img, (48, 48))
         self.cache[filename] = img
         return img
 
     def get_icon(self, path):
-        if os.path.isdir(path):
+        if vfs.isdir(path):
             return self.load_icon(os.path.basename(DEFAULT_FOLDER_ICON))
 
         ext = os.path.splitext(path)[1].lower()
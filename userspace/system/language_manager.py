@@ -1,5 +1,6 @@
 import os
-import json
+
+from kernel.utils.sysimage import asset_exists, read_json
 from userspace.system.settings_manager import SettingsManager
 
 LANG_ROOT = os.path.join("config", "live", "PyOS", "Languages")
@@ -16,12 +17,11 @@ class LanguageManager:
     def load_language(self, lang_code):
         path = os.path.join(LANG_ROOT, f"{lang_code}.json")
 
-        if not os.path.exists(path):
+        if not asset_exists(path):
             print(f"[LanguageManager] Missing language file: {path}")
             return
 
-        with open(path, "r", encoding="utf-8") as f:
-            self.strings = json.load(f)
+        self.strings = read_json(path)
 
     def get(self, key):
         return self.strings.get(key, f"[{key}]")
@@ -0,0 +1,184 @@
+import os
+import gzip
+import shutil
+import atexit
+import threading
+
+FLUSH_INTERVAL = 2.0          # seconds between background flushes
+MAX_BYTES = 1024 * 1024       # rotate once a log grows past this
+BACKUP_COUNT = 5              # rotated segments kept per log
+
+
+class LogWriter:
+    """
+    Buffered append-only log file. write() only queues the line in
+    memory; the shared flusher thread (or flush()/close()) writes queued
+    lines through one persistent handle and rotates by size.
+    """
+
+    def __init__(self, path, max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT, compress=False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.compress = compress
+
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._io_lock = threading.Lock()
+
+        self._file = None
+        self._size = 0
+
+    # ---------------------------------------------------------
+    # PUBLIC API
+    # ---------------------------------------------------------
+    def write(self, line):
+        if not line.endswith("\n"):
+            line += "\n"
+        with self._pending_lock:
+            self._pending.append(line)
+
+    def flush(self):
+        with self._pending_lock:
+            if not self._pending:
+                return
+            lines, self._pending = self._pending, []
+
+        data = "".join(lines).encode("utf-8")
+
+        with self._io_lock:
+            rotated = None
+            try:
+                if self._file is None:
+                    self._open()
+                if self.max_bytes and self._size and self._size + len(data) > self.max_bytes:
+                    rotated = self._rotate()
+                self._file.write(data)
+                self._file.flush()
+                self._size += len(data)
+            except OSError:
+                self._close_file()
+                return
+
+        if rotated and self.compress:
+            self._compress(rotated)
+
+    def close(self):
+        self.flush()
+        with self._io_lock:
+            self._close_file()
+
+    # ---------------------------------------------------------
+    # FILE HANDLING
+    # ---------------------------------------------------------
+    def _open(self):
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+        self._file = None
+        self._size = 0
+
+    def _segment(self, i):
+        name = f"{self.path}.{i}"
+        if os.path.exists(name + ".gz"):
+            return name + ".gz"
+        return name
+
+    def _rotate(self):
+        """
+        cmd.log -> cmd.log.1 -> cmd.log.2 ... dropping the oldest.
+        Returns the freshly rotated segment path.
+        """
+        self._close_file()
+
+        if self.backup_count > 0:
+            oldest = self._segment(self.backup_count)
+            if os.path.exists(oldest):
+                os.remove(oldest)
+
+            for i in range(self.backup_count - 1, 0, -1):
+                src = self._segment(i)
+                if os.path.exists(src):
+                    suffix = ".gz" if src.endswith(".gz") else ""
+                    os.replace(src, f"{self.path}.{i + 1}{suffix}")
+
+            rotated = f"{self.path}.1"
+            os.replace(self.path, rotated)
+        else:
+            rotated = None
+            os.remove(self.path)
+
+        self._open()
+        return rotated
+
+    def _compress(self, path):
+        try:
+            with open(path, "rb") as src, gzip.open(path + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# ---------------------------------------------------------
+# SHARED WRITERS
+# ---------------------------------------------------------
+_writers = {}
+_writers_lock = threading.Lock()
+_flusher = None
+_stop = threading.Event()
+
+
+def get_log_writer(path, **options):
+    """
+    Return the process-wide writer for a log path, creating it on
+    first use. Options only apply when the writer is created.
+    """
+    key = os.path.abspath(path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = LogWriter(path, **options)
+            _writers[key] = writer
+            _start_flusher()
+        return writer
+
+
+def flush_all():
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.flush()
+
+
+def close_all():
+    _stop.set()
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+def _flush_loop():
+    while not _stop.wait(FLUSH_INTERVAL):
+        flush_all()
+
+
+def _start_flusher():
+    global _flusher
+    if _flusher is None:
+        _flusher = threading.Thread(target=_flush_loop, name="pyos-log-flusher", daemon=True)
+        _flusher.start()
+
+
+atexit.register(close_all)
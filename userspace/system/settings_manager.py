@@ -1,6 +1,8 @@
 import os
 import configparser
 
+from kernel.utils.journal import get_journal
+
 SETTINGS_PATH = os.path.join("config", "live", "PyOS", "settings.ini")
 
 DEFAULT_SETTINGS = {
@@ -14,34 +16,50 @@ DEFAULT_SETTINGS = {
     },
     "System": {
         "volume": "70"
+    },
+    "Storage": {
+        "dedup": "false"
     }
 }
 
 
 class SettingsManager:
+    """
+    settings.ini, read and written through the metadata journal: a
+    change is one small journal record and the file is rewritten in
+    the background.
+    """
+
     def __init__(self):
         self.config = configparser.ConfigParser()
+        self.journal = get_journal()
 
-        if not os.path.exists(SETTINGS_PATH):
+        data = self.journal.read(SETTINGS_PATH)
+        if data is None:
             self.create_default_settings()
         else:
-            self.config.read(SETTINGS_PATH)
+            self.config.read_dict(data)
 
     def create_default_settings(self):
         for section, values in DEFAULT_SETTINGS.items():
             self.config[section] = values
-
-        os.makedirs(os.path.dirname(SETTINGS_PATH), exist_ok=True)
-        with open(SETTINGS_PATH, "w") as f:
-            self.config.write(f)
+        self.save()
 
     def save(self):
-        with open(SETTINGS_PATH, "w") as f:
-            self.config.write(f)
+        data = {s: dict(self.config[s]) for s in self.config.sections()}
+        self.journal.put(SETTINGS_PATH, data)
 
-    def get(self, section, key):
-        return self.config.get(section, key)
+    def get(self, section, key, fallback=None):
+        """
+        Value of section/key. Settings files from older versions may lack
+        newer keys; pass a fallback to get it instead of an error.
+        """
+        if fallback is None:
+            return self.config.get(section, key)
+        return self.config.get(section, key, fallback=fallback)
 
     def set(self, section, key, value):
+        if not self.config.has_section(section):
+            self.config.add_section(section)
         self.config.set(section, key, str(value))
-        self.save()
+        self.journal.set(SETTINGS_PATH, [section, self.config.optionxform(key)], str(value))
@@ -1,170 +1,495 @@
 import os
-import shutil
-import json
 import time
+import errno
+import shutil
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from kernel import vfs
+from kernel.utils.dir_sizes import get_cache
+from kernel.utils.quota import get_quota
+from kernel.utils.journal import get_journal
 
 TRASH_ROOT = os.path.join("config", "live", "PyOS", "$Trash.Bin")
 FILES_DIR = os.path.join(TRASH_ROOT, "files")
-META_FILE = os.path.join(TRASH_ROOT, "index.json")
+INDEX_DB = os.path.join(TRASH_ROOT, "index.db")
+
+# Written by older versions; imported into INDEX_DB once, then removed
+LEGACY_INDEX = os.path.join(TRASH_ROOT, "index.json")
+
+# Rows fetched per query when walking the whole trash
+PAGE_SIZE = 500
+
+# Moves between devices copy the data, so batches of them are spread
+# over this many threads
+MAX_WORKERS = min(8, (os.cpu_count() or 1) + 2)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    original_path TEXT NOT NULL,
+    trash_path TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    size INTEGER,
+    deleted_at REAL NOT NULL
+);
+"""
+
+COLUMNS = "id, name, original_path, trash_path, is_dir, size, deleted_at"
 
 
 def _ensure_trash_dirs():
     os.makedirs(FILES_DIR, exist_ok=True)
-    if not os.path.exists(META_FILE):
-        with open(META_FILE, "w", encoding="utf-8") as f:
-            json.dump({}, f)
 
 
-def _load_index():
-    _ensure_trash_dirs()
-    try:
-        with open(META_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {}
+def _row_to_entry(row):
+    tid, name, original_path, trash_path, is_dir, size, deleted_at = row
+    return {
+        "id": str(tid),
+        "name": name,
+        "original_path": original_path,
+        "trash_path": trash_path,
+        "is_dir": bool(is_dir),
+        "size": size,
+        "deleted_at": deleted_at,
+    }
+
+
+# ---------------------------------------------------------
+# INDEX
+# ---------------------------------------------------------
+class TrashIndex:
+    """
+    Trashed items, one SQLite row each keyed by trash id. Adding or
+    removing an item is a single indexed write whatever the size of the
+    trash, and listings are read a page at a time, so a bin with 100k
+    items costs the same to delete into as an empty one.
+    """
 
+    def __init__(self, db_path=INDEX_DB, legacy_path=LEGACY_INDEX):
+        self.db_path = db_path
+        self._lock = threading.RLock()
 
-def _save_index(index):
-    os.makedirs(TRASH_ROOT, exist_ok=True)
-    with open(META_FILE, "w", encoding="utf-8") as f:
-        json.dump(index, f, indent=2)
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self.db:
+            self.db.executescript(SCHEMA)
 
+        self._migrate(legacy_path)
+        self._last_id = self.db.execute("SELECT MAX(id) FROM items").fetchone()[0] or 0
 
-def move_to_trash(path):
+    def _migrate(self, legacy_path):
+        """
+        Import an index.json left by an older version. It is read through
+        the metadata journal, which may hold changes the file doesn't.
+        """
+        if not os.path.exists(legacy_path):
+            return
+
+        journal = get_journal()
+        journal.checkpoint()
+        rows = []
+        for tid, entry in journal.read(legacy_path, {}).items():
+            try:
+                rows.append((
+                    int(tid), entry["name"], entry["original_path"], entry["trash_path"],
+                    int(bool(entry.get("is_dir"))), entry.get("size"), entry.get("deleted_at", 0),
+                ))
+            except (KeyError, ValueError, TypeError, AttributeError):
+                continue
+
+        with self._lock, self.db:
+            self.db.executemany(f"INSERT OR IGNORE INTO items ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        os.remove(legacy_path)
+        vfs.invalidate(legacy_path)
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+    # ---------------------------------------------------------
+    # UPDATES
+    # ---------------------------------------------------------
+    def new_id(self):
+        """
+        Deletion time in milliseconds, bumped past the last id handed out
+        so two items trashed in the same millisecond can't collide.
+        """
+        with self._lock:
+            self._last_id = max(int(time.time() * 1000), self._last_id + 1)
+            return str(self._last_id)
+
+    def add(self, trash_id, entry):
+        self.add_many([(trash_id, entry)])
+
+    def add_many(self, entries):
+        """
+        entries: [(trash_id, entry)], written in one transaction.
+        """
+        with self._lock, self.db:
+            self.db.executemany(
+                f"INSERT OR REPLACE INTO items ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(int(tid), e["name"], e["original_path"], e["trash_path"], int(e["is_dir"]), e["size"], e["deleted_at"])
+                 for tid, e in entries],
+            )
+
+    def remove(self, trash_id):
+        self.remove_many([trash_id])
+
+    def remove_many(self, trash_ids):
+        with self._lock, self.db:
+            self.db.executemany("DELETE FROM items WHERE id=?", [(int(tid),) for tid in trash_ids])
+
+    # ---------------------------------------------------------
+    # QUERIES
+    # ---------------------------------------------------------
+    def get(self, trash_id):
+        try:
+            tid = int(trash_id)
+        except (TypeError, ValueError):
+            return None
+        with self._lock:
+            row = self.db.execute(f"SELECT {COLUMNS} FROM items WHERE id=?", (tid,)).fetchone()
+        return _row_to_entry(row) if row else None
+
+    def count(self, upto=None):
+        """
+        Number of items, or of those with ids up to upto.
+        """
+        with self._lock:
+            if upto is None:
+                return self.db.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+            return self.db.execute("SELECT COUNT(*) FROM items WHERE id <= ?", (int(upto),)).fetchone()[0]
+
+    def max_id(self):
+        """
+        Newest trash id, or None if the trash is empty. Ids only grow,
+        so this marks what was in the trash at a point in time.
+        """
+        with self._lock:
+            tid = self.db.execute("SELECT MAX(id) FROM items").fetchone()[0]
+        return None if tid is None else str(tid)
+
+    def page(self, offset=0, limit=PAGE_SIZE):
+        """
+        Entries offset .. offset+limit, oldest first.
+        """
+        with self._lock:
+            rows = self.db.execute(
+                f"SELECT {COLUMNS} FROM items ORDER BY id LIMIT ? OFFSET ?", (limit, offset)
+            ).fetchall()
+        return [_row_to_entry(row) for row in rows]
+
+    def iter_all(self, page_size=PAGE_SIZE, upto=None):
+        """
+        Every entry (with an id up to upto, if given), oldest first,
+        fetched page by page. Items removed meanwhile are simply not
+        returned.
+        """
+        last = -1
+        limit = (1 << 63) - 1 if upto is None else int(upto)
+        while True:
+            with self._lock:
+                rows = self.db.execute(
+                    f"SELECT {COLUMNS} FROM items WHERE id > ? AND id <= ? ORDER BY id LIMIT ?",
+                    (last, limit, page_size),
+                ).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            for row in rows:
+                yield _row_to_entry(row)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = TrashIndex()
+        return _index
+
+
+def list_trash(offset=0, limit=None):
     """
-    Move a file or folder to $Trash.Bin and record metadata.
-    Returns trash_id or None on failure.
+    Returns a list of entries, oldest first:
+    { 'id', 'name', 'original_path', 'trash_path', 'is_dir', 'size', 'deleted_at' }
+    With limit, only that page of the trash is read.
     """
-    _ensure_trash_dirs()
+    if limit is None:
+        return list(iter_trash())
+    return get_index().page(offset, limit)
+
+
+def iter_trash():
+    """
+    Every entry, read from the index a page at a time.
+    """
+    return get_index().iter_all()
+
+
+def count_trash():
+    return get_index().count()
+
+
+def entry_size(entry):
+    """
+    Bytes held by a trashed item: recorded when it was trashed, or
+    measured for entries written by older versions.
+    """
+    if entry.get("size") is not None:
+        return entry["size"]
+    return get_cache().measure(entry["trash_path"])
+
+
+def measure_trash():
+    """
+    [(original_path, bytes)] for every trashed item, measured on disk.
+    """
+    sizes = get_cache()
+    return [
+        (entry["original_path"], sizes.measure(entry["trash_path"]))
+        for entry in iter_trash()
+    ]
+
 
-    if not os.path.exists(path):
-        return None
+# ---------------------------------------------------------
+# BATCH OPERATIONS
+# ---------------------------------------------------------
+class TrashResult:
+    __slots__ = ("item", "trash_id", "error", "skipped", "entry")
 
-    index = _load_index()
+    def __init__(self, item, trash_id=None, error=None, skipped=False, entry=None):
+        self.item = item
+        self.trash_id = trash_id
+        self.error = error
+        self.skipped = skipped
+        self.entry = entry
 
-    trash_id = str(int(time.time() * 1000))
-    base_name = os.path.basename(path)
-    trash_name = f"{trash_id}_{base_name}"
-    trash_path = os.path.join(FILES_DIR, trash_name)
+    @property
+    def ok(self):
+        return self.error is None and not self.skipped
 
+
+def _same_device(path, other):
     try:
-        if os.path.isdir(path):
-            shutil.move(path, trash_path)
-        else:
-            shutil.move(path, trash_path)
-    except Exception:
-        return None
+        return os.stat(path).st_dev == os.stat(other).st_dev
+    except OSError:
+        return True
 
-    index[trash_id] = {
-        "original_path": os.path.abspath(path),
-        "trash_path": trash_path,
-        "name": base_name,
-        "is_dir": os.path.isdir(trash_path),
-        "deleted_at": time.time(),
-    }
 
-    _save_index(index)
-    return trash_id
+def _run_batch(fn, items, parallel, cancelled, progress):
+    """
+    TrashResult of fn(item) for every item, in order. Items not started
+    before cancelled() turned true come back skipped. progress(result)
+    is called as each item finishes, on whichever thread ran it.
+    """
+    def one(item):
+        if cancelled is not None and cancelled():
+            return TrashResult(item, skipped=True)
+        result = fn(item)
+        if progress is not None:
+            progress(result)
+        return result
+
+    if parallel and len(items) > 1:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="pyos-trash") as pool:
+            return list(pool.map(one, items))
+    return [one(item) for item in items]
 
 
-def list_trash():
+def move_to_trash_many(paths, cancelled=None, progress=None):
     """
-    Returns a list of entries:
-    { 'id', 'name', 'original_path', 'is_dir', 'deleted_at' }
+    Move files and folders to $Trash.Bin, then record them in the index
+    in one transaction. Items on another device than the trash are
+    copied across, so those batches run on several threads. Returns a
+    TrashResult per path, in order.
     """
-    index = _load_index()
-    items = []
-    for tid, data in index.items():
-        items.append({
-            "id": tid,
-            "name": data.get("name"),
-            "original_path": data.get("original_path"),
-            "is_dir": data.get("is_dir", False),
-            "deleted_at": data.get("deleted_at", 0),
+    _ensure_trash_dirs()
+    index = get_index()
+    sizes = get_cache()
+
+    def move(path):
+        if not vfs.exists(path, max_age=0):
+            return TrashResult(path, error=FileNotFoundError(errno.ENOENT, "No such file or directory", path))
+
+        trash_id = index.new_id()
+        base_name = os.path.basename(path)
+        trash_path = os.path.join(FILES_DIR, f"{trash_id}_{base_name}")
+
+        is_dir = vfs.isdir(path, max_age=0)
+        size = sizes.measure(path)
+        try:
+            shutil.move(path, trash_path)
+        except OSError as e:
+            return TrashResult(path, error=e)
+        vfs.invalidate(path)
+        vfs.invalidate(trash_path)
+
+        return TrashResult(path, trash_id, entry={
+            "original_path": os.path.abspath(path),
+            "trash_path": trash_path,
+            "name": base_name,
+            "is_dir": is_dir,
+            "size": size,
+            "deleted_at": time.time(),
         })
-    return items
 
+    paths = list(paths)
+    parallel = not all(_same_device(path, FILES_DIR) for path in paths)
+    results = _run_batch(move, paths, parallel, cancelled, progress)
+    index.add_many([(r.trash_id, r.entry) for r in results if r.ok])
+    return results
 
-def restore(trash_id):
+
+def _restore_target(original_path, taken):
     """
-    Restore an item from trash to its original path.
-    Returns True on success, False otherwise.
+    original_path, or "name (restored N).ext" next to it if that is in
+    use on disk or already claimed by this batch.
+    """
+    if original_path not in taken and not vfs.exists(original_path, max_age=0):
+        return original_path
+
+    parent = os.path.dirname(original_path)
+    name, ext = os.path.splitext(os.path.basename(original_path))
+    i = 1
+    while True:
+        candidate = os.path.join(parent, f"{name} (restored {i}){ext}")
+        if candidate not in taken and not vfs.exists(candidate, max_age=0):
+            return candidate
+        i += 1
+
+
+def restore_many(trash_ids, cancelled=None, progress=None):
+    """
+    Move items back to where they were deleted from (renamed if that
+    path is in use), then drop them from the index in one transaction.
+    Returns a TrashResult per id, in order.
     """
-    index = _load_index()
-    if trash_id not in index:
-        return False
+    index = get_index()
+    trash_ids = list(trash_ids)
+
+    # Targets are chosen up front so parallel moves can't pick the same one
+    plan = {}
+    taken = set()
+    for tid in trash_ids:
+        entry = index.get(tid)
+        if entry is not None:
+            target = _restore_target(entry["original_path"], taken)
+            taken.add(target)
+            plan[tid] = (entry, target)
+
+    def put_back(tid):
+        if tid not in plan:
+            return TrashResult(tid, error=KeyError(tid))
+        entry, target = plan[tid]
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.move(entry["trash_path"], target)
+        except OSError as e:
+            return TrashResult(tid, tid, error=e, entry=entry)
+        vfs.invalidate(entry["trash_path"])
+        vfs.invalidate(target)
+        return TrashResult(target, tid, entry=entry)
 
-    entry = index[trash_id]
+    parallel = not all(_same_device(os.path.dirname(target), FILES_DIR) for _, target in plan.values())
+    results = _run_batch(put_back, trash_ids, parallel, cancelled, progress)
+    index.remove_many([r.trash_id for r in results if r.ok])
+    return results
+
+
+def _delete_entry(entry):
     trash_path = entry["trash_path"]
-    original_path = entry["original_path"]
+    if vfs.isdir(trash_path, max_age=0):
+        shutil.rmtree(trash_path)
+    elif vfs.exists(trash_path, max_age=0):
+        os.remove(trash_path)
+    vfs.invalidate(trash_path)
 
-    # Ensure parent exists
-    parent = os.path.dirname(original_path)
-    os.makedirs(parent, exist_ok=True)
-
-    # If something already exists there, append (restored)
-    target = original_path
-    if os.path.exists(target):
-        base = os.path.basename(original_path)
-        parent = os.path.dirname(original_path)
-        name, ext = os.path.splitext(base)
-        i = 1
-        while True:
-            candidate = os.path.join(parent, f"{name} (restored {i}){ext}")
-            if not os.path.exists(candidate):
-                target = candidate
-                break
-            i += 1
 
-    try:
-        shutil.move(trash_path, target)
-    except Exception:
-        return False
+def delete_many(trash_ids, cancelled=None, progress=None, parallel=False, commit_each=False):
+    """
+    Permanently delete items from the trash, then drop them from the
+    index in one transaction. With commit_each, each item leaves the
+    index as soon as it is gone instead, so if the batch is cancelled
+    or dies midway, everything still listed is still on disk and can be
+    restored. Returns a TrashResult per id, in order.
+    """
+    index = get_index()
+    quota = get_quota()
 
-    # Remove from index
-    del index[trash_id]
-    _save_index(index)
-    return True
+    def delete(tid):
+        entry = index.get(tid)
+        if entry is None:
+            return TrashResult(tid, error=KeyError(tid))
+        try:
+            _delete_entry(entry)
+        except OSError as e:
+            return TrashResult(tid, tid, error=e, entry=entry)
+        if commit_each:
+            index.remove(tid)
+        quota.note_removed(entry["original_path"], entry_size(entry))
+        return TrashResult(tid, tid, entry=entry)
 
+    results = _run_batch(delete, list(trash_ids), parallel, cancelled, progress)
+    if not commit_each:
+        index.remove_many([r.trash_id for r in results if r.ok])
+    return results
 
-def delete_permanently(trash_id):
+
+# ---------------------------------------------------------
+# SINGLE ITEMS
+# ---------------------------------------------------------
+def move_to_trash(path):
     """
-    Permanently delete a single item from trash.
+    Move a file or folder to $Trash.Bin and record metadata.
+    Returns trash_id or None on failure.
     """
-    index = _load_index()
-    if trash_id not in index:
-        return False
+    return move_to_trash_many([path])[0].trash_id
 
-    entry = index[trash_id]
-    trash_path = entry["trash_path"]
 
-    try:
-        if os.path.isdir(trash_path):
-            shutil.rmtree(trash_path)
-        elif os.path.exists(trash_path):
-            os.remove(trash_path)
-    except Exception:
-        return False
+def restore(trash_id):
+    """
+    Restore an item from trash to its original path.
+    Returns True on success, False otherwise.
+    """
+    return restore_many([trash_id])[0].ok
 
-    del index[trash_id]
-    _save_index(index)
-    return True
 
+def delete_permanently(trash_id):
+    """
+    Permanently delete a single item from trash.
+    """
+    return delete_many([trash_id])[0].ok
 
-def empty_trash():
+
+def empty_trash(cancelled=None, progress=None, upto=None):
     """
-    Permanently delete everything in $Trash.Bin.
+    Permanently delete everything in $Trash.Bin, several items at a
+    time. Each item leaves the index once it is deleted, so cancelling
+    leaves the rest listed and restorable. Only items with ids up to
+    upto (default: the newest when this starts) are deleted, so nothing
+    trashed while emptying is lost.
     """
-    index = _load_index()
-    for tid, entry in list(index.items()):
-        trash_path = entry["trash_path"]
-        try:
-            if os.path.isdir(trash_path):
-                shutil.rmtree(trash_path)
-            elif os.path.exists(trash_path):
-                os.remove(trash_path)
-        except Exception:
-            pass
-        if tid in index:
-            del index[tid]
-    _save_index(index)
+    index = get_index()
+    if upto is None:
+        upto = index.max_id()
+        if upto is None:
+            return
+
+    batch = []
+    for entry in index.iter_all(upto=upto):
+        batch.append(entry["id"])
+        if len(batch) == PAGE_SIZE:
+            delete_many(batch, cancelled, progress, parallel=True, commit_each=True)
+            batch = []
+        if cancelled is not None and cancelled():
+            return
+    delete_many(batch, cancelled, progress, parallel=True, commit_each=True)
@@ -2,6 +2,8 @@ import os
 import pygame
 
 from userspace.system.file_icon_manager import FileIconManager
+from kernel import vfs
+from kernel.utils.fs_watch import DirectoryMonitor
 
 # Adjust if your OS uses a different path
 DESKTOP_PATH = "Desktop"
@@ -23,6 +25,10 @@ class DesktopIcons:
         self.selected = None
         self.last_click = 0
 
+        # Desktop listing, re-read only when the folder changes
+        self.items = []
+        self.monitor = DirectoryMonitor(DESKTOP_PATH)
+
         # Fonts
         self.font = pygame.font.SysFont("Arial", 14)
 
@@ -30,10 +36,9 @@ class DesktopIcons:
     # DRAW DESKTOP ICONS
     # ---------------------------------------------------------
     def draw(self, surface, mouse_pos):
-        try:
-            items = os.listdir(DESKTOP_PATH)
-        except Exception:
-            items = []
+        if self.monitor.changed():
+            self.items = vfs.listdir(DESKTOP_PATH, max_age=0)
+        items = self.items
 
         x = self.start_x
         y = self.start_y
@@ -0,0 +1,103 @@
+import os
+import pygame
+
+from kernel.utils.file_ops import get_file_ops, FINISHED, DONE
+from userspace.system.assets import load_font
+
+FONT_PATH = os.path.join("res", "fonts", "msa", "Ac437_TridentEarly_8x14.ttf")
+
+# Posted to the pygame queue for every progress / completion event;
+# event.op is the FileOp, event.kind is "progress" or "finished".
+FILEOP_EVENT = pygame.USEREVENT + 1
+
+# Finished operations stay listed this long so the result can be read
+RECENT_MS = 3000
+
+ROW_HEIGHT = 38
+PANEL_WIDTH = 320
+
+_recent = []    # [(op, shown_until_ticks)]
+_sub = None     # our event queue, created on the first pump()
+
+
+def pump():
+    """
+    Move file-operation events into the pygame event queue and run
+    completion callbacks. Call once per frame; extra calls are cheap.
+    """
+    global _sub
+    ops = get_file_ops()
+    if _sub is None:
+        _sub = ops.subscribe()
+
+    now = pygame.time.get_ticks()
+    for event in ops.pump(_sub):
+        if event.kind == FINISHED:
+            _recent.append((event.op, now + RECENT_MS))
+        pygame.event.post(pygame.event.Event(FILEOP_EVENT, op=event.op, kind=event.kind))
+    _recent[:] = [(op, until) for op, until in _recent if until > now]
+
+
+def visible_ops():
+    """
+    Running and queued operations, then recently finished ones.
+    """
+    return get_file_ops().active() + [op for op, _ in _recent]
+
+
+class FileOpsPanel:
+    """
+    Progress list for every running file operation, drawn in the
+    bottom-right corner of whatever surface it is given. Each row has a
+    bar and a cancel button.
+    """
+
+    def __init__(self):
+        self.font = load_font(FONT_PATH, 14)
+        self.cancel_rects = []
+
+    def draw(self, surface):
+        self.cancel_rects = []
+        ops = visible_ops()
+        if not ops:
+            return
+
+        x = surface.get_width() - PANEL_WIDTH - 10
+        y = surface.get_height() - len(ops) * ROW_HEIGHT - 34
+
+        pygame.draw.rect(surface, (250, 250, 250), (x - 4, y - 4, PANEL_WIDTH + 8, len(ops) * ROW_HEIGHT + 8))
+        pygame.draw.rect(surface, (120, 120, 120), (x - 4, y - 4, PANEL_WIDTH + 8, len(ops) * ROW_HEIGHT + 8), 1)
+
+        for op in ops:
+            if op.error is not None:
+                status = str(op.error)
+            elif op.active:
+                status = f"{op.label}  {int(op.progress * 100)}%"
+            else:
+                status = f"{op.label}  {op.state}"
+            color = (150, 0, 0) if op.error is not None or op.errors else (0, 0, 0)
+            surface.blit(self.font.render(status[:40], True, color), (x, y + 2))
+
+            bar = pygame.Rect(x, y + 20, PANEL_WIDTH - 30, 10)
+            pygame.draw.rect(surface, (220, 220, 220), bar)
+            fill = bar.copy()
+            fill.width = int(bar.width * op.progress)
+            pygame.draw.rect(surface, (60, 160, 60) if op.state == DONE or op.active else (180, 60, 60), fill)
+
+            if op.active:
+                cancel = pygame.Rect(x + PANEL_WIDTH - 22, y + 16, 18, 18)
+                pygame.draw.rect(surface, (180, 60, 60), cancel)
+                surface.blit(self.font.render("x", True, (255, 255, 255)), (cancel.x + 5, cancel.y + 1))
+                self.cancel_rects.append((cancel, op))
+
+            y += ROW_HEIGHT
+
+    def handle_click(self, pos):
+        """
+        True if pos (surface coordinates) hit a cancel button.
+        """
+        for rect, op in self.cancel_rects:
+            if rect.collidepoint(pos):
+                op.cancel()
+                return True
+        return False
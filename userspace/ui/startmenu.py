@@ -1,6 +1,7 @@
 import pygame
 
 from userspace.system.language_manager import LanguageManager
+from userspace.system.assets import load_font
 
 FONT_PATH = "res/fonts/msa/Ac437_TridentEarly_8x14.ttf"
 
@@ -17,7 +18,7 @@ class StartMenu:
         self.hover_color = (60, 60, 60)
         self.text_color = (255, 255, 255)
 
-        self.font = font or pygame.font.Font(FONT_PATH, 18)
+        self.font = font or load_font(FONT_PATH, 18)
 
         self.lang = LanguageManager()
 